@@ -2,7 +2,13 @@ import tkinter as tk
 from tkinter import messagebox
 import heapq
 import random
-import copy
+
+from sudoku_board import BoardState, PEERS, ROW_OF, COL_OF
+from sudoku_cache import get_default_cache
+from sudoku_canvas import BoardCanvas
+from sudoku_conflicts import find_conflicts
+from sudoku_hints import next_hint
+from sudoku_metrics import timed
 
 class SudokuDuel:
     def __init__(self, root):
@@ -20,6 +26,7 @@ class SudokuDuel:
         self.cells = [[None]*9 for _ in range(9)]
         self.pq = []
         self.pq_entries = set()  # FIX: Track entries to avoid duplicates
+        self.conflicts = []
         self.difficulty = "Medium"
         self.difficulty_var = tk.StringVar(value=self.difficulty)
         self.game_over = False  # FIX: Flag to prevent actions after game ends
@@ -63,18 +70,15 @@ class SudokuDuel:
         board_frame = tk.Frame(self.root, bg="#d0d0d0", bd=4, relief=tk.SUNKEN)
         board_frame.pack(pady=10)
         
-        for i in range(9):
-            for j in range(9):
-                pady_top = 2 if i % 3 == 0 and i != 0 else 0
-                padx_left = 2 if j % 3 == 0 and j != 0 else 0
-                
-                cell = tk.Entry(board_frame, width=3, font=("Helvetica", 20, "bold"),
-                                justify="center", bd=1, relief=tk.SOLID,
-                                bg="white", disabledbackground="white",
-                                disabledforeground="black")
-                cell.grid(row=i, column=j, padx=(padx_left, 0), pady=(pady_top, 0))
-                cell.bind("<KeyRelease>", lambda e, r=i, c=j: self.on_cell_edit(r, c))
-                self.cells[i][j] = cell
+        # One canvas for the whole grid instead of 81 Entry widgets;
+        # board_view.cells keeps the Entry-style API.
+        self.board_view = BoardCanvas(board_frame, font=("Helvetica", 20, "bold"),
+                                      on_edit=self.on_cell_edit)
+        self.board_view.pack()
+        self.cells = self.board_view.cells
+        for row in self.cells:
+            for cell in row:
+                cell.configure(disabledbackground="white", disabledforeground="black")
         
         button_frame = tk.Frame(self.root, bg="#ffffff")
         
@@ -99,8 +103,8 @@ class SudokuDuel:
             difficulty = self.difficulty
 
         full_board = self.shuffle_board(self.get_base_pattern())
-        self.solution_board = copy.deepcopy(full_board)
-        self.board = copy.deepcopy(full_board)
+        self.solution_board = [row[:] for row in full_board]
+        self.board = [row[:] for row in full_board]
         
         cells = [(i, j) for i in range(9) for j in range(9)]
         random.shuffle(cells)
@@ -170,45 +174,50 @@ class SudokuDuel:
     
     # FIX: Split into two methods to avoid mutating input
     def solve_dnc(self, board_snapshot):
-        # Create a working copy to avoid mutating the input
-        board = copy.deepcopy(board_snapshot)
-        return self._solve_dnc_helper(board)
+        # Positions solved before (by this or a sibling game) come from disk;
+        # otherwise the helper works on a copy, so the input is not mutated
+        return get_default_cache().solve(board_snapshot, self._solve_dnc_helper)
     
-    def _solve_dnc_helper(self, board):
-        # 1. PIVOT (Find MRV)
-        best_cell = None
-        best_candidates = None
-        min_candidates_count = 10 
-        
+    def _find_pivot(self, board):
+        # Most constrained empty cell as (row, col, candidates), or None if full
+        best = None
+        min_candidates_count = 10
         for r in range(9):
             for c in range(9):
                 if board[r][c] == 0:
                     candidates = self.get_candidates(board, r, c)
                     count = len(candidates)
-                    if count == 0: return None # Dead end
-                    
+                    if count == 0: return (r, c, candidates) # Dead end
                     if count < min_candidates_count:
                         min_candidates_count = count
-                        best_cell = (r, c)
-                        best_candidates = candidates  # FIX: Store candidates to avoid recalculating
-                        if count == 1: break 
-            if min_candidates_count == 1: break
+                        best = (r, c, candidates)
+                        if count == 1: return best
+        return best
 
-        # 2. BASE CASE
-        if best_cell is None:
-            return board
-
-        # 3. DIVIDE & CONQUER
-        row, col = best_cell
-        
-        for val in best_candidates:
-            board[row][col] = val 
-            result = self._solve_dnc_helper(board)
-            if result is not None:
-                return result
-            board[row][col] = 0 # Backtrack
-            
-        return None
+    def _solve_dnc_helper(self, board):
+        # Each pivot pushes a (row, col, untried candidates) frame; backtracking
+        # pops frames instead of unwinding Python calls.
+        stack = []
+        while True:
+            # 1. PIVOT (Find MRV)
+            pivot = self._find_pivot(board)
+
+            # 2. BASE CASE
+            if pivot is None:
+                return board
+
+            # 3. DIVIDE & CONQUER
+            stack.append((pivot[0], pivot[1], iter(pivot[2])))
+            while stack:
+                row, col, untried = stack[-1]
+                val = next(untried, None)
+                if val is not None:
+                    board[row][col] = val
+                    break
+                board[row][col] = 0 # Backtrack
+                stack.pop()
+            else:
+                return None
 
     def initialize_priority_queue(self):
         self.pq = []
@@ -222,16 +231,8 @@ class SudokuDuel:
                         self.pq_entries.add((i, j))  # FIX: Track entry
 
     def update_neighbors(self, row, col):
-        neighbours = set()
-        for i in range(9):
-            neighbours.add((row, i))
-            neighbours.add((i, col))
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for i in range(br, br + 3):
-            for j in range(bc, bc + 3):
-                neighbours.add((i, j))
-        
-        for r, c in neighbours:
+        for p in PEERS[row * 9 + col]:
+            r, c = ROW_OF[p], COL_OF[p]
             if self.board[r][c] == 0:
                 cand = self.get_candidates(self.board, r, c)
                 if cand:
@@ -259,11 +260,11 @@ class SudokuDuel:
         self.pq_entries.discard((row, col))  # FIX: Remove from tracking
         
         # Run D&C Solver
-        solved_board = self.solve_dnc(self.board)
+        solved_board = timed("ai_move", "Divide & Conquer", self.solve_dnc, self.board)
         
         if solved_board:
             correct_val = solved_board[row][col]
-            self.board[row][col] = correct_val
+            self.state.set(row, col, correct_val)
             
             # UI Update
             self.cells[row][col].config(state="normal")
@@ -282,8 +283,11 @@ class SudokuDuel:
             return
         cell = self.cells[row][col]
         v = cell.get().strip()
+        if (row, col) in self.conflicts:
+            self.conflicts.remove((row, col))
+            cell.config(bg="white")
         if v == "":
-            self.board[row][col] = 0
+            self.state.set(row, col, 0)
             return
         try:
             num = int(v)
@@ -294,11 +298,11 @@ class SudokuDuel:
                 if num != self.solution_board[row][col]:
                     messagebox.showerror("Incorrect", "Strict Mode: That is not the correct value.")
                     cell.delete(0, tk.END)
-                    self.board[row][col] = 0
+                    self.state.set(row, col, 0)
                     return
 
             if self.is_valid(self.board, row, col, num):
-                self.board[row][col] = num
+                self.state.set(row, col, num)
                 self.pq_entries.discard((row, col))  # FIX: Remove from tracking
                 self.update_neighbors(row, col)
                 cell.config(fg="blue")
@@ -314,7 +318,7 @@ class SudokuDuel:
                 self.root.after(300, self.ai_turn)
             else:
                 cell.delete(0, tk.END)
-                self.board[row][col] = 0
+                self.state.set(row, col, 0)
         except ValueError:
             cell.delete(0, tk.END)
 
@@ -325,9 +329,27 @@ class SudokuDuel:
         self.root.update_idletasks()  # Safer than update() - prevents reentrancy
         self.ai_turn()
 
+    def show_conflicts(self):
+        """Highlight the entries that left the board unsolvable; True if there are any."""
+        conflicts = find_conflicts(self.board, self.initial_board, self.solution_board)
+        if not conflicts:
+            return False
+        self.conflicts = conflicts
+        for r, c in conflicts:
+            self.cells[r][c].config(bg="#ffcdd2")
+        self.current_turn = "user"
+        self.status_label.config(text="Conflicting entries - User's Turn")
+        cells = ", ".join(f"Row {r + 1}, Col {c + 1}" for r, c in conflicts)
+        messagebox.showinfo("Conflict", f"No solution exists with these entries:\n{cells}\n"
+                                        "Clear or change the highlighted cells to continue.")
+        return True
+
     def ai_turn(self):
         if self.game_over:  # FIX: Check game_over
             return
+        # Point at the entries that broke the board instead of a failed solve
+        if self.show_conflicts():
+            return
         # Try to make a move
         if not self.ai_make_move():
             # If move failed, check if it's because board is full or error
@@ -354,7 +376,9 @@ class SudokuDuel:
     def new_game(self):
         self.game_over = False  # FIX: Reset game over flag
         self.board = self.generate_puzzle()
-        self.initial_board = copy.deepcopy(self.board)
+        self.initial_board = [row[:] for row in self.board]
+        self.state = BoardState(self.board)
+        self.start_mark = self.state.mark()
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()
@@ -378,17 +402,14 @@ class SudokuDuel:
     def show_hint(self):
         if self.game_over:  # FIX: Check game_over
             return
-        self.initialize_priority_queue()
-
-        while self.pq and self.board[self.pq[0][1]][self.pq[0][2]] != 0:
-            heapq.heappop(self.pq)
-
-        if not self.pq:
-            messagebox.showinfo("Hint", "No empty cells remaining!")
+        hint = next_hint(self.board, solve=lambda b: timed("hint", "Divide & Conquer", self.solve_dnc, b))
+        if hint is None:
+            if self.is_complete():
+                messagebox.showinfo("Hint", "No empty cells remaining!")
+            else:
+                messagebox.showinfo("Hint", "No solution exists from this state.")
             return
 
-        _, row, col = self.pq[0]
-
         for i in range(9):
             for j in range(9):
                 cell = self.cells[i][j]
@@ -396,26 +417,30 @@ class SudokuDuel:
                 cell.config(state="normal", bg="white")
                 cell.config(state=prev_state)
 
-        hint_cell = self.cells[row][col]
+        hint_cell = self.cells[hint.row][hint.col]
         prev_state = hint_cell.cget("state")
         hint_cell.config(state="normal", bg="#ffeb3b")
         hint_cell.config(state=prev_state)
 
-        cand = sorted(self.get_candidates(self.board, row, col))
-
-        messagebox.showinfo("Hint",f"Divide & Conquer Target:\n"f"Row {row + 1}, Col {col + 1}\n"f"Valid Options: {cand}")
+        messagebox.showinfo("Hint", f"{hint.technique}:\n"f"Row {hint.row + 1}, Col {hint.col + 1} = {hint.value}\n\n"f"{hint.explanation}")
 
 
 
     def reset_board(self):
         self.game_over = False  # FIX: Reset game over flag
-        self.board = copy.deepcopy(self.initial_board)
+        self.state.undo_to(self.start_mark)
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()
         self.status_label.config(text="User's Turn")
 
 if __name__ == "__main__":
+    from sudoku_metrics import install_from_env as install_metrics
+    from sudoku_uimonitor import install_from_env
+    install_metrics()
     root = tk.Tk()
-    SudokuDuel(root)
+    monitor = install_from_env(root)
+    game = SudokuDuel(root)
+    if monitor:
+        monitor.watch(game)
     root.mainloop()
\ No newline at end of file
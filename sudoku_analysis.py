@@ -6,66 +6,20 @@ in a separate window with matplotlib graphs and complexity tables.
 """
 
 import copy
+import queue
 import random
 import time
 import threading
 import heapq
-import customtkinter as ctk
-import matplotlib
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import numpy as np
 
+try:
+    import customtkinter as ctk
+except ImportError:     # headless use (sudoku_report) needs no GUI toolkit
+    ctk = None
 
-# ─────────────────────────────────────────────────────────
-# PUZZLE GENERATION  (headless — no UI dependency)
-# ─────────────────────────────────────────────────────────
-
-def _get_base_pattern():
-    def pattern(r, c):
-        return (3 * (r % 3) + r // 3 + c) % 9
-    nums = list(range(1, 10))
-    random.shuffle(nums)
-    return [[nums[pattern(r, c)] for c in range(9)] for r in range(9)]
-
-
-def _shuffle_board(board):
-    board = [row[:] for row in board]
-    for i in range(0, 9, 3):
-        block = board[i:i + 3]
-        random.shuffle(block)
-        board[i:i + 3] = block
-    board = list(map(list, zip(*board)))
-    for i in range(0, 9, 3):
-        block = board[i:i + 3]
-        random.shuffle(block)
-        board[i:i + 3] = block
-    board = list(map(list, zip(*board)))
-    bands = [board[i:i + 3] for i in range(0, 9, 3)]
-    random.shuffle(bands)
-    board = [row for band in bands for row in band]
-    board = list(map(list, zip(*board)))
-    stacks = [board[i:i + 3] for i in range(0, 9, 3)]
-    random.shuffle(stacks)
-    board = [row for stack in stacks for row in stack]
-    board = list(map(list, zip(*board)))
-    return board
-
-
-def generate_puzzle(difficulty="Medium"):
-    """Return (puzzle, solution) as two 9×9 lists."""
-    full = _shuffle_board(_get_base_pattern())
-    solution = copy.deepcopy(full)
-    puzzle = copy.deepcopy(full)
-    cells = [(r, c) for r in range(9) for c in range(9)]
-    random.shuffle(cells)
-    remove = {"Easy": 30, "Medium": 45, "Hard": 55}.get(difficulty, 45)
-    for i in range(remove):
-        r, c = cells[i]
-        puzzle[r][c] = 0
-    return puzzle, solution
+from sudoku_cache import decode_board
+from sudoku_corpus import load_corpus
+from sudoku_timing import precise_time
 
 
 # ─────────────────────────────────────────────────────────
@@ -307,6 +261,8 @@ SOLVERS = {
 DIFFICULTIES = ["Easy", "Medium", "Hard"]
 PUZZLES_PER_DIFFICULTY = 5          # averaged for stable results
 TIMEOUT_PER_SOLVE = 10.0            # seconds
+STREAM_POLL_MS = 100                # result-queue drain interval of the window
+TABLE_HEIGHT = 320                  # px of the per-test-case table
 
 
 def _time_solver(solver_fn, puzzle, timeout=TIMEOUT_PER_SOLVE):
@@ -333,10 +289,16 @@ def _time_solver(solver_fn, puzzle, timeout=TIMEOUT_PER_SOLVE):
     return elapsed_ms
 
 
-def run_benchmarks(progress_cb=None):
+def run_benchmarks(progress_cb=None, on_record=None, cancel=None, precise=False):
     """
     Return {difficulty: {solver_name: avg_ms}} and a list of per-puzzle records.
-    progress_cb(current, total) is called if provided.
+    progress_cb(current, total) and on_record(record) are called after every
+    solve if provided.  Setting the *cancel* event stops the run before the
+    next solve; averages then cover what was measured.
+
+    *precise* times each solve with sudoku_timing.precise_time instead of
+    _time_solver (no thread, collector off, harness cost subtracted, no
+    timeout) and adds "cpu_ms" to the records.
     """
     results = {d: {name: [] for name in SOLVERS} for d in DIFFICULTIES}
     records = []
@@ -344,10 +306,20 @@ def run_benchmarks(progress_cb=None):
     done = 0
 
     for diff in DIFFICULTIES:
-        for pidx in range(PUZZLES_PER_DIFFICULTY):
-            puzzle, _sol = generate_puzzle(diff)
+        for pidx, entry in enumerate(load_corpus()["tiers"][diff][:PUZZLES_PER_DIFFICULTY]):
+            puzzle = decode_board(entry["board"])
             for name, fn in SOLVERS.items():
-                ms = _time_solver(fn, puzzle)
+                if cancel is not None and cancel.is_set():
+                    break
+                cpu_ms = None
+                if precise:
+                    try:
+                        timing = precise_time(fn, puzzle)
+                        ms, cpu_ms = timing["wall_ms"], timing["cpu_ms"]
+                    except Exception:
+                        ms = None  # error, as in _time_solver
+                else:
+                    ms = _time_solver(fn, puzzle)
                 if ms is not None:
                     results[diff][name].append(ms)
                 records.append({
@@ -355,10 +327,16 @@ def run_benchmarks(progress_cb=None):
                     "puzzle": pidx + 1,
                     "algorithm": name,
                     "time_ms": ms,
+                    "technique": entry["technique"],
+                    "board": entry["board"],
                 })
+                if precise:
+                    records[-1]["cpu_ms"] = cpu_ms
                 done += 1
                 if progress_cb:
                     progress_cb(done, total)
+                if on_record:
+                    on_record(records[-1])
 
     # Compute averages
     avg = {}
@@ -403,9 +381,6 @@ COLORS_ANALYSIS = {
     "border_light": "#2a3a5e",
 }
 
-ALGO_COLORS = ["#4fc3f7", "#66bb6a", "#ef5350", "#ffa726", "#ab47bc"]
-
-
 def open_analysis_window(parent):
     """Launch the analysis window as a Toplevel of *parent*."""
     win = ctk.CTkToplevel(parent)
@@ -452,111 +427,153 @@ def open_analysis_window(parent):
     )
     progress_label.pack(pady=(2, 0))
 
-    # ── Scrollable content frame (populated after benchmarks) ──
+    cancel = threading.Event()
+    cancel_btn = ctk.CTkButton(
+        progress_frame,
+        text="Cancel",
+        width=90,
+        fg_color=COLORS_ANALYSIS["bg_card"],
+        hover_color=COLORS_ANALYSIS["border_light"],
+        text_color=COLORS_ANALYSIS["accent_red"],
+        command=lambda: (cancel.set(), sub.configure(text="Cancelling …")),
+    )
+    cancel_btn.pack(pady=(4, 0))
+
+    def close():
+        cancel.set()
+        win.destroy()
+
+    win.protocol("WM_DELETE_WINDOW", close)
+
+    # ── Scrollable content frame, filled as results stream in ──
     content_frame = ctk.CTkScrollableFrame(
         win,
         fg_color=COLORS_ANALYSIS["bg_dark"],
         scrollbar_button_color=COLORS_ANALYSIS["border_light"],
     )
     content_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+    live = _LiveResults(content_frame)
 
     # ── Run benchmarks in a background thread ──
-    def on_progress(done, total):
-        pct = done / total
-        win.after(0, lambda: progress_bar.set(pct))
-        win.after(0, lambda: progress_label.configure(text=f"{int(pct * 100)} %"))
+    # The worker only fills a queue; the Tk loop drains it every
+    # STREAM_POLL_MS, so a burst of fast solves costs a single redraw.
+    events = queue.Queue()
 
     def run():
-        avg, records = run_benchmarks(progress_cb=on_progress)
-        win.after(0, lambda: _build_results_ui(content_frame, avg, records, sub,
-                                                progress_frame, win))
+        run_benchmarks(on_record=events.put, cancel=cancel)
+        events.put(None)
+
+    def poll():
+        if not win.winfo_exists():
+            return
+        finished = False
+        added = False
+        while True:
+            try:
+                rec = events.get_nowait()
+            except queue.Empty:
+                break
+            if rec is None:
+                finished = True
+                break
+            live.add(rec)
+            added = True
+        if added:
+            live.redraw()
+            pct = live.count / live.total
+            progress_bar.set(pct)
+            progress_label.configure(text=f"{int(pct * 100)} %")
+        if finished:
+            sub.configure(text="Benchmark cancelled" if cancel.is_set() else "Benchmark complete ✓")
+            progress_frame.pack_forget()
+        else:
+            win.after(STREAM_POLL_MS, poll)
 
     threading.Thread(target=run, daemon=True).start()
-
-
-def _build_results_ui(parent, avg, records, subtitle_label, progress_frame, win):
-    """Populate the content frame with the chart and table once benchmarks finish."""
-    subtitle_label.configure(text="Benchmark complete ✓")
-    progress_frame.pack_forget()
-
-    # ── 1. MATPLOTLIB BAR CHART ──
-    fig = Figure(figsize=(10.2, 4.8), dpi=100, facecolor="#0f0f1a")
-    ax = fig.add_subplot(111)
-    ax.set_facecolor("#1a1a2e")
-
-    algo_names = list(SOLVERS.keys())
-    n_algo = len(algo_names)
-    x = np.arange(len(DIFFICULTIES))
-    width = 0.15
-
-    for idx, name in enumerate(algo_names):
-        vals = [avg[d].get(name) or 0 for d in DIFFICULTIES]
-        bars = ax.bar(x + idx * width, vals, width, label=name,
-                      color=ALGO_COLORS[idx], edgecolor="none", alpha=0.92)
-        # value labels
-        for bar, v in zip(bars, vals):
-            if v > 0:
-                ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(),
-                        f"{v:.1f}", ha="center", va="bottom",
-                        fontsize=7, color="#e0e0e0", fontweight="bold")
-
-    ax.set_xlabel("Difficulty", fontsize=12, color="#90a4ae", labelpad=8)
-    ax.set_ylabel("Avg Solve Time (ms)", fontsize=12, color="#90a4ae", labelpad=8)
-    ax.set_title("Algorithm Performance Comparison", fontsize=15,
-                 color="#4fc3f7", pad=12, fontweight="bold")
-    ax.set_xticks(x + width * (n_algo - 1) / 2)
-    ax.set_xticklabels(DIFFICULTIES, fontsize=11, color="#e0e0e0")
-    ax.tick_params(axis="y", colors="#90a4ae")
-    ax.legend(fontsize=9, loc="upper left", facecolor="#1a1a2e",
-              edgecolor="#2a3a5e", labelcolor="#e0e0e0")
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    ax.spines["bottom"].set_color("#2a3a5e")
-    ax.spines["left"].set_color("#2a3a5e")
-    ax.grid(axis="y", color="#2a3a5e", linewidth=0.5, alpha=0.5)
-    fig.tight_layout()
-
-    canvas = FigureCanvasTkAgg(fig, master=parent)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill="x", padx=10, pady=(10, 4))
-
-    # ── 2. PER-TEST-CASE TABLE ──
-    _add_section_header(parent, "📋  Individual Test-Case Results")
-
-    # Build a header row
-    tc_header_frame = ctk.CTkFrame(parent, fg_color="#1a1a2e", corner_radius=6)
-    tc_header_frame.pack(fill="x", padx=14, pady=(6, 0))
-    for j, hdr in enumerate(["Difficulty", "Puzzle #", "Algorithm", "Time (ms)"]):
-        lbl = ctk.CTkLabel(tc_header_frame, text=hdr,
-                           font=("Segoe UI", 11, "bold"),
-                           text_color=COLORS_ANALYSIS["accent_blue"],
-                           width=150 if j < 3 else 120)
-        lbl.grid(row=0, column=j, padx=8, pady=6, sticky="w")
-
-    tc_body = ctk.CTkFrame(parent, fg_color=COLORS_ANALYSIS["bg_dark"])
-    tc_body.pack(fill="x", padx=14, pady=(0, 8))
-
-    for i, rec in enumerate(records):
-        bg = "#1a1a2e" if i % 2 == 0 else "#151528"
-        row_frame = ctk.CTkFrame(tc_body, fg_color=bg, corner_radius=0, height=28)
-        row_frame.pack(fill="x")
-        vals = [
-            rec["difficulty"],
-            str(rec["puzzle"]),
-            rec["algorithm"],
-            f"{rec['time_ms']:.2f}" if rec["time_ms"] is not None else "TIMEOUT",
-        ]
-        for j, v in enumerate(vals):
-            color = COLORS_ANALYSIS["text_primary"]
-            if v == "TIMEOUT":
-                color = COLORS_ANALYSIS["accent_red"]
-            lbl = ctk.CTkLabel(row_frame, text=v,
-                               font=("Segoe UI", 10),
-                               text_color=color,
-                               width=150 if j < 3 else 120)
-            lbl.grid(row=0, column=j, padx=8, pady=3, sticky="w")
-
-    # ── 3. COMPLEXITY TABLE ──
+    win.after(STREAM_POLL_MS, poll)
+
+
+class _LiveResults:
+    """Chart, per-test-case table and complexity table, updated record by record."""
+
+    def __init__(self, parent):
+        self.total = len(DIFFICULTIES) * PUZZLES_PER_DIFFICULTY * len(SOLVERS)
+        self.count = 0
+        self.sums = {(d, name): [0.0, 0] for d in DIFFICULTIES for name in SOLVERS}
+
+        # ── 1. MATPLOTLIB BAR CHART (bars start empty and grow in place) ──
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from sudoku_charts import PerformanceChart
+        from sudoku_table import VirtualTable
+        fig = Figure(figsize=(10.2, 4.8), dpi=100)
+        self.chart = PerformanceChart(fig, DIFFICULTIES, list(SOLVERS))
+        self.canvas = FigureCanvasTkAgg(fig, master=parent)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill="x", padx=10, pady=(10, 4))
+
+        # ── 2. PER-TEST-CASE TABLE (rows appended as records arrive) ──
+        _add_section_header(parent, "📋  Individual Test-Case Results")
+
+        # Filters; click a column header to sort.
+        filter_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        filter_frame.pack(fill="x", padx=14, pady=(6, 0))
+        for key, label, values in (("algorithm", "All solvers", list(SOLVERS)),
+                                   ("difficulty", "All difficulties", DIFFICULTIES)):
+            ctk.CTkOptionMenu(
+                filter_frame,
+                values=[label] + values,
+                width=170,
+                fg_color=COLORS_ANALYSIS["bg_card"],
+                button_color=COLORS_ANALYSIS["border_light"],
+                command=lambda v, key=key, label=label: self.filter(key, None if v == label else v),
+            ).pack(side="left", padx=(0, 8))
+        self.shown_label = ctk.CTkLabel(filter_frame, text="", font=("Segoe UI", 10),
+                                        text_color=COLORS_ANALYSIS["text_secondary"])
+        self.shown_label.pack(side="right")
+
+        self.table = VirtualTable(
+            parent,
+            [("Difficulty", "difficulty", 150), ("Puzzle #", "puzzle", 100),
+             ("Technique", "technique", 190), ("Algorithm", "algorithm", 160),
+             ("Time (ms)", "time_ms", 120)],
+            formats={"time_ms": lambda ms: f"{ms:.2f}" if ms is not None else "TIMEOUT"},
+            sort_keys={"difficulty": DIFFICULTIES.index},
+            cell_color=lambda rec, key: (COLORS_ANALYSIS["accent_red"]
+                                         if key == "time_ms" and rec["time_ms"] is None else None),
+            height=TABLE_HEIGHT,
+            bg="#1a1a2e", alt_bg="#151528", fg=COLORS_ANALYSIS["text_primary"],
+            header_bg="#1a1a2e", header_fg=COLORS_ANALYSIS["accent_blue"],
+        )
+        self.table.pack(fill="x", padx=14, pady=(6, 8))
+        self.pending = []
+
+        # ── 3. COMPLEXITY TABLE ──
+        _build_complexity_table(parent)
+
+    def add(self, rec):
+        """Account for one record and queue its table row; call redraw() after a batch."""
+        if rec["time_ms"] is not None:
+            acc = self.sums[rec["difficulty"], rec["algorithm"]]
+            acc[0] += rec["time_ms"]
+            acc[1] += 1
+        self.count += 1
+        self.pending.append(rec)
+
+    def filter(self, key, value):
+        self.table.set_filter(key, value)
+        self.shown_label.configure(text=f"{self.table.visible_count()} of {self.count} shown")
+
+    def redraw(self):
+        """Move the bars to the running averages, schedule one canvas redraw and add queued rows."""
+        self.table.extend(self.pending)
+        self.pending = []
+        self.shown_label.configure(text=f"{self.table.visible_count()} of {self.count} shown")
+        self.chart.update({key: total / n if n else 0 for key, (total, n) in self.sums.items()})
+        self.canvas.draw_idle()
+
+
+def _build_complexity_table(parent):
     _add_section_header(parent, "⏱  Time & Space Complexity")
 
     tbl_frame = ctk.CTkFrame(parent, fg_color="#1a1a2e", corner_radius=8)
@@ -1,11 +1,10 @@
 import threading
 import time
-import copy
 import subprocess
 import sys
 import os
 import heapq
-import random
+import queue
 
 import customtkinter as ctk
 import tkinter as tk
@@ -13,377 +12,20 @@ from tkinter import messagebox
 from TkToolTip import ToolTip
 from tkinter import ttk
 
-
-class BitmaskSolver:
-
-    def __init__(self):
-        self.rows = [0] * 9
-        self.cols = [0] * 9
-        self.boxes = [0] * 9
-
-    def _get_box_index(self, r, c):
-        return (r // 3) * 3 + (c // 3)
-
-    def _initialize_masks(self, board):
-        self.rows = [0] * 9
-        self.cols = [0] * 9
-        self.boxes = [0] * 9
-        empty_cells = []
-        for r in range(9):
-            for c in range(9):
-                if board[r][c] != 0:
-                    val = board[r][c] - 1
-                    mask = (1 << val)
-                    self.rows[r] |= mask
-                    self.cols[c] |= mask
-                    self.boxes[self._get_box_index(r, c)] |= mask
-                else:
-                    empty_cells.append((r, c))
-        return empty_cells
-
-    def solve(self, board):
-        empty_cells = self._initialize_masks(board)
-        empty_cells.sort(key=lambda cell: self._count_options(cell[0], cell[1]))
-        if self._backtrack(board, empty_cells, 0):
-            return board
-        return None
-
-    def count_solutions(self, board, limit=2):
-        self._initialize_masks(board)
-        empty_cells = [(r, c) for r in range(9) for c in range(9) if board[r][c] == 0]
-        return self._backtrack_count(board, empty_cells, 0, limit)
-
-    def _count_options(self, r, c):
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        options = 0
-        for k in range(9):
-            if not (taken & (1 << k)):
-                options += 1
-        return options
-
-    def _backtrack(self, board, empty_cells, idx):
-        if idx == len(empty_cells):
-            return True
-
-        r, c = empty_cells[idx]
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-
-        for k in range(9):
-            mask = 1 << k
-            if not (taken & mask):
-                board[r][c] = k + 1
-                self.rows[r] |= mask
-                self.cols[c] |= mask
-                self.boxes[box_idx] |= mask
-
-                if self._backtrack(board, empty_cells, idx + 1):
-                    return True
-
-                self.rows[r] &= ~mask
-                self.cols[c] &= ~mask
-                self.boxes[box_idx] &= ~mask
-                board[r][c] = 0
-        return False
-
-    def _backtrack_count(self, board, empty_cells, idx, limit):
-        if idx == len(empty_cells):
-            return 1
-        r, c = empty_cells[idx]
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        count = 0
-        for k in range(9):
-            mask = 1 << k
-            if not (taken & mask):
-                board[r][c] = k + 1
-                self.rows[r] |= mask
-                self.cols[c] |= mask
-                self.boxes[box_idx] |= mask
-                count += self._backtrack_count(board, empty_cells, idx + 1, limit)
-                self.rows[r] &= ~mask
-                self.cols[c] &= ~mask
-                self.boxes[box_idx] &= ~mask
-                board[r][c] = 0
-                if count >= limit:
-                    return count
-        return count
-
-
-def _standalone_is_valid(board, row, col, num):
-    for i in range(9):
-        if board[row][i] == num and i != col:
-            return False
-        if board[i][col] == num and i != row:
-            return False
-    br, bc = 3 * (row // 3), 3 * (col // 3)
-    for i in range(br, br + 3):
-        for j in range(bc, bc + 3):
-            if board[i][j] == num and (i, j) != (row, col):
-                return False
-    return True
-
-
-def _standalone_get_candidates(board, row, col):
-    if board[row][col] != 0:
-        return set()
-    candidates = set(range(1, 10))
-    candidates -= set(board[row])
-    candidates -= {board[i][col] for i in range(9)}
-    br, bc = 3 * (row // 3), 3 * (col // 3)
-    for i in range(br, br + 3):
-        for j in range(bc, bc + 3):
-            candidates.discard(board[i][j])
-    return candidates
-
-
-def solve_greedy_standalone(board):
-    board = copy.deepcopy(board)
-    while True:
-        pq = []
-        for r in range(9):
-            for c in range(9):
-                if board[r][c] == 0:
-                    cands = _standalone_get_candidates(board, r, c)
-                    if not cands:
-                        return None
-                    heapq.heappush(pq, (len(cands), r, c, cands))
-        if not pq:
-            return board
-        _, r, c, cands = heapq.heappop(pq)
-        cands = _standalone_get_candidates(board, r, c)
-        if not cands:
-            return None
-        board[r][c] = min(cands)
-    return board
-
-
-def solve_dnc_standalone(board):
-    board = copy.deepcopy(board)
-    return _dnc_helper(board)
-
-
-def _dnc_helper(board):
-    best_cell = None
-    best_candidates = None
-    min_count = 10
-    for r in range(9):
-        for c in range(9):
-            if board[r][c] == 0:
-                cands = _standalone_get_candidates(board, r, c)
-                cnt = len(cands)
-                if cnt == 0:
-                    return None
-                if cnt < min_count:
-                    min_count = cnt
-                    best_cell = (r, c)
-                    best_candidates = cands
-                    if cnt == 1:
-                        break
-        if min_count == 1:
-            break
-    if best_cell is None:
-        return board
-    row, col = best_cell
-    for val in best_candidates:
-        board[row][col] = val
-        result = _dnc_helper(board)
-        if result is not None:
-            return result
-        board[row][col] = 0
-    return None
-
-
-def solve_dp_standalone(board):
-    board = copy.deepcopy(board)
-    rows = [0] * 9; cols = [0] * 9; boxes = [0] * 9
-    empty = []
-    for r in range(9):
-        for c in range(9):
-            if board[r][c] != 0:
-                mask = 1 << (board[r][c] - 1)
-                rows[r] |= mask; cols[c] |= mask
-                boxes[(r // 3) * 3 + c // 3] |= mask
-            else:
-                empty.append((r, c))
-
-    def count_opts(r, c):
-        taken = rows[r] | cols[c] | boxes[(r // 3) * 3 + c // 3]
-        return bin(~taken & 0x1ff).count('1')
-
-    empty.sort(key=lambda cell: count_opts(cell[0], cell[1]))
-
-    def bt(idx):
-        if idx == len(empty):
-            return True
-        r, c = empty[idx]
-        bi = (r // 3) * 3 + c // 3
-        taken = rows[r] | cols[c] | boxes[bi]
-        for k in range(9):
-            m = 1 << k
-            if not (taken & m):
-                board[r][c] = k + 1
-                rows[r] |= m; cols[c] |= m; boxes[bi] |= m
-                if bt(idx + 1):
-                    return True
-                rows[r] &= ~m; cols[c] &= ~m; boxes[bi] &= ~m
-                board[r][c] = 0
-        return False
-
-    return board if bt(0) else None
-
-
-def solve_backtracking_standalone(board):
-    """
-    Solves a Sudoku puzzle using an optimized backtracking algorithm.
-
-    This version is highly optimized with:
-    1.  Bitmasking: For O(1) constraint checks.
-    2.  Dynamic MRV (Minimum Remaining Values): At each step, it finds the
-        cell with the fewest possible candidates to explore next. This
-        dramatically prunes the search tree compared to a static ordering
-        and efficiently handles "naked singles".
-    """
-    board = copy.deepcopy(board)
-    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
-
-    for r in range(9):
-        for c in range(9):
-            if board[r][c] != 0:
-                mask = 1 << (board[r][c] - 1)
-                rows[r] |= mask
-                cols[c] |= mask
-                boxes[(r // 3) * 3 + c // 3] |= mask
-
-    def solve():
-        min_opts, best_cell = 10, None
-        for r in range(9):
-            for c in range(9):
-                if board[r][c] == 0:
-                    bi = (r // 3) * 3 + c // 3
-                    taken = rows[r] | cols[c] | boxes[bi]
-                    available = ~taken & 0x1ff
-                    
-                    opts = available.bit_count() if hasattr(available, 'bit_count') else bin(available).count('1')
-
-                    if opts < min_opts:
-                        min_opts, best_cell = opts, (r, c)
-                        if min_opts == 0: return False # Contradiction
-                        if min_opts == 1: break
-            if min_opts == 1: break
-
-        if best_cell is None:
-            return True # All cells filled
-
-        r, c = best_cell
-        bi = (r // 3) * 3 + c // 3
-        available = ~(rows[r] | cols[c] | boxes[bi]) & 0x1ff
-
-        for k in range(9):
-            m = 1 << k
-            if available & m:
-                board[r][c] = k + 1
-                rows[r] |= m; cols[c] |= m; boxes[bi] |= m
-                if solve():
-                    return True
-                rows[r] &= ~m; cols[c] &= ~m; boxes[bi] &= ~m
-                board[r][c] = 0
-        return False
-
-    return board if solve() else None
-
-
-def solve_hybrid_standalone(board):
-    board = copy.deepcopy(board)
-    for br in range(0, 9, 3):
-        for bc in range(0, 9, 3):
-            for r in range(br, br + 3):
-                for c in range(bc, bc + 3):
-                    if board[r][c] == 0:
-                        cands = _standalone_get_candidates(board, r, c)
-                        if len(cands) == 1:
-                            board[r][c] = cands.pop()
-    return solve_dp_standalone(board)
-
-
-BENCHMARK_SOLVERS = {
-    "Greedy":           solve_greedy_standalone,
-    "Divide & Conquer": solve_dnc_standalone,
-    "DP (Bitmask)":     solve_dp_standalone,
-    "Backtracking":     solve_backtracking_standalone,
-    "Hybrid (D&C+DP)":  solve_hybrid_standalone,
-}
-
-# ---------- Shared helper functions ----------
-
-def get_base_pattern():
-    """Create a valid completed Sudoku board using a mathematical pattern."""
-    def pattern(r, c):
-        return (3 * (r % 3) + r // 3 + c) % 9
-    nums = list(range(1, 10))
-    random.shuffle(nums)
-    return [[nums[pattern(r, c)] for c in range(9)] for r in range(9)]
-
-
-def shuffle_board(board):
-    """Randomise a valid board by shuffling rows/columns within bands."""
-    for i in range(0, 9, 3):
-        block = board[i:i + 3]
-        random.shuffle(block)
-        board[i:i + 3] = block
-    board = list(map(list, zip(*board)))
-    for i in range(0, 9, 3):
-        block = board[i:i + 3]
-        random.shuffle(block)
-        board[i:i + 3] = block
-    board = list(map(list, zip(*board)))
-    return board
-
-
-def generate_puzzle(difficulty="Medium"):
-    """Generate a valid Sudoku puzzle with a unique solution."""
-    full_board = shuffle_board(get_base_pattern())
-    solution = copy.deepcopy(full_board)
-    board = copy.deepcopy(full_board)
-
-    if difficulty == "Easy":
-        target_holes = 30
-    elif difficulty == "Medium":
-        target_holes = 45
-    else:
-        target_holes = 55
-
-    cells = [(r, c) for r in range(9) for c in range(9)]
-    random.shuffle(cells)
-
-    solver = BitmaskSolver()
-    holes = 0
-
-    for r, c in cells:
-        if holes >= target_holes:
-            break
-        backup = board[r][c]
-        board[r][c] = 0
-        solutions = solver.count_solutions(copy.deepcopy(board), limit=2)
-        if solutions != 1:
-            board[r][c] = backup
-        else:
-            holes += 1
-
-    return board, solution
-
-
-def generate_benchmark_puzzle(holes=45):
-    """Generate a puzzle with a given number of holes for benchmarking."""
-    full = shuffle_board(get_base_pattern())
-    board = copy.deepcopy(full)
-    cells = [(r, c) for r in range(9) for c in range(9)]
-    random.shuffle(cells)
-    for i in range(min(holes, len(cells))):
-        r, c = cells[i]
-        board[r][c] = 0
-    return board
+from sudoku_board import BoardState, PEERS, ROW_OF, COL_OF
+from sudoku_canvas import BoardCanvas
+from sudoku_charts import COMPARISON_SOLVERS, COMPARISON_LABELS, COMPARISON_COLORS
+from sudoku_conflicts import find_conflicts
+from sudoku_hints import next_hint
+from sudoku_speculation import Speculator
+from sudoku_engine import (
+    BitmaskSolver, BENCHMARK_SOLVERS,
+    solve_greedy_standalone, solve_dnc_standalone, solve_dp_standalone,
+    solve_backtracking_standalone, solve_hybrid_standalone,
+    get_base_pattern, shuffle_board, generate_puzzle, generate_benchmark_puzzle,
+    get_candidates, is_valid, solve_with_backtracking, benchmark_all_solvers,
+    anytime_move, AI_MOVE_BUDGET_MS, AI_MOVE_SOURCES, DIFFICULTY_HOLES,
+)
 
 
 BENCHMARK_BG   = "#1a1a2e"
@@ -428,22 +70,37 @@ def open_benchmark_window(parent_root):
     btn_frame = tk.Frame(win, bg=BENCHMARK_BG)
     btn_frame.pack(pady=10)
 
+    run = StreamingBenchmark(parent_root, status_lbl, results_frame, BENCHMARK_BG)
+
     tk.Button(
         btn_frame, text="Run Benchmark",
         font=("Segoe UI", 11, "bold"),
         bg=BENCHMARK_ACCENT, fg="#ffffff",
         activebackground="#ff6b81", relief="flat",
         padx=15, pady=6, cursor="hand2",
-        command=lambda: _run_benchmark_thread(parent_root, status_lbl, results_frame),
+        command=run.start,
+    ).pack(side="left", padx=5)
+
+    tk.Button(
+        btn_frame, text="Cancel",
+        font=("Segoe UI", 11, "bold"),
+        bg="#0f3460", fg="#ffffff",
+        relief="flat", padx=15, pady=6, cursor="hand2",
+        command=run.cancel,
     ).pack(side="left", padx=5)
 
+    def close():
+        run.cancel()
+        win.destroy()
+
     tk.Button(
         btn_frame, text="Close",
         font=("Segoe UI", 11, "bold"),
         bg="#8892b0", fg=BENCHMARK_BG,
         relief="flat", padx=15, pady=6, cursor="hand2",
-        command=win.destroy,
+        command=close,
     ).pack(side="left", padx=5)
+    win.protocol("WM_DELETE_WINDOW", close)
 
     # --- Complexity table ---
     _build_complexity_table(win)
@@ -494,142 +151,144 @@ def _build_complexity_table(parent):
     ).pack(anchor="w", padx=10, pady=(0, 10))
 
 
-def _run_benchmark_thread(parent_root, status_lbl, results_frame):
-    """Run the benchmark in a background thread to keep the UI responsive."""
-    status_lbl.config(text="Running benchmark... please wait")
+# Solvers shown in benchmark charts (subset of all 5)
+_BENCH_DISPLAY_SOLVERS = COMPARISON_SOLVERS
+_BENCH_DISPLAY_LABELS  = COMPARISON_LABELS
+_BENCH_DISPLAY_COLORS  = COMPARISON_COLORS
+_BENCH_POLL_MS = 100
 
-    def worker():
-        results = benchmark_all_solvers()
-        parent_root.after(0, lambda: _display_benchmark_results(results, status_lbl, results_frame))
 
-    threading.Thread(target=worker, daemon=True).start()
+class StreamingBenchmark:
+    """
+    Runs benchmark_all_solvers() on a worker thread and draws every
+    measurement as it arrives: bars of a pre-built matplotlib chart grow in
+    place (or text rows update, without matplotlib).  Results travel through
+    a queue the Tk loop drains every _BENCH_POLL_MS, so the worker never
+    touches a widget and a burst of fast solves costs a single redraw.
+    """
 
+    def __init__(self, root, status_lbl, results_frame, bg):
+        self.root = root
+        self.status_lbl = status_lbl
+        self.results_frame = results_frame
+        self.bg = bg
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.running = False
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.cancel_event = threading.Event()
+        self.queue = queue.Queue()
+        self.status_lbl.config(text="Running benchmark...")
+        # Clear any previous results so re-running replaces rather than appends
+        for child in self.results_frame.winfo_children():
+            child.destroy()
+        try:
+            self._build_chart()
+        except ImportError:
+            self._build_text()
 
-# Solvers shown in benchmark charts (subset of all 5)
-_BENCH_DISPLAY_SOLVERS = ["Greedy", "Backtracking", "Hybrid (D&C+DP)"]
-_BENCH_DISPLAY_LABELS  = ["Greedy", "Backtracking", "Hybrid"]
-_BENCH_DISPLAY_COLORS  = ["#3498db", "#e74c3c", "#f39c12"]
+        cancel, results = self.cancel_event, self.queue
 
+        def worker():
+            benchmark_all_solvers(
+                on_result=lambda diff, name, stats: results.put((diff, name, stats)),
+                cancel=cancel)
+            results.put(None)
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(_BENCH_POLL_MS, self._poll)
+
+    def cancel(self):
+        """Stop the worker before its next solve."""
+        if self.running:
+            self.cancel_event.set()
+            self.status_lbl.config(text="Cancelling...")
 
-def _display_benchmark_results(results, status_lbl, results_frame):
-    """Show benchmark results as matplotlib bar charts (with text fallback)."""
-    status_lbl.config(text="Benchmark complete!")
+    def _poll(self):
+        if not self.results_frame.winfo_exists():
+            self.cancel_event.set()     # window closed under a running benchmark
+            return
+        finished = False
+        changed = False
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                finished = True
+                break
+            if item[1] in _BENCH_DISPLAY_SOLVERS:
+                self._update(*item)
+                changed = True
+        if changed:
+            self._redraw()
+        if finished:
+            self.running = False
+            self.status_lbl.config(text="Benchmark cancelled." if self.cancel_event.is_set()
+                                   else "Benchmark complete!")
+        else:
+            self.root.after(_BENCH_POLL_MS, self._poll)
 
-    # Clear any previous results so re-running replaces rather than appends
-    for child in results_frame.winfo_children():
-        child.destroy()
+    # ----- matplotlib chart -----
 
-    try:
-        import matplotlib
-        matplotlib.use("TkAgg")
-        import matplotlib.pyplot as plt
+    def _build_chart(self):
         from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        import numpy as np
-
-        fig, axes = plt.subplots(1, 3, figsize=(9.2, 3.2), dpi=100)
-        fig.patch.set_facecolor(BENCHMARK_BG)
-        fig.subplots_adjust(wspace=0.45, bottom=0.28, top=0.85)
-
-        for ax_idx, (diff_name, diff_data) in enumerate(results.items()):
-            ax = axes[ax_idx]
-            ax.set_facecolor("#16213e")
-            avg_times = [diff_data[s]["avg"] for s in _BENCH_DISPLAY_SOLVERS]
-            x = np.arange(len(_BENCH_DISPLAY_SOLVERS))
-            bars = ax.bar(x, avg_times, color=_BENCH_DISPLAY_COLORS, width=0.5,
-                          edgecolor="#ffffff", linewidth=0.5)
-
-            for bar, solver_name in zip(bars, _BENCH_DISPLAY_SOLVERS):
-                val = diff_data[solver_name]["avg"]
-                sr  = diff_data[solver_name]["success_rate"]
-                if sr < 100:
-                    bar.set_alpha(0.4)
-                    label_text = f"{val:.2f}\n({sr:.0f}%)"
-                    text_color = "#ff6b81"
-                else:
-                    label_text = f"{val:.2f}"
-                    text_color = "#ffffff"
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2,
-                    bar.get_height() + max(avg_times) * 0.02,
-                    label_text, ha="center", va="bottom",
-                    fontsize=7, color=text_color, fontweight="bold",
-                )
+        from matplotlib.figure import Figure
+        from sudoku_charts import ComparisonChart
+
+        fig = Figure(figsize=(9.2, 3.2), dpi=100)
+        self.chart = ComparisonChart(fig, list(DIFFICULTY_HOLES), _BENCH_DISPLAY_SOLVERS,
+                                     _BENCH_DISPLAY_LABELS, _BENCH_DISPLAY_COLORS, self.bg)
+        self.canvas = FigureCanvasTkAgg(fig, master=self.results_frame)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, pady=5)
+        self.text_rows = None
+
+    def _update(self, diff_name, solver_name, stats):
+        val = stats["avg"]
+        sr = stats["success_rate"]
+        if self.text_rows is not None:
+            text = f"  {solver_name:20s}  avg={val:.3f}ms  min={stats['min']:.3f}ms  Success: {sr:.0f}%"
+            if sr < 100:
+                text += " [FAILED]"
+            self.text_rows[diff_name, solver_name].config(
+                text=text, fg="#a8b2d1" if sr == 100 else "#ff6b81")
+            return
+        self.chart.update(diff_name, solver_name, stats)
+
+    def _redraw(self):
+        if self.text_rows is not None:
+            return
+        self.chart.rescale()
+        self.canvas.draw_idle()
+
+    # ----- text fallback -----
 
-            ax.set_title(diff_name, color="#ffffff", fontsize=11, fontweight="bold")
-            ax.set_ylabel("Time (ms)", color="#a8b2d1", fontsize=8)
-            ax.set_xticks(x)
-            ax.set_xticklabels(_BENCH_DISPLAY_LABELS,
-                               rotation=20, ha="right", fontsize=8, color="#a8b2d1")
-            ax.tick_params(axis="y", colors="#a8b2d1", labelsize=7)
-            ax.spines["top"].set_visible(False)
-            ax.spines["right"].set_visible(False)
-            ax.spines["left"].set_color("#a8b2d1")
-            ax.spines["bottom"].set_color("#a8b2d1")
-
-        fig.suptitle("Solve Time Comparison — Greedy / Backtracking / Hybrid (avg of 5 runs, ms)",
-                     color="#ffffff", fontsize=11, fontweight="bold")
-        canvas = FigureCanvasTkAgg(fig, master=results_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True, pady=5)
-
-    except ImportError:
+    def _build_text(self):
         tk.Label(
-            results_frame,
+            self.results_frame,
             text="matplotlib not installed — showing text results.\n"
                  "Install with: pip install matplotlib",
-            font=("Segoe UI", 12), bg=BENCHMARK_BG, fg=BENCHMARK_ACCENT,
+            font=("Segoe UI", 12), bg=self.bg, fg=BENCHMARK_ACCENT,
         ).pack(pady=10)
-        for diff_name, diff_data in results.items():
+        self.text_rows = {}
+        for diff_name in DIFFICULTY_HOLES:
             tk.Label(
-                results_frame, text=f"\n--- {diff_name} ---",
-                font=("Consolas", 11, "bold"), bg=BENCHMARK_BG, fg="#ffffff",
+                self.results_frame, text=f"\n--- {diff_name} ---",
+                font=("Consolas", 11, "bold"), bg=self.bg, fg="#ffffff",
             ).pack(anchor="w")
             for solver_name in _BENCH_DISPLAY_SOLVERS:
-                stats = diff_data[solver_name]
-                sr = stats["success_rate"]
-                text = f"  {solver_name:20s}  avg={stats['avg']:.3f}ms  min={stats['min']:.3f}ms  Success: {sr:.0f}%"
-                if sr < 100:
-                    text += " [FAILED]"
-                tk.Label(
-                    results_frame, text=text, font=("Consolas", 9),
-                    bg=BENCHMARK_BG, fg="#a8b2d1" if sr == 100 else "#ff6b81",
-                ).pack(anchor="w")
-
-
-def get_candidates(board, row, col):
-    """Return the set of valid digits for the given cell."""
-    if board[row][col] != 0:
-        return set()
-    candidates = set(range(1, 10))
-    candidates -= set(board[row])
-    candidates -= {board[i][col] for i in range(9)}
-    br, bc = 3 * (row // 3), 3 * (col // 3)
-    for i in range(br, br + 3):
-        for j in range(bc, bc + 3):
-            candidates.discard(board[i][j])
-    return candidates
-
-
-def is_valid(board, row, col, num):
-    """Check whether placing ⁠ num ⁠ at (row, col) violates Sudoku rules."""
-    for i in range(9):
-        if board[row][i] == num and i != col:
-            return False
-        if board[i][col] == num and i != row:
-            return False
-    br, bc = 3 * (row // 3), 3 * (col // 3)
-    for i in range(br, br + 3):
-        for j in range(bc, bc + 3):
-            if board[i][j] == num and (i, j) != (row, col):
-                return False
-    return True
-
-
-def solve_with_backtracking(board_snapshot):
-    """Wrapper that invokes BitmaskSolver on a deep-copied board."""
-    solver = BitmaskSolver()
-    board_copy = copy.deepcopy(board_snapshot)
-    return solver.solve(board_copy)
+                row = tk.Label(
+                    self.results_frame, text=f"  {solver_name:20s}  pending...",
+                    font=("Consolas", 9), bg=self.bg, fg="#8892b0",
+                )
+                row.pack(anchor="w")
+                self.text_rows[diff_name, solver_name] = row
 
 
 # ---------- Benchmarking engine ----------
@@ -668,45 +327,12 @@ ALGO_METADATA = [
 ]
 
 
-def benchmark_all_solvers():
-    """Benchmark all solvers across Easy / Medium / Hard difficulties with success tracking."""
-    difficulties = {"Easy": 30, "Medium": 45, "Hard": 55}
-    num_trials = 5
-    results = {}
-    for diff_name, holes in difficulties.items():
-        results[diff_name] = {}
-        for solver_name in BENCHMARK_SOLVERS:
-            times = []
-            successes = 0
-            for _ in range(num_trials):
-                puzzle = generate_benchmark_puzzle(holes)
-                board_copy = copy.deepcopy(puzzle)
-                
-                start = time.perf_counter()
-                result = BENCHMARK_SOLVERS[solver_name](board_copy)
-                end = time.perf_counter()
-                
-                times.append((end - start) * 1000)
-                
-                if result is not None:
-                    successes += 1
-                    
-            results[diff_name][solver_name] = {
-                "avg": sum(times) / len(times),
-                "min": min(times),
-                "max": max(times),
-                "times": times,
-                "success_rate": (successes / num_trials) * 100
-            }
-    return results
-
-
 # ---------- GUI Theme Constants ----------
 
 COLORS = {
     "bg_dark": "#0f0f1a", "bg_card": "#1a1a2e", "bg_cell": "#1b2838",
     "bg_cell_hover": "#243448", "bg_cell_fixed": "#141e2a",
-    "bg_cell_match": "#2b3d5a",
+    "bg_cell_match": "#2b3d5a", "bg_cell_conflict": "#5c1f24",
     "accent_blue": "#4fc3f7", "accent_green": "#66bb6a",
     "accent_red": "#ef5350", "accent_orange": "#ffa726",
     "accent_purple": "#ab47bc", "accent_yellow": "#ffee58",
@@ -784,6 +410,10 @@ class SudokuDuel:
 
         self.current_turn = "user"
         self.game_over = False
+        self.ai_budget_ms = AI_MOVE_BUDGET_MS
+        self.ai_last_source = None
+        self.speculator = Speculator()
+        self.conflicts = []
         self.difficulty = "Medium"
         self.difficulty_var = ctk.StringVar(value=self.difficulty)
         self.algorithm = "Backtracking"
@@ -915,21 +545,17 @@ class SudokuDuel:
         )
         board_inner.pack(padx=3, pady=3)
 
+        # One canvas for the whole grid: 81 CTkEntry widgets made startup
+        # and resizing slow.  board_view.cells keeps the Entry-style API.
         CELL_SIZE = 45
-        for i in range(9):
-            for j in range(9):
-                pad_t = 4 if i % 3 == 0 and i != 0 else 1
-                pad_l = 4 if j % 3 == 0 and j != 0 else 1
-                cell = ctk.CTkEntry(
-                    board_inner, width=CELL_SIZE, height=CELL_SIZE,
-                    font=FONT_CELL, justify="center", corner_radius=6,
-                    fg_color=COLORS["bg_cell"],
-                    border_color=COLORS["border_light"], border_width=1,
-                    text_color=COLORS["text_primary"],
-                )
-                cell.grid(row=i, column=j, padx=(pad_l, 1), pady=(pad_t, 1))
-                cell.bind("<KeyRelease>", lambda e, r=i, c=j: self.on_cell_edit(r, c))
-                self.cells[i][j] = cell
+        self.board_view = BoardCanvas(
+            board_inner, cell_size=CELL_SIZE, font=FONT_CELL,
+            cell_color=COLORS["bg_cell"], text_color=COLORS["text_primary"],
+            line_color=COLORS["border_light"], block_color=COLORS["border_block"],
+            select_color=COLORS["accent_yellow"], on_edit=self.on_cell_edit,
+        )
+        self.board_view.pack(padx=4, pady=4)
+        self.cells = self.board_view.cells
 
         btn_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         btn_frame.pack(pady=(8, 4))
@@ -1012,15 +638,8 @@ class SudokuDuel:
                         self.pq_entries.add((i, j))
 
     def update_neighbors(self, row, col):
-        neighbours = set()
-        for i in range(9):
-            neighbours.add((row, i))
-            neighbours.add((i, col))
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for i in range(br, br + 3):
-            for j in range(bc, bc + 3):
-                neighbours.add((i, j))
-        for r, c in neighbours:
+        for p in PEERS[row * 9 + col]:
+            r, c = ROW_OF[p], COL_OF[p]
             if self.board[r][c] == 0:
                 cand = get_candidates(self.board, r, c)
                 if cand:
@@ -1029,6 +648,7 @@ class SudokuDuel:
                         self.pq_entries.add((r, c))
 
     def ai_make_move(self):
+        self.ai_last_source = None
         self._log_ai("AI analyzing current board state...")
         while self.pq and self.board[self.pq[0][1]][self.pq[0][2]] != 0:
             _, r, c = heapq.heappop(self.pq)
@@ -1049,13 +669,22 @@ class SudokuDuel:
         self.pq_entries.discard((row, col))
         self._log_ai(f"AI selected cell ({row}, {col}) with {cands_len} candidate(s) using MRV heuristic.")
 
-        self._log_ai(f"Simulating full board completion to verify correct move...")
-        solved_board = solve_with_backtracking(self.board)
-
-        if solved_board:
-            correct_val = solved_board[row][col]
-            self._log_ai(f"Simulation successful. Target value for ({row}, {col}) is {correct_val}.")
-            self.board[row][col] = correct_val
+        reply = self.speculator.take(self.board)
+        if reply is not None:
+            self._log_ai("Using the reply precomputed while the user was thinking.")
+        else:
+            self._log_ai(f"Looking for a forced move, then searching within {self.ai_budget_ms} ms...")
+            reply = anytime_move(self.board, (row, col), self.ai_budget_ms, self.solution_board)
+        r, c, correct_val, source = reply
+        self.ai_last_source = source
+
+        if correct_val is not None:
+            if (r, c) != (row, col):
+                heapq.heappush(self.pq, (cands_len, row, col))
+                self.pq_entries.add((row, col))
+                row, col = r, c
+            self._log_ai(f"Move from {AI_MOVE_SOURCES[source]}: value for ({row}, {col}) is {correct_val}.")
+            self.state.set(row, col, correct_val)
             self.cells[row][col].configure(state="normal")
             self.cells[row][col].delete(0, "end")
             self.cells[row][col].insert(0, str(correct_val))
@@ -1065,6 +694,11 @@ class SudokuDuel:
             if self.highlight_num is not None:
                 self._highlight_number(self.highlight_num)
             return True
+        elif source == "timeout":
+            heapq.heappush(self.pq, (cands_len, row, col))
+            self.pq_entries.add((row, col))
+            self._log_ai(f"Budget of {self.ai_budget_ms} ms ran out with no safe move; passing.")
+            return False
         else:
             self._log_ai("Simulation failed. No valid solution exists from this board state.")
             return False
@@ -1079,11 +713,18 @@ class SudokuDuel:
     def ai_turn(self):
         if self.game_over:
             return
+        if self._show_conflicts():
+            return
         if not self.ai_make_move():
             if self.is_complete():
                 self.game_over = True
                 self._play_sound("complete")
                 messagebox.showinfo("Game Over", "Puzzle Complete!")
+            elif self.ai_last_source == "timeout":
+                self.current_turn = "user"
+                self._update_status()
+                self.status_label.configure(text="AI passed (out of time)  •  Your Turn")
+                self._speculate()
             else:
                 # Don't end the game — let the user make a corrective move
                 self.current_turn = "user"
@@ -1103,6 +744,30 @@ class SudokuDuel:
 
         self.current_turn = "user"
         self._update_status()
+        self._speculate()
+
+    def _show_conflicts(self):
+        """Highlight the entries that left the board unsolvable; True if there are any."""
+        conflicts = find_conflicts(self.board, self.initial_board, self.solution_board)
+        if not conflicts:
+            return False
+        self.conflicts = conflicts
+        for r, c in conflicts:
+            self.cells[r][c].configure(fg_color=COLORS["bg_cell_conflict"])
+        self._log_ai(f"Board unsolvable; conflicting entries: {conflicts}.")
+        self.current_turn = "user"
+        self._update_status()
+        cells = ", ".join(f"Row {r + 1}, Col {c + 1}" for r, c in conflicts)
+        messagebox.showinfo(
+            "Conflict",
+            f"No solution exists with these entries:\n{cells}\n"
+            "Clear or change the highlighted cells to continue.",
+        )
+        return True
+
+    def _speculate(self):
+        """Work out the AI's replies to the likely user moves while the user thinks."""
+        self.speculator.start(self.board, self.solution_board)
 
     # ---- User interaction ----
 
@@ -1126,8 +791,11 @@ class SudokuDuel:
             return
         cell = self.cells[row][col]
         v = cell.get().strip()
+        if (row, col) in self.conflicts:
+            self.conflicts.remove((row, col))
+            cell.configure(fg_color=COLORS["bg_cell"])
         if v == "":
-            self.board[row][col] = 0
+            self.state.set(row, col, 0)
             self._clear_number_highlights()
             return
         try:
@@ -1139,12 +807,12 @@ class SudokuDuel:
                 if num != self.solution_board[row][col]:
                     messagebox.showerror("Incorrect", "Strict Mode: That is not the correct value.")
                     cell.delete(0, "end")
-                    self.board[row][col] = 0
+                    self.state.set(row, col, 0)
                     self._clear_number_highlights()
                     return
 
             if is_valid(self.board, row, col, num):
-                self.board[row][col] = num
+                self.state.set(row, col, num)
                 self.pq_entries.discard((row, col))
                 self.update_neighbors(row, col)
                 cell.configure(text_color=COLORS["text_user"])
@@ -1161,7 +829,7 @@ class SudokuDuel:
                 self.root.after(300, self.ai_turn)
             else:
                 cell.delete(0, "end")
-                self.board[row][col] = 0
+                self.state.set(row, col, 0)
                 self._clear_number_highlights()
         except ValueError:
             cell.delete(0, "end")
@@ -1173,12 +841,15 @@ class SudokuDuel:
     def new_game(self):
         self.game_over = False
         self._generate_puzzle()
-        self.initial_board = copy.deepcopy(self.board)
+        self.initial_board = [row[:] for row in self.board]
+        self.state = BoardState(self.board)
+        self.start_mark = self.state.mark()
         self.current_turn = "user"
         self.initialize_priority_queue()
         self._init_log_file()
         self.render_board()
         self._update_status()
+        self._speculate()
 
     def render_board(self):
         for i in range(9):
@@ -1198,35 +869,31 @@ class SudokuDuel:
     def show_hint(self):
         if self.game_over:
             return
-        solved = solve_with_backtracking(self.board)
-        if not solved:
-            messagebox.showinfo("Hint", "No solution exists from this state.")
+        hint = next_hint(self.board, solve=lambda b: solve_with_backtracking(b, entry="hint"))
+        if hint is None:
+            if self.is_complete():
+                messagebox.showinfo("Hint", "No empty cells remaining!")
+            else:
+                messagebox.showinfo("Hint", "No solution exists from this state.")
             return
-        for r in range(9):
-            for c in range(9):
-                if self.board[r][c] == 0:
-                    for i in range(9):
-                        for j in range(9):
-                            self.cells[i][j].configure(fg_color=COLORS["bg_cell"])
-                    self.cells[r][c].configure(fg_color="#3a3a00")
-                    cand = sorted(get_candidates(self.board, r, c))
-                    messagebox.showinfo(
-                        "Hint",
-                        f"Backtracking Target:\n"
-                        f"Row {r + 1}, Col {c + 1}\n"
-                        f"Solution Value: {solved[r][c]}\n"
-                        f"Valid Options: {cand}",
-                    )
-                    return
-        messagebox.showinfo("Hint", "No empty cells remaining!")
+        for i in range(9):
+            for j in range(9):
+                self.cells[i][j].configure(fg_color=COLORS["bg_cell"])
+        self.cells[hint.row][hint.col].configure(fg_color="#3a3a00")
+        messagebox.showinfo(
+            "Hint",
+            f"{hint.technique}: Row {hint.row + 1}, Col {hint.col + 1} = {hint.value}\n\n"
+            f"{hint.explanation}",
+        )
 
     def reset_board(self):
         self.game_over = False
-        self.board = copy.deepcopy(self.initial_board)
+        self.state.undo_to(self.start_mark)
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()
         self._update_status()
+        self._speculate()
 
 
 # ---------- Sudoku Launcher (Tkinter) ----------
@@ -1360,15 +1027,26 @@ class SudokuLauncher:
         self.results_frame = tk.Frame(win, bg=BG_DARK_L)
         self.results_frame.pack(fill="both", expand=True, padx=20, pady=5)
 
+        self.benchmark_run = StreamingBenchmark(self.root, self.cmp_status,
+                                                self.results_frame, BG_DARK_L)
+
+        def close():
+            self.benchmark_run.cancel()
+            win.destroy()
+
         btn_frame = tk.Frame(win, bg=BG_DARK_L)
         btn_frame.pack(pady=10)
         tk.Button(btn_frame, text="  Run Benchmark", font=FONT_BUTTON_L,
                   bg=ACCENT_2, fg=TEXT_PRIMARY_L, activebackground="#ff6b81",
                   relief="flat", padx=15, pady=6, cursor="hand2",
-                  command=lambda: self._run_benchmark(win)).pack(side="left", padx=5)
+                  command=self.benchmark_run.start).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Cancel", font=FONT_BUTTON_L,
+                  bg=ACCENT_1, fg=TEXT_PRIMARY_L, relief="flat", padx=15, pady=6,
+                  cursor="hand2", command=self.benchmark_run.cancel).pack(side="left", padx=5)
         tk.Button(btn_frame, text="Close", font=FONT_BUTTON_L,
                   bg=TEXT_MUTED, fg=BG_DARK_L, relief="flat", padx=15, pady=6,
-                  cursor="hand2", command=win.destroy).pack(side="left", padx=5)
+                  cursor="hand2", command=close).pack(side="left", padx=5)
+        win.protocol("WM_DELETE_WINDOW", close)
 
         self._show_complexity_table(win)
 
@@ -1417,96 +1095,14 @@ class SudokuLauncher:
         tk.Label(table_frame, text=analysis_text, font=("Segoe UI", 9),
                  bg=BG_CARD_L, fg=TEXT_MUTED, justify="left", anchor="w").pack(anchor="w", padx=10, pady=(0, 10))
 
-    def _run_benchmark(self, win):
-        self.cmp_status.config(text="Running benchmark... please wait")
-        win.update_idletasks()
-
-        def worker():
-            results = benchmark_all_solvers()
-            self.root.after(0, lambda: self._display_results(results))
-
-        threading.Thread(target=worker, daemon=True).start()
-
-    def _display_results(self, results):
-        self.cmp_status.config(text="Benchmark complete!")
-
-        # Clear any previous results so re-running replaces rather than appends
-        for child in self.results_frame.winfo_children():
-            child.destroy()
-
-        try:
-            import matplotlib
-            matplotlib.use("TkAgg")
-            import matplotlib.pyplot as plt
-            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-            import numpy as np
-
-            fig, axes = plt.subplots(1, 3, figsize=(9.2, 3.2), dpi=100)
-            fig.patch.set_facecolor(BG_DARK_L)
-            fig.subplots_adjust(wspace=0.45, bottom=0.28, top=0.85)
-
-            for ax_idx, (diff_name, diff_data) in enumerate(results.items()):
-                ax = axes[ax_idx]
-                ax.set_facecolor("#16213e")
-                avg_times = [diff_data[s]["avg"] for s in _BENCH_DISPLAY_SOLVERS]
-                x = np.arange(len(_BENCH_DISPLAY_SOLVERS))
-                bars = ax.bar(x, avg_times, color=_BENCH_DISPLAY_COLORS, width=0.5,
-                              edgecolor="#ffffff", linewidth=0.5)
-
-                for bar, solver_name in zip(bars, _BENCH_DISPLAY_SOLVERS):
-                    val = diff_data[solver_name]["avg"]
-                    sr  = diff_data[solver_name]["success_rate"]
-                    if sr < 100:
-                        bar.set_alpha(0.4)
-                        label_text = f"{val:.2f}\n({sr:.0f}%)"
-                        text_color = "#ff6b81"
-                    else:
-                        label_text = f"{val:.2f}"
-                        text_color = "#ffffff"
-                    ax.text(
-                        bar.get_x() + bar.get_width() / 2,
-                        bar.get_height() + max(avg_times) * 0.02,
-                        label_text, ha="center", va="bottom",
-                        fontsize=7, color=text_color, fontweight="bold",
-                    )
-
-                ax.set_title(diff_name, color="#ffffff", fontsize=11, fontweight="bold")
-                ax.set_ylabel("Time (ms)", color="#a8b2d1", fontsize=8)
-                ax.set_xticks(x)
-                ax.set_xticklabels(_BENCH_DISPLAY_LABELS,
-                                   rotation=20, ha="right", fontsize=8, color="#a8b2d1")
-                ax.tick_params(axis="y", colors="#a8b2d1", labelsize=7)
-                ax.spines["top"].set_visible(False)
-                ax.spines["right"].set_visible(False)
-                ax.spines["left"].set_color("#a8b2d1")
-                ax.spines["bottom"].set_color("#a8b2d1")
-
-            fig.suptitle("Solve Time Comparison — Greedy / Backtracking / Hybrid (avg of 5 runs, ms)",
-                         color="#ffffff", fontsize=11, fontweight="bold")
-            canvas = FigureCanvasTkAgg(fig, master=self.results_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True, pady=5)
-
-        except ImportError:
-            tk.Label(self.results_frame,
-                     text="matplotlib not installed — showing text results.\n"
-                          "Install with: pip install matplotlib",
-                     font=FONT_SUBTITLE_L, bg=BG_DARK_L, fg=ACCENT_2).pack(pady=10)
-            _BENCH_DISPLAY_SOLVERS = ["Greedy", "Backtracking", "Hybrid (D&C+DP)"]
-            for diff_name, diff_data in results.items():
-                tk.Label(self.results_frame, text=f"\n--- {diff_name} ---",
-                         font=("Consolas", 11, "bold"), bg=BG_DARK_L, fg=TEXT_PRIMARY_L).pack(anchor="w")
-                for solver_name in _BENCH_DISPLAY_SOLVERS:
-                    stats = diff_data[solver_name]
-                    sr = stats["success_rate"]
-                    text = f"  {solver_name:20s}  avg={stats['avg']:.3f}ms  Success: {sr:.0f}%"
-                    if sr < 100:
-                        text += " [FAILED]"
-                    tk.Label(self.results_frame, text=text, font=("Consolas", 9),
-                             bg=BG_DARK_L, fg=TEXT_SECONDARY_L if sr == 100 else "#ff6b81").pack(anchor="w")
-
 
 if __name__ == "__main__":
+    from sudoku_metrics import install_from_env as install_metrics
+    from sudoku_uimonitor import install_from_env
+    install_metrics()
     app = ctk.CTk()
-    SudokuDuel(app)
+    monitor = install_from_env(app)
+    game = SudokuDuel(app)
+    if monitor:
+        monitor.watch(game)
     app.mainloop()
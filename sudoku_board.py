@@ -0,0 +1,205 @@
+"""
+Compact Sudoku Board
+====================
+A flat board stored in a bytearray (81 bytes for 9×9), plus unit tables
+so callers never recompute (r // 3) * 3 + c // 3 or loop over rows,
+columns and boxes to find a cell's neighbourhood.
+
+Cells are addressed by flat index i = r * n + c.  Candidate sets are
+bitmasks with bit d-1 standing for digit d, as in the bitmask solvers.
+Boards of other N²×N² sizes get the same tables through unit_tables(n).
+"""
+
+import math
+
+
+_UNIT_TABLES = {}
+
+
+def unit_tables(n):
+    """
+    Return (row_of, col_of, box_of, rows, cols, boxes, peers) for an n×n
+    board: per-cell unit numbers, the cell indices of every row/column/box,
+    and each cell's peers (cells sharing a unit with it, excluding itself).
+    """
+    tables = _UNIT_TABLES.get(n)
+    if tables is None:
+        box = math.isqrt(n)
+        cells = range(n * n)
+        row_of = tuple(i // n for i in cells)
+        col_of = tuple(i % n for i in cells)
+        box_of = tuple((i // n // box) * box + (i % n) // box for i in cells)
+        rows = tuple(tuple(r * n + c for c in range(n)) for r in range(n))
+        cols = tuple(tuple(r * n + c for r in range(n)) for c in range(n))
+        boxes = tuple(tuple(i for i in cells if box_of[i] == b) for b in range(n))
+        peers = tuple(
+            tuple(sorted(set(rows[row_of[i]] + cols[col_of[i]] + boxes[box_of[i]]) - {i}))
+            for i in cells
+        )
+        tables = _UNIT_TABLES[n] = (row_of, col_of, box_of, rows, cols, boxes, peers)
+    return tables
+
+
+ROW_OF, COL_OF, BOX_OF, ROWS, COLS, BOXES, PEERS = unit_tables(9)
+
+
+class Board:
+    """
+    An n×n Sudoku board as a flat bytearray (0 = empty).
+
+    board[i] reads and writes cell i; copy() duplicates the board with a
+    single bytearray copy.
+    """
+
+    __slots__ = ("cells", "n")
+
+    def __init__(self, cells=None, n=9):
+        self.n = n
+        self.cells = bytearray(cells) if cells is not None else bytearray(n * n)
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Build a Board from a list-of-lists grid."""
+        return cls(bytes(v for row in grid for v in row), len(grid))
+
+    def to_grid(self):
+        """Return the board as a new list-of-lists grid."""
+        n, cells = self.n, self.cells
+        return [list(cells[r * n:(r + 1) * n]) for r in range(n)]
+
+    def copy(self):
+        return Board(self.cells, self.n)
+
+    def __getitem__(self, i):
+        return self.cells[i]
+
+    def __setitem__(self, i, value):
+        self.cells[i] = value
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.cells == other.cells
+
+    def __hash__(self):
+        return hash(bytes(self.cells))
+
+    def get(self, r, c):
+        return self.cells[r * self.n + c]
+
+    def set(self, r, c, value):
+        self.cells[r * self.n + c] = value
+
+    def peers(self, i):
+        return PEERS[i] if self.n == 9 else unit_tables(self.n)[6][i]
+
+    def candidates(self, i):
+        """Bitmask of digits that can go in cell i (0 if it is filled)."""
+        cells = self.cells
+        if cells[i]:
+            return 0
+        used = 0
+        for p in self.peers(i):
+            v = cells[p]
+            if v:
+                used |= 1 << (v - 1)
+        return ~used & ((1 << self.n) - 1)
+
+    def empties(self):
+        return [i for i, v in enumerate(self.cells) if not v]
+
+    def is_complete(self):
+        return 0 not in self.cells
+
+    def __repr__(self):
+        return f"Board({bytes(self.cells)!r}, n={self.n})"
+
+    def __str__(self):
+        return "".join(str(v) if v else "." for v in self.cells)
+
+
+class BoardState:
+    """
+    A list-of-lists grid with its row/column/box masks kept in step and an
+    undo trail.
+
+    All writes go through set(), which records (row, col, old value) on the
+    trail.  mark() returns the current trail position and undo_to(mark)
+    rolls the grid and masks back to it in O(changes), so probes and resets
+    never copy the board.  The grid is modified in place: callers that hold
+    it (e.g. a game's self.board) always see the current position.  Digit
+    counts per unit keep the masks right even while a player's board holds
+    a duplicate.
+    """
+
+    def __init__(self, grid):
+        n = len(grid)
+        self.grid = grid
+        self.n = n
+        self.box_of = unit_tables(n)[2]
+        self.rows = [0] * n
+        self.cols = [0] * n
+        self.boxes = [0] * n
+        # counts[k][d]: how often digit d appears in unit k (rows, cols, boxes).
+        self.counts = [[0] * (n + 1) for _ in range(3 * n)]
+        self.trail = []
+        for r, row in enumerate(grid):
+            for c, v in enumerate(row):
+                if v:
+                    self._add(r, c, v)
+
+    def box_index(self, r, c):
+        return self.box_of[r * self.n + c]
+
+    def _add(self, r, c, v):
+        n, counts, bit = self.n, self.counts, 1 << (v - 1)
+        b = self.box_of[r * n + c]
+        counts[r][v] += 1
+        counts[n + c][v] += 1
+        counts[2 * n + b][v] += 1
+        self.rows[r] |= bit
+        self.cols[c] |= bit
+        self.boxes[b] |= bit
+
+    def _remove(self, r, c, v):
+        n, counts, bit = self.n, self.counts, ~(1 << (v - 1))
+        b = self.box_of[r * n + c]
+        counts[r][v] -= 1
+        if not counts[r][v]:
+            self.rows[r] &= bit
+        counts[n + c][v] -= 1
+        if not counts[n + c][v]:
+            self.cols[c] &= bit
+        counts[2 * n + b][v] -= 1
+        if not counts[2 * n + b][v]:
+            self.boxes[b] &= bit
+
+    def set(self, r, c, value):
+        old = self.grid[r][c]
+        if old != value:
+            self.trail.append((r, c, old))
+            self._write(r, c, old, value)
+
+    def _write(self, r, c, old, new):
+        if old:
+            self._remove(r, c, old)
+        if new:
+            self._add(r, c, new)
+        self.grid[r][c] = new
+
+    def mark(self):
+        return len(self.trail)
+
+    def undo_to(self, mark):
+        trail, grid = self.trail, self.grid
+        while len(trail) > mark:
+            r, c, old = trail.pop()
+            self._write(r, c, grid[r][c], old)
+
+    def candidates(self, r, c):
+        """Bitmask of digits allowed in (r, c) by the masks (0 if it is filled)."""
+        if self.grid[r][c]:
+            return 0
+        used = self.rows[r] | self.cols[c] | self.boxes[self.box_of[r * self.n + c]]
+        return ~used & ((1 << self.n) - 1)
@@ -0,0 +1,222 @@
+"""
+Persistent Solution Cache
+=========================
+A small SQLite key-value store of verified solutions shared by the GUIs,
+the benchmark engine and batch tools.  The database runs in WAL mode, so any
+number of processes (e.g. the games spawned by SudokuLauncher) can read it
+concurrently while one writes.  Entries are evicted least-recently-used once
+the table grows past *max_entries*.
+
+Puzzles are keyed by a compact string encoding (one base-36 character per
+cell), or by their canonical form when canonical=True so that every
+symmetric variant of a puzzle shares one entry.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.path.join(SCRIPT_DIR, "sudoku_solutions.db")
+DEFAULT_MAX_ENTRIES = 100_000
+# Reads only refresh last_used when it is older than this, so concurrent
+# readers rarely have to take the write lock.
+TOUCH_INTERVAL = 60.0
+# Eviction runs every EVICT_EVERY inserts rather than on each one.
+EVICT_EVERY = 64
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def encode_board(board):
+    """Encode a board as one base-36 character per cell (81 chars for 9×9)."""
+    return "".join(_DIGITS[v] for row in board for v in row)
+
+
+def decode_board(key):
+    """Inverse of encode_board."""
+    n = int(len(key) ** 0.5)
+    values = [_DIGITS.index(ch) for ch in key]
+    return [values[r * n:(r + 1) * n] for r in range(n)]
+
+
+def is_solution(puzzle, solution):
+    """True if *solution* is a complete valid grid that agrees with every clue of *puzzle*."""
+    n = len(puzzle)
+    box = int(n ** 0.5)
+    if solution is None or len(solution) != n:
+        return False
+    full = set(range(1, n + 1))
+    for r in range(n):
+        if set(solution[r]) != full:
+            return False
+        for c in range(n):
+            if puzzle[r][c] and puzzle[r][c] != solution[r][c]:
+                return False
+    for c in range(n):
+        if {solution[r][c] for r in range(n)} != full:
+            return False
+    for br in range(0, n, box):
+        for bc in range(0, n, box):
+            if {solution[r][c] for r in range(br, br + box) for c in range(bc, bc + box)} != full:
+                return False
+    return True
+
+
+class SolutionCache:
+    """
+    Puzzle → solution store backed by SQLite.
+
+    Every failure (locked or read-only database, disk full, …) is treated as
+    a cache miss: the cache may make solving faster but never breaks it.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, canonical=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.canonical = canonical
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self._conn = None
+        self._pid = None
+        self._connect()
+
+    def _connect(self):
+        # A connection must not cross a fork, so child processes reopen it.
+        self._pid = os.getpid()
+        try:
+            self._conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                                         check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                " puzzle TEXT PRIMARY KEY,"
+                " solution TEXT NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)"
+            )
+        except sqlite3.Error:
+            self._conn = None
+
+    def _connection(self):
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._connect()
+        return self._conn
+
+    def _key(self, board):
+        """Return (key, transform); transform is None unless keys are canonical."""
+        if self.canonical and len(board) == 9:
+            from sudoku_canonical import canonicalise
+            canon, transform = canonicalise(board)
+            return encode_board(canon), transform
+        return encode_board(board), None
+
+    def get(self, board):
+        """Return the cached solution for *board* (a new list of lists), or None."""
+        conn = self._connection()
+        if conn is None:
+            return None
+        key, transform = self._key(board)
+        now = time.time()
+        try:
+            with self._lock:
+                row = conn.execute(
+                    "SELECT solution, last_used FROM solutions WHERE puzzle = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[1] > TOUCH_INTERVAL:
+                    conn.execute(
+                        "UPDATE solutions SET last_used = ? WHERE puzzle = ?", (now, key)
+                    )
+        except sqlite3.Error:
+            return None
+        solution = decode_board(row[0])
+        return transform.invert(solution) if transform else solution
+
+    def put(self, board, solution):
+        """Store *solution* for *board* if it is a verified solution; returns True if stored."""
+        conn = self._connection()
+        if conn is None or not is_solution(board, solution):
+            return False
+        key, transform = self._key(board)
+        value = encode_board(transform.apply(solution) if transform else solution)
+        try:
+            with self._lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO solutions (puzzle, solution, last_used) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+                self._inserts += 1
+                if self._inserts % EVICT_EVERY == 0:
+                    self._evict()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def solve(self, board, solver):
+        """
+        The cached solution for *board*, else solver(copy of board), stored
+        if it is one.  Lets a game put its own solver behind the cache.
+        """
+        solution = self.get(board)
+        if solution is None:
+            solution = solver([row[:] for row in board])
+            if solution is not None:
+                self.put(board, solution)
+        return solution
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM solutions").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM solutions WHERE puzzle IN ("
+                " SELECT puzzle FROM solutions ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    def __len__(self):
+        conn = self._connection()
+        if conn is None:
+            return 0
+        try:
+            with self._lock:
+                return conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def clear(self):
+        conn = self._connection()
+        if conn is None:
+            return
+        try:
+            with self._lock:
+                conn.execute("DELETE FROM solutions")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Return the process-wide cache at DEFAULT_CACHE_PATH, opening it on first use."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SolutionCache()
+        return _default_cache
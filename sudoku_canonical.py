@@ -0,0 +1,229 @@
+"""
+Sudoku Canonical Form
+=====================
+Maps any 9×9 puzzle to the representative of its equivalence class under
+the Sudoku symmetries produced by shuffle_board / _shuffle_board: transpose,
+band and stack permutations, row/column permutations within a band/stack,
+and digit relabelling.
+
+The representative is the lexicographically smallest 81-cell string (blanks
+as 0) over the whole symmetry group ("minlex" form).  canonicalise() also
+returns the Transform that produced it, so a solution computed for the
+canonical puzzle can be mapped back onto the original one.
+"""
+
+import itertools
+
+
+_TRIPLE_PERMS = list(itertools.permutations(range(3)))
+
+# All 1296 column orders: stack order × order within each of the 3 stacks.
+_COL_PERMS = [
+    tuple(3 * stacks[k] + within[k][i] for k in range(3) for i in range(3))
+    for stacks in _TRIPLE_PERMS
+    for within in itertools.product(_TRIPLE_PERMS, repeat=3)
+]
+
+
+class Transform:
+    """
+    One element of the Sudoku symmetry group.
+
+    canonical[i][j] = digit_map[g[row_perm[i]][col_perm[j]]] where g is the
+    source board, transposed first if *transpose* is set.  digit_map[0] is 0.
+    """
+
+    def __init__(self, transpose, row_perm, col_perm, digit_map):
+        self.transpose = transpose
+        self.row_perm = tuple(row_perm)
+        self.col_perm = tuple(col_perm)
+        self.digit_map = tuple(digit_map)
+
+    def apply(self, board):
+        """Map a board in source coordinates to canonical coordinates."""
+        g = _transposed(board) if self.transpose else board
+        dm = self.digit_map
+        return [[dm[g[r][c]] for c in self.col_perm] for r in self.row_perm]
+
+    def invert(self, board):
+        """Map a board in canonical coordinates (e.g. a cached solution) back to the source."""
+        inverse = [0] * 10
+        for src, dst in enumerate(self.digit_map):
+            inverse[dst] = src
+        g = [[0] * 9 for _ in range(9)]
+        for i, r in enumerate(self.row_perm):
+            for j, c in enumerate(self.col_perm):
+                g[r][c] = inverse[board[i][j]]
+        return _transposed(g) if self.transpose else g
+
+    def __repr__(self):
+        return (f"Transform(transpose={self.transpose}, row_perm={self.row_perm}, "
+                f"col_perm={self.col_perm}, digit_map={self.digit_map})")
+
+
+def _transposed(board):
+    return [list(col) for col in zip(*board)]
+
+
+def _relabel(values, mapping, next_label):
+    """Relabel digits in order of first appearance; mutates *mapping*."""
+    out = []
+    for v in values:
+        if v:
+            m = mapping[v]
+            if not m:
+                m = mapping[v] = next_label
+                next_label += 1
+            out.append(m)
+        else:
+            out.append(0)
+    return tuple(out), next_label
+
+
+_ROW0_CACHE = {}
+
+
+def _min_perms_for(filled_mask):
+    """
+    Return (pattern, column orders) minimising the filled/blank pattern of a
+    row whose filled cells are the bits of *filled_mask*.  In a valid row the
+    digits are distinct, so this is exactly the minimal relabelled row.
+    """
+    hit = _ROW0_CACHE.get(filled_mask)
+    if hit is None:
+        best = None
+        perms = []
+        for perm in _COL_PERMS:
+            key = tuple((filled_mask >> p) & 1 for p in perm)
+            if best is None or key < best:
+                best = key
+                perms = []
+            if key == best:
+                perms.append(perm)
+        hit = _ROW0_CACHE[filled_mask] = (best, perms)
+    return hit
+
+
+def _residual_key(g, used, perm, mapping, next_label, i):
+    """
+    Key identifying everything that still matters about a search state: the
+    remaining rows as they would be seen through its column order and digit
+    map, grouped by band.  States with equal keys have identical best
+    continuations, so only one of them needs to be explored.
+    """
+    def view(r):
+        row = g[r]
+        return tuple(mapping[row[p]] or -row[p] for p in perm)
+
+    if i % 3:
+        band = used[i - i % 3] // 3
+        current = tuple(sorted(view(r) for r in range(band * 3, band * 3 + 3) if r not in used))
+    else:
+        current = ()
+    used_bands = {r // 3 for r in used}
+    others = tuple(sorted(
+        tuple(sorted(view(r) for r in range(b * 3, b * 3 + 3)))
+        for b in range(3) if b not in used_bands
+    ))
+    return next_label, current, others
+
+
+# Deduplicating costs about as much as expanding a state, so it only pays off
+# when ties have blown the state set up (sparse puzzles, the empty board).
+_DEDUP_THRESHOLD = 512
+
+
+def _dedup(states, grids, i):
+    seen = set()
+    unique = []
+    for state in states:
+        t, used, perm, mapping, next_label = state
+        key = _residual_key(grids[t], used, perm, mapping, next_label, i)
+        if key not in seen:
+            seen.add(key)
+            unique.append(state)
+    return unique
+
+
+def canonicalise(board):
+    """
+    Return (canonical_board, transform) for a 9×9 puzzle or grid.
+
+    transform.apply(board) == canonical_board, and transform.invert() maps
+    any board in canonical coordinates back onto *board*'s coordinates.
+    Isomorphic valid puzzles always produce the same canonical_board.
+    """
+    if len(board) != 9:
+        raise ValueError("canonical form is only defined for 9×9 boards")
+    grids = (board, _transposed(board))
+
+    # Row 0: any source row of either orientation under the column orders
+    # that push its blanks furthest left.
+    best = None
+    row0 = []
+    for t, g in enumerate(grids):
+        for r0 in range(9):
+            row = g[r0]
+            key, perms = _min_perms_for(sum(1 << c for c in range(9) if row[c]))
+            if best is None or key < best:
+                best = key
+                row0 = []
+            if key == best:
+                row0.append((t, r0, perms))
+    states = []
+    for t, r0, perms in row0:
+        row = grids[t][r0]
+        for perm in perms:
+            mapping = [0] * 10
+            _, next_label = _relabel([row[p] for p in perm], mapping, 1)
+            states.append((t, (r0,), perm, mapping, next_label))
+
+    # Rows 1..8: extend every surviving state, keep only the minimal rows.
+    has_blanks = any(0 in row for row in board)
+    for i in range(1, 9):
+        if has_blanks and len(states) > _DEDUP_THRESHOLD:
+            states = _dedup(states, grids, i)
+        best = None
+        next_states = []
+        for t, used, perm, mapping, next_label in states:
+            g = grids[t]
+            if i % 3:
+                band = used[i - i % 3] // 3
+                options = [r for r in range(band * 3, band * 3 + 3) if r not in used]
+            else:
+                used_bands = {r // 3 for r in used}
+                options = [r for r in range(9) if r // 3 not in used_bands]
+            for r in options:
+                row = g[r]
+                new_mapping = mapping[:]
+                key, new_next = _relabel([row[p] for p in perm], new_mapping, next_label)
+                if best is None or key < best:
+                    best = key
+                    next_states = []
+                if key == best:
+                    next_states.append((t, used + (r,), perm, new_mapping, new_next))
+        states = next_states
+
+    t, row_perm, col_perm, mapping, next_label = states[0]
+    # Digits absent from the puzzle get the remaining labels so the map is a
+    # bijection and a full solution can be mapped back.
+    for d in range(1, 10):
+        if not mapping[d]:
+            mapping[d] = next_label
+            next_label += 1
+    transform = Transform(bool(t), row_perm, col_perm, mapping)
+    return transform.apply(board), transform
+
+
+def canonical_key(board):
+    """Return the canonical form of *board* as an 81-character digit string."""
+    canon, _ = canonicalise(board)
+    return "".join(str(v) for row in canon for v in row)
+
+
+def equivalence_classes(puzzles):
+    """Group puzzles by canonical form: {canonical_key: [indices into puzzles]}."""
+    classes = {}
+    for idx, puzzle in enumerate(puzzles):
+        classes.setdefault(canonical_key(puzzle), []).append(idx)
+    return classes
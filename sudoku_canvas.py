@@ -0,0 +1,196 @@
+"""
+Single-Canvas Sudoku Board
+==========================
+Draws the whole 9×9 grid on one tk.Canvas (81 rectangles + 81 text items)
+instead of 81 Entry widgets.  Each cell is exposed through a small
+Entry-compatible proxy so existing SudokuDuel code that calls
+get / insert / delete / configure on self.cells[r][c] keeps working.
+"""
+
+import tkinter as tk
+
+
+DIGIT_KEYS = set("123456789")
+_ARROWS = {"Up": (-1, 0), "Down": (1, 0), "Left": (0, -1), "Right": (0, 1)}
+
+
+class CanvasCell:
+    """Entry-like handle for one cell of a BoardCanvas."""
+
+    def __init__(self, view, row, col):
+        self.view = view
+        self.row = row
+        self.col = col
+        self.text = ""
+        self.state = "normal"
+        self.fill = view.cell_color
+        self.disabled_fill = None
+        self.fg = view.text_color
+        self.disabled_fg = None
+
+    # ---- tk.Entry / CTkEntry compatible API ----
+
+    def get(self):
+        return self.text
+
+    def delete(self, first, last=None):
+        first = self._index(first)
+        last = first + 1 if last is None else self._index(last)
+        self.text = self.text[:first] + self.text[last:]
+        self.view._draw_text(self)
+
+    def insert(self, index, string):
+        index = self._index(index)
+        self.text = self.text[:index] + str(string) + self.text[index:]
+        self.view._draw_text(self)
+
+    def configure(self, **kwargs):
+        for key, value in kwargs.items():
+            if key in ("fg_color", "bg"):
+                self.fill = value
+            elif key == "disabledbackground":
+                self.disabled_fill = value
+            elif key == "text_color":
+                self.fg = value
+                self.disabled_fg = value
+            elif key == "fg":
+                self.fg = value
+            elif key == "disabledforeground":
+                self.disabled_fg = value
+            elif key == "state":
+                self.state = value
+            elif key == "font":
+                self.view.itemconfigure(self.view.text_items[self.row][self.col], font=value)
+        self.view._draw_cell(self)
+
+    config = configure
+
+    def cget(self, key):
+        if key in ("fg_color", "bg"):
+            return self.fill
+        if key in ("text_color", "fg"):
+            return self.fg
+        if key == "state":
+            return self.state
+        raise ValueError(f"unknown option: {key}")
+
+    def focus_set(self):
+        self.view.select(self.row, self.col)
+
+    def _index(self, index):
+        if index == "end" or index == tk.END:
+            return len(self.text)
+        return int(index)
+
+
+class BoardCanvas(tk.Canvas):
+    """
+    A 9×9 Sudoku grid drawn on a single canvas.
+
+    Click a cell to select it; type 1-9 to fill it, BackSpace/Delete to clear
+    it and the arrow keys to move the selection.  on_edit(row, col) is called
+    after every change to a cell's text, mirroring the <KeyRelease> binding
+    the Entry-based boards used.
+    """
+
+    def __init__(self, master, cell_size=45, font=("Helvetica", 20, "bold"),
+                 cell_color="white", text_color="black", line_color="#b0b0b0",
+                 block_color="black", select_color="#2196F3", on_edit=None, **kwargs):
+        self.cell_size = cell_size
+        self.cell_color = cell_color
+        self.text_color = text_color
+        self.on_edit = on_edit
+        size = cell_size * 9 + 4
+        kwargs.setdefault("bg", block_color)
+        super().__init__(master, width=size, height=size, highlightthickness=0,
+                         takefocus=1, **kwargs)
+
+        self.rect_items = [[None] * 9 for _ in range(9)]
+        self.text_items = [[None] * 9 for _ in range(9)]
+        for r in range(9):
+            for c in range(9):
+                x0, y0 = self._origin(r, c)
+                self.rect_items[r][c] = self.create_rectangle(
+                    x0, y0, x0 + cell_size, y0 + cell_size,
+                    fill=cell_color, outline=line_color, width=1,
+                )
+                self.text_items[r][c] = self.create_text(
+                    x0 + cell_size / 2, y0 + cell_size / 2,
+                    text="", font=font, fill=text_color,
+                )
+        for k in range(0, 10, 3):
+            p = 2 + k * cell_size
+            self.create_line(p, 0, p, size, fill=block_color, width=3)
+            self.create_line(0, p, size, p, fill=block_color, width=3)
+        self.select_item = self.create_rectangle(
+            0, 0, 0, 0, outline=select_color, width=3, state="hidden",
+        )
+
+        self.cells = [[CanvasCell(self, r, c) for c in range(9)] for r in range(9)]
+        self.selected = None
+
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<Key>", self._on_key)
+
+    def _origin(self, r, c):
+        return 2 + c * self.cell_size, 2 + r * self.cell_size
+
+    def cell_at(self, x, y):
+        """Return (row, col) under canvas coordinates (x, y), or None."""
+        c = int((x - 2) // self.cell_size)
+        r = int((y - 2) // self.cell_size)
+        if 0 <= r < 9 and 0 <= c < 9:
+            return r, c
+        return None
+
+    def select(self, row, col):
+        self.selected = (row, col)
+        x0, y0 = self._origin(row, col)
+        self.coords(self.select_item, x0 + 1, y0 + 1,
+                    x0 + self.cell_size - 1, y0 + self.cell_size - 1)
+        self.itemconfigure(self.select_item, state="normal")
+        self.tag_raise(self.select_item)
+        self.focus_set()
+
+    def clear_selection(self):
+        self.selected = None
+        self.itemconfigure(self.select_item, state="hidden")
+
+    def _draw_cell(self, cell):
+        disabled = cell.state == "disabled"
+        fill = cell.disabled_fill if disabled and cell.disabled_fill else cell.fill
+        fg = cell.disabled_fg if disabled and cell.disabled_fg else cell.fg
+        self.itemconfigure(self.rect_items[cell.row][cell.col], fill=fill)
+        self.itemconfigure(self.text_items[cell.row][cell.col], fill=fg)
+
+    def _draw_text(self, cell):
+        self.itemconfigure(self.text_items[cell.row][cell.col], text=cell.text)
+
+    def _on_click(self, event):
+        pos = self.cell_at(event.x, event.y)
+        if pos is not None:
+            self.select(*pos)
+
+    def _on_key(self, event):
+        if self.selected is None:
+            return
+        r, c = self.selected
+        if event.keysym in _ARROWS:
+            dr, dc = _ARROWS[event.keysym]
+            self.select((r + dr) % 9, (c + dc) % 9)
+            return
+        cell = self.cells[r][c]
+        if cell.state == "disabled":
+            return
+        if event.char in DIGIT_KEYS:
+            new_text = event.char
+        elif event.keysym in ("BackSpace", "Delete"):
+            new_text = ""
+        else:
+            return
+        if new_text == cell.text:
+            return
+        cell.text = new_text
+        self._draw_text(cell)
+        if self.on_edit:
+            self.on_edit(r, c)
@@ -0,0 +1,140 @@
+"""
+Benchmark Charts
+================
+The matplotlib charts of the benchmark windows, drawn on a plain Figure so
+the same code serves a Tk canvas (FigureCanvasTkAgg) and headless reports
+(Figure.savefig through Agg).  No backend is selected here.
+
+    PerformanceChart   sudoku_analysis: grouped bars, difficulty × solver
+    ComparisonChart    sudoku_backtracking: one panel of bars per difficulty
+
+Both start with empty bars and are filled with update() calls, so a window
+can grow them as results stream in.
+"""
+
+
+ALGO_COLORS = ["#4fc3f7", "#66bb6a", "#ef5350", "#ffa726", "#ab47bc"]
+
+# Solvers of the comparison chart (a subset of BENCHMARK_SOLVERS)
+COMPARISON_SOLVERS = ["Greedy", "Backtracking", "Hybrid (D&C+DP)"]
+COMPARISON_LABELS  = ["Greedy", "Backtracking", "Hybrid"]
+COMPARISON_COLORS  = ["#3498db", "#e74c3c", "#f39c12"]
+COMPARISON_BG      = "#1a1a2e"
+
+
+class PerformanceChart:
+    """Average solve time per difficulty, one bar per solver."""
+
+    def __init__(self, fig, difficulties, solver_names):
+        fig.set_facecolor("#0f0f1a")
+        ax = fig.add_subplot(111)
+        ax.set_facecolor("#1a1a2e")
+
+        n_algo = len(solver_names)
+        x = range(len(difficulties))
+        width = 0.15
+
+        self.bars = {}
+        self.labels = {}
+        for idx, name in enumerate(solver_names):
+            bars = ax.bar([i + idx * width for i in x], [0] * len(difficulties), width, label=name,
+                          color=ALGO_COLORS[idx % len(ALGO_COLORS)], edgecolor="none", alpha=0.92)
+            for bar, d in zip(bars, difficulties):
+                self.bars[d, name] = bar
+                self.labels[d, name] = ax.text(
+                    bar.get_x() + bar.get_width() / 2, 0, "",
+                    ha="center", va="bottom", fontsize=7, color="#e0e0e0", fontweight="bold")
+
+        ax.set_xlabel("Difficulty", fontsize=12, color="#90a4ae", labelpad=8)
+        ax.set_ylabel("Avg Solve Time (ms)", fontsize=12, color="#90a4ae", labelpad=8)
+        ax.set_title("Algorithm Performance Comparison", fontsize=15,
+                     color="#4fc3f7", pad=12, fontweight="bold")
+        ax.set_xticks([i + width * (n_algo - 1) / 2 for i in x])
+        ax.set_xticklabels(difficulties, fontsize=11, color="#e0e0e0")
+        ax.tick_params(axis="y", colors="#90a4ae")
+        ax.legend(fontsize=9, loc="upper left", facecolor="#1a1a2e",
+                  edgecolor="#2a3a5e", labelcolor="#e0e0e0")
+        ax.spines["top"].set_visible(False)
+        ax.spines["right"].set_visible(False)
+        ax.spines["bottom"].set_color("#2a3a5e")
+        ax.spines["left"].set_color("#2a3a5e")
+        ax.grid(axis="y", color="#2a3a5e", linewidth=0.5, alpha=0.5)
+        fig.tight_layout()
+        self.ax = ax
+
+    def update(self, averages):
+        """Set the bars to *averages* {(difficulty, solver): ms or None}."""
+        for key, v in averages.items():
+            v = v or 0
+            self.bars[key].set_height(v)
+            self.labels[key].set_y(v)
+            self.labels[key].set_text(f"{v:.1f}" if v > 0 else "")
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class ComparisonChart:
+    """One panel per difficulty with a bar per solver; failures are drawn faded."""
+
+    def __init__(self, fig, difficulties, solvers, labels, colors, bg,
+                 title="Solve Time Comparison — Greedy / Backtracking / Hybrid (avg of 5 runs, ms)"):
+        axes = fig.subplots(1, len(difficulties), squeeze=False)[0]
+        fig.patch.set_facecolor(bg)
+        fig.subplots_adjust(wspace=0.45, bottom=0.28, top=0.85)
+
+        self.solvers = list(solvers)
+        self.axes = {}
+        self.bars = {}
+        self.labels = {}
+        x = range(len(self.solvers))
+        for ax, diff_name in zip(axes, difficulties):
+            ax.set_facecolor("#16213e")
+            bars = ax.bar(x, [0] * len(x), color=colors, width=0.5,
+                          edgecolor="#ffffff", linewidth=0.5)
+            self.axes[diff_name] = ax
+            for bar, solver_name in zip(bars, self.solvers):
+                self.bars[diff_name, solver_name] = bar
+                self.labels[diff_name, solver_name] = ax.text(
+                    bar.get_x() + bar.get_width() / 2, 0, "",
+                    ha="center", va="bottom", fontsize=7, fontweight="bold",
+                )
+
+            ax.set_title(diff_name, color="#ffffff", fontsize=11, fontweight="bold")
+            ax.set_ylabel("Time (ms)", color="#a8b2d1", fontsize=8)
+            ax.set_xticks(x)
+            ax.set_xticklabels(labels, rotation=20, ha="right", fontsize=8, color="#a8b2d1")
+            ax.tick_params(axis="y", colors="#a8b2d1", labelsize=7)
+            ax.spines["top"].set_visible(False)
+            ax.spines["right"].set_visible(False)
+            ax.spines["left"].set_color("#a8b2d1")
+            ax.spines["bottom"].set_color("#a8b2d1")
+
+        fig.suptitle(title, color="#ffffff", fontsize=11, fontweight="bold")
+
+    def update(self, diff_name, solver_name, stats):
+        """Show benchmark_all_solvers *stats* for one bar; call rescale() after a batch."""
+        val = stats["avg"]
+        sr = stats["success_rate"]
+        bar = self.bars[diff_name, solver_name]
+        bar.set_height(val)
+        bar.set_alpha(0.4 if sr < 100 else 1.0)
+        label = self.labels[diff_name, solver_name]
+        label.set_text(f"{val:.2f}\n({sr:.0f}%)" if sr < 100 else f"{val:.2f}")
+        label.set_color("#ff6b81" if sr < 100 else "#ffffff")
+
+    def update_all(self, results):
+        """Fill the chart from a complete benchmark_all_solvers() result."""
+        for diff_name, diff_data in results.items():
+            for solver_name in self.solvers:
+                if diff_name in self.axes and solver_name in diff_data:
+                    self.update(diff_name, solver_name, diff_data[solver_name])
+        self.rescale()
+
+    def rescale(self):
+        for diff_name, ax in self.axes.items():
+            top = max(self.bars[diff_name, s].get_height() for s in self.solvers)
+            for solver_name in self.solvers:
+                height = self.bars[diff_name, solver_name].get_height()
+                self.labels[diff_name, solver_name].set_y(height + top * 0.02)
+            ax.relim()
+            ax.autoscale_view()
@@ -0,0 +1,77 @@
+"""
+Conflict Localiser
+==================
+Finds the entries that have made a board unsolvable.  In non-strict mode a
+player can enter a digit that breaks no rule yet rules out every solution;
+instead of letting the AI fail a full search on such a board, the duels ask
+for the smallest set of entered cells (filled since the puzzle was dealt)
+whose removal makes it solvable again, and highlight them.
+
+A board that still has a solution has no conflicts, whatever the entries
+are (several duels deal puzzles with more than one solution), so that is
+checked first.  Otherwise the givens are searched for their solutions (at
+most CONFLICT_SOLUTIONS) and the one the entries agree with most decides:
+the entries that disagree with it are the cells to clear.  Once the search
+has proved the givens have a single solution it is cached, and later calls
+for the same deal just compare the board with it.
+"""
+
+from sudoku_board import Board
+from sudoku_cache import encode_board, get_default_cache
+from sudoku_engine import iter_solutions, search
+from sudoku_rating import LogicState
+
+
+CONFLICT_SOLUTIONS = 64         # solutions of the givens compared
+
+_unique = set()                 # encoded givens proved to have exactly one solution
+
+
+def entered_cells(board, initial_board):
+    """Cells filled in *board* that were empty in *initial_board*, as (row, col)."""
+    n = len(board)
+    return [(r, c) for r in range(n) for c in range(n)
+            if board[r][c] and not initial_board[r][c]]
+
+
+def _disagreeing(board, cells, solution):
+    return [(r, c) for r, c in cells if board[r][c] != solution[r][c]]
+
+
+def find_conflicts(board, initial_board, solution=None):
+    """
+    The smallest set of entered cells whose removal makes *board* solvable,
+    as a sorted list of (row, col); [] if the board is solvable as it stands,
+    None if the givens themselves have no solution.  *solution* is a solution
+    of the givens if the caller knows one; it is only trusted to be the
+    solution once the givens are proved unique.  With more than
+    CONFLICT_SOLUTIONS solutions the set is the smallest among those seen.
+    """
+    cells = entered_cells(board, initial_board)
+    if solution is not None and not _disagreeing(board, cells, solution):
+        return []
+    key = encode_board(initial_board)
+    if key in _unique:
+        if solution is None:
+            solution = get_default_cache().get(initial_board)
+        if solution is not None:
+            return _disagreeing(board, cells, solution)
+
+    if not LogicState(board).broken and search(Board.from_grid(board), 1)[0]:
+        return []
+    if LogicState(initial_board).broken:
+        return None     # clashing givens: the search below would not finish
+
+    best = None
+    found = 0
+    for candidate in iter_solutions(initial_board, CONFLICT_SOLUTIONS):
+        found += 1
+        wrong = _disagreeing(board, cells, candidate)
+        if best is None or len(wrong) < len(best[0]):
+            best = (wrong, candidate)
+    if best is None:
+        return None
+    if found == 1:      # proved unique: later calls compare with the cached solution
+        _unique.add(key)
+        get_default_cache().put(initial_board, best[1])
+    return best[0]
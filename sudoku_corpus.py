@@ -0,0 +1,255 @@
+"""
+Benchmark Corpus and Suite Runner
+=================================
+A frozen, versioned set of puzzles (benchmark_corpus.json) and a headless
+runner that times every solver on it.  Nothing is generated at benchmark
+time, so two runs of the suite measure exactly the same boards and the
+report of one machine can be compared with another's.
+
+Tiers:
+
+    Easy, Medium, Hard   rated generate_puzzle() output, 9×9
+    Expert               well-known hard puzzles (AI Escargot, Easter Monster, …)
+    17-clue              minimal puzzles with the fewest possible clues
+    16×16, 25×25         large boards for the scaling benchmark
+
+Every puzzle has a unique solution, checked when the corpus is built and
+again by verify_corpus().  No two 9×9 puzzles are symmetric variants of
+each other (sudoku_canonical), and the suite report counts each tier's
+equivalence classes next to its puzzles.  Boards are stored with
+sudoku_cache.encode_board.  Bump CORPUS_VERSION whenever the puzzles change.
+
+    python sudoku_corpus.py [--output report.json] [--tiers Easy Hard] [--timeout 5]
+    python sudoku_corpus.py --rebuild [--seed 2024]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from sudoku_cache import decode_board, encode_board, is_solution
+from sudoku_canonical import canonical_key, equivalence_classes
+from sudoku_engine import BENCHMARK_SOLVERS, BitmaskSolver, _time_solver_in_process, generate_puzzle
+from sudoku_rating import rate
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(SCRIPT_DIR, "benchmark_corpus.json")
+CORPUS_VERSION = 1
+DEFAULT_SEED = 2024
+PUZZLES_PER_TIER = 10
+SUITE_TIMEOUT = 5.0             # seconds per solve
+
+GENERATED_TIERS = {             # tier: (difficulty, box)
+    "Easy":   ("Easy", 3),
+    "Medium": ("Medium", 3),
+    "Hard":   ("Hard", 3),
+    "16×16":  ("Medium", 4),
+    "25×25":  ("Easy", 5),
+}
+
+KNOWN_PUZZLES = {
+    "Expert": {
+        "AI Escargot":      "100007090030020008009600500005300900010080002600004000300000010040000007007000300",
+        "Easter Monster":   "100000002090400050006000700050903000000070000000850040700000600030009080002000001",
+        "Golden Nugget":    "000000039000001005003050800008090006070002000100400000009080050020000600400700000",
+        "Inkala 2012":      "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+    },
+    "17-clue": {
+        "Royle 17 #1":      "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+        "Royle 17 #2":      "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+        "Royle 17 #3":      "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+    },
+}
+
+TIER_ORDER = ["Easy", "Medium", "Hard", "Expert", "17-clue", "16×16", "25×25"]
+
+
+# ---------- Corpus ----------
+
+def _entry(puzzle_id, board):
+    entry = {"id": puzzle_id, "board": encode_board(board),
+             "clues": sum(1 for row in board for v in row if v)}
+    if len(board) == 9:
+        rating = rate(board)
+        entry["technique"] = rating.technique
+        entry["difficulty"] = rating.difficulty
+    return entry
+
+
+def build_corpus(seed=DEFAULT_SEED, per_tier=PUZZLES_PER_TIER):
+    """
+    Generate a fresh corpus dict (deterministic for a given *seed*).  A
+    generated 9×9 puzzle symmetric to one already in the corpus is replaced.
+    """
+    random.seed(seed)
+    seen = {canonical_key(decode_board(key))
+            for puzzles in KNOWN_PUZZLES.values() for key in puzzles.values()}
+    tiers = {}
+    for tier in TIER_ORDER:
+        if tier in KNOWN_PUZZLES:
+            tiers[tier] = [_entry(name, decode_board(key))
+                           for name, key in KNOWN_PUZZLES[tier].items()]
+            continue
+        difficulty, box = GENERATED_TIERS[tier]
+        count = per_tier if box == 3 else max(per_tier // 2, 1)
+        tiers[tier] = []
+        while len(tiers[tier]) < count:
+            puzzle = generate_puzzle(difficulty, box)[0]
+            if box == 3:
+                key = canonical_key(puzzle)
+                if key in seen:
+                    continue
+                seen.add(key)
+            tiers[tier].append(_entry(f"{tier}-{len(tiers[tier]) + 1:02d}", puzzle))
+    return {"version": CORPUS_VERSION, "seed": seed, "tiers": tiers}
+
+
+def save_corpus(corpus, path=CORPUS_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+
+
+_loaded = {}
+
+
+def load_corpus(path=CORPUS_PATH):
+    """Load (and memoise) the corpus at *path*; raises ValueError on a version mismatch."""
+    corpus = _loaded.get(path)
+    if corpus is None:
+        with open(path, encoding="utf-8") as f:
+            corpus = json.load(f)
+        if corpus.get("version") != CORPUS_VERSION:
+            raise ValueError(f"{path}: corpus version {corpus.get('version')}, "
+                             f"expected {CORPUS_VERSION}")
+        _loaded[path] = corpus
+    return corpus
+
+
+def corpus_puzzles(tier, limit=None, path=CORPUS_PATH):
+    """Return the boards of *tier* as new list-of-lists grids."""
+    entries = load_corpus(path)["tiers"][tier]
+    return [decode_board(entry["board"]) for entry in entries[:limit]]
+
+
+def corpus_classes(corpus, tiers=None):
+    """
+    {tier: number of distinct puzzles up to symmetry}.  Only 9×9 boards are
+    canonicalised; larger ones count as distinct unless identical.
+    """
+    counts = {}
+    for tier, entries in corpus["tiers"].items():
+        if tiers is not None and tier not in tiers:
+            continue
+        boards = [decode_board(entry["board"]) for entry in entries]
+        if boards and len(boards[0]) == 9:
+            counts[tier] = len(equivalence_classes(boards))
+        else:
+            counts[tier] = len({entry["board"] for entry in entries})
+    return counts
+
+
+def verify_corpus(corpus):
+    """Return the ids of puzzles that do not have exactly one solution."""
+    solver = BitmaskSolver()
+    return [entry["id"] for entries in corpus["tiers"].values() for entry in entries
+            if solver.count_solutions(decode_board(entry["board"]), limit=2) != 1]
+
+
+# ---------- Suite ----------
+
+def run_suite(solvers=None, tiers=None, timeout=SUITE_TIMEOUT, path=CORPUS_PATH, progress_cb=None):
+    """
+    Time every solver on every corpus puzzle of *tiers* (default: all).
+
+    Each solve runs in its own process and is cut off after *timeout*
+    seconds, which counts as a failure charged the full timeout.  Returns a
+    JSON-serialisable report: run metadata, one record per measurement and
+    a {tier: {solver: {avg, min, max, success_rate}}} summary.
+    """
+    solvers = BENCHMARK_SOLVERS if solvers is None else solvers
+    corpus = load_corpus(path)
+    tiers = [t for t in TIER_ORDER if t in corpus["tiers"]] if tiers is None else tiers
+    total = sum(len(corpus["tiers"][t]) for t in tiers) * len(solvers)
+    done = 0
+    records = []
+    summary = {}
+    for tier in tiers:
+        summary[tier] = {}
+        entries = corpus["tiers"][tier]
+        for name, fn in solvers.items():
+            times = []
+            solved = 0
+            for entry in entries:
+                puzzle = decode_board(entry["board"])
+                ms, ok = _time_solver_in_process(_verified(fn), puzzle, timeout)
+                records.append({"tier": tier, "puzzle": entry["id"], "algorithm": name,
+                                "time_ms": ms, "solved": bool(ok)})
+                times.append(ms if ms is not None else timeout * 1000)
+                solved += bool(ok)
+                done += 1
+                if progress_cb:
+                    progress_cb(done, total)
+            summary[tier][name] = {
+                "avg": sum(times) / len(times),
+                "min": min(times),
+                "max": max(times),
+                "success_rate": solved / len(entries) * 100,
+            }
+    return {
+        "corpus_version": corpus["version"],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timeout_s": timeout,
+        "classes": corpus_classes(corpus, tiers),
+        "records": records,
+        "summary": summary,
+    }
+
+
+class _verified:
+    """Solver wrapper whose result is the solution only if it checks out."""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, board):
+        solution = self.fn(board)
+        return solution if is_solution(board, solution) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the solver suite on the benchmark corpus.")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--tiers", nargs="+", choices=TIER_ORDER)
+    parser.add_argument("--timeout", type=float, default=SUITE_TIMEOUT)
+    parser.add_argument("--rebuild", action="store_true", help="regenerate benchmark_corpus.json")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    if args.rebuild:
+        corpus = build_corpus(args.seed)
+        bad = verify_corpus(corpus)
+        if bad:
+            sys.exit(f"puzzles without a unique solution: {bad}")
+        save_corpus(corpus)
+        print(f"wrote {CORPUS_PATH}")
+        return
+
+    report = run_suite(tiers=args.tiers, timeout=args.timeout)
+    text = json.dumps(report, indent=1, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
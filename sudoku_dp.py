@@ -1,199 +1,20 @@
 import tkinter as tk
 from tkinter import messagebox
 import heapq
+import queue
 import random
-import copy
-
-class BitmaskSolver:
-    def __init__(self):
-        self.rows = [0] * 9
-        self.cols = [0] * 9
-        self.boxes = [0] * 9
-
-    def _get_box_index(self, r, c):
-        return (r // 3) * 3 + (c // 3)
-
-    def _initialize_masks(self, board):
-        self.rows = [0] * 9
-        self.cols = [0] * 9
-        self.boxes = [0] * 9
-        empty_cells = []
-        for r in range(9):
-            for c in range(9):
-                if board[r][c] != 0:
-                    val = board[r][c] - 1
-                    mask = (1 << val)
-                    self.rows[r] |= mask
-                    self.cols[c] |= mask
-                    self.boxes[self._get_box_index(r, c)] |= mask
-                else:
-                    empty_cells.append((r, c))
-        return empty_cells
-
-    def solve(self, board):
-        # Solves and returns the board, or None
-        empty_cells = self._initialize_masks(board)
-        empty_cells.sort(key=lambda cell: self._count_options(cell[0], cell[1]))
-        
-        if self._backtrack(board, empty_cells, 0):
-            return board
-        return None
+import threading
 
-    def count_solutions(self, board, limit=2):
-        # Returns number of solutions found (stops at 'limit')
-        self._initialize_masks(board) # Re-init masks for this check
-        
-        # Note: We don't sort empty_cells here to keep it simple/fast for checking
-        empty_cells = [(r, c) for r in range(9) for c in range(9) if board[r][c] == 0]
-        return self._backtrack_count(board, empty_cells, 0, limit)
-
-    def _count_options(self, r, c):
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        options = 0
-        for k in range(9):
-            if not (taken & (1 << k)):
-                options += 1
-        return options
-
-    def _backtrack(self, board, empty_cells, idx):
-        if idx == len(empty_cells):
-            return True
-        r, c = empty_cells[idx]
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        for k in range(9):
-            mask = 1 << k
-            if not (taken & mask):
-                board[r][c] = k + 1
-                self.rows[r] |= mask; self.cols[c] |= mask; self.boxes[box_idx] |= mask
-                
-                if self._backtrack(board, empty_cells, idx + 1):
-                    return True
-                
-                self.rows[r] &= ~mask; self.cols[c] &= ~mask; self.boxes[box_idx] &= ~mask
-                board[r][c] = 0
-        return False
-
-    def _backtrack_count(self, board, empty_cells, idx, limit):
-        if idx == len(empty_cells):
-            return 1
-        
-        r, c = empty_cells[idx]
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        
-        count = 0
-        for k in range(9):
-            mask = 1 << k
-            if not (taken & mask):
-                board[r][c] = k + 1
-                self.rows[r] |= mask; self.cols[c] |= mask; self.boxes[box_idx] |= mask
-                
-                count += self._backtrack_count(board, empty_cells, idx + 1, limit)
-                
-                self.rows[r] &= ~mask; self.cols[c] &= ~mask; self.boxes[box_idx] &= ~mask
-                board[r][c] = 0
-                
-                if count >= limit: # Optimization: Stop if we found enough
-                    return count
-        return count
-
-class BitmaskSolver:
-    def __init__(self):
-        self.rows = [0] * 9
-        self.cols = [0] * 9
-        self.boxes = [0] * 9
-
-    def _get_box_index(self, r, c):
-        return (r // 3) * 3 + (c // 3)
-
-    def _initialize_masks(self, board):
-        self.rows = [0] * 9
-        self.cols = [0] * 9
-        self.boxes = [0] * 9
-        empty_cells = []
-        for r in range(9):
-            for c in range(9):
-                if board[r][c] != 0:
-                    val = board[r][c] - 1
-                    mask = (1 << val)
-                    self.rows[r] |= mask
-                    self.cols[c] |= mask
-                    self.boxes[self._get_box_index(r, c)] |= mask
-                else:
-                    empty_cells.append((r, c))
-        return empty_cells
-
-    def solve(self, board):
-        # Solves and returns the board, or None
-        empty_cells = self._initialize_masks(board)
-        empty_cells.sort(key=lambda cell: self._count_options(cell[0], cell[1]))
-        
-        if self._backtrack(board, empty_cells, 0):
-            return board
-        return None
+from sudoku_board import BoardState
+from sudoku_cache import get_default_cache
+from sudoku_canvas import BoardCanvas
+from sudoku_conflicts import find_conflicts
+from sudoku_engine import PORTFOLIO, BitmaskSolver, get_base_pattern, shuffle_board
+from sudoku_hints import next_hint
+from sudoku_metrics import timed
+from sudoku_portfolio import portfolio_solve
 
-    def count_solutions(self, board, limit=2):
-        # Returns number of solutions found (stops at 'limit')
-        self._initialize_masks(board) # Re-init masks for this check
-        
-        # We need a simplified backtrack that counts instead of returning
-        # Note: We don't sort empty_cells here to keep it simple/fast for checking
-        empty_cells = [(r, c) for r in range(9) for c in range(9) if board[r][c] == 0]
-        return self._backtrack_count(board, empty_cells, 0, limit)
-
-    def _count_options(self, r, c):
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        options = 0
-        for k in range(9):
-            if not (taken & (1 << k)):
-                options += 1
-        return options
-
-    def _backtrack(self, board, empty_cells, idx):
-        if idx == len(empty_cells):
-            return True
-        r, c = empty_cells[idx]
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        for k in range(9):
-            mask = 1 << k
-            if not (taken & mask):
-                board[r][c] = k + 1
-                self.rows[r] |= mask; self.cols[c] |= mask; self.boxes[box_idx] |= mask
-                
-                if self._backtrack(board, empty_cells, idx + 1):
-                    return True
-                
-                self.rows[r] &= ~mask; self.cols[c] &= ~mask; self.boxes[box_idx] &= ~mask
-                board[r][c] = 0
-        return False
-
-    def _backtrack_count(self, board, empty_cells, idx, limit):
-        if idx == len(empty_cells):
-            return 1
-        
-        r, c = empty_cells[idx]
-        box_idx = self._get_box_index(r, c)
-        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
-        
-        count = 0
-        for k in range(9):
-            mask = 1 << k
-            if not (taken & mask):
-                board[r][c] = k + 1
-                self.rows[r] |= mask; self.cols[c] |= mask; self.boxes[box_idx] |= mask
-                
-                count += self._backtrack_count(board, empty_cells, idx + 1, limit)
-                
-                self.rows[r] &= ~mask; self.cols[c] &= ~mask; self.boxes[box_idx] &= ~mask
-                board[r][c] = 0
-                
-                if count >= limit: # Optimization: Stop if we found enough
-                    return count
-        return count
+PORTFOLIO_POLL_MS = 50      # how often Tk checks on a portfolio race
 
 class SudokuDuel:
     def __init__(self, root):
@@ -216,6 +37,8 @@ class SudokuDuel:
 
         self.pq = []
         self.pq_entries = set()
+        self.conflicts = []
+        self.race = None            # (results queue, cancel event, row, col) of a portfolio race
 
         self.create_widgets()
         self.new_game()
@@ -250,27 +73,15 @@ class SudokuDuel:
         board_frame = tk.Frame(self.root, bg="#d0d0d0", bd=4, relief=tk.SUNKEN)
         board_frame.pack(pady=10)
 
-        for i in range(9):
-            for j in range(9):
-                pady_top = 2 if i % 3 == 0 and i != 0 else 0
-                padx_left = 2 if j % 3 == 0 and j != 0 else 0
-
-                cell = tk.Entry(board_frame, width=3,
-                                font=("Helvetica", 20, "bold"),
-                                justify="center",
-                                bd=1, relief=tk.SOLID,
-                                bg="white",
-                                disabledbackground="white",
-                                disabledforeground="black")
-
-                cell.grid(row=i, column=j,
-                          padx=(padx_left, 0),
-                          pady=(pady_top, 0))
-
-                cell.bind("<KeyRelease>",
-                          lambda e, r=i, c=j: self.on_cell_edit(r, c))
-
-                self.cells[i][j] = cell
+        # One canvas for the whole grid instead of 81 Entry widgets;
+        # board_view.cells keeps the Entry-style API.
+        self.board_view = BoardCanvas(board_frame, font=("Helvetica", 20, "bold"),
+                                      on_edit=self.on_cell_edit)
+        self.board_view.pack()
+        self.cells = self.board_view.cells
+        for row in self.cells:
+            for cell in row:
+                cell.configure(disabledbackground="white", disabledforeground="black")
 
         button_frame = tk.Frame(self.root, bg="#ffffff")
         button_frame.pack(pady=20)
@@ -281,6 +92,12 @@ class SudokuDuel:
                        variable=self.strict_var,
                        bg="#ffffff").pack(pady=5)
 
+        self.portfolio_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.root,
+                       text="Portfolio AI (race all solvers)",
+                       variable=self.portfolio_var,
+                       bg="#ffffff").pack(pady=5)
+
         tk.Button(button_frame, text="New Game",
                   command=self.new_game,
                   font=("Helvetica", 12),
@@ -315,9 +132,9 @@ class SudokuDuel:
 
     def generate_puzzle(self):
         # 1. Start with a full valid board
-        full_board = self.shuffle_board(self.get_base_pattern())
-        self.solution_board = copy.deepcopy(full_board)
-        self.board = copy.deepcopy(full_board)
+        full_board = shuffle_board(get_base_pattern())
+        self.solution_board = [row[:] for row in full_board]
+        self.board = [row[:] for row in full_board]
 
         # 2. Define attempts based on difficulty
         # Higher difficulty = we try to remove more numbers
@@ -342,9 +159,9 @@ class SudokuDuel:
             backup = self.board[r][c]
             self.board[r][c] = 0
             
-            # Check if unique (we pass a copy so we don't mess up masks)
+            # Check if unique (counting leaves the board untouched)
             # We assume the user wants strictly 1 solution
-            solutions = solver.count_solutions(copy.deepcopy(self.board), limit=2)
+            solutions = solver.count_solutions(self.board, limit=2)
             
             if solutions != 1:
                 # If 0 solutions (impossible) or >1 solutions (ambiguous), revert
@@ -354,29 +171,6 @@ class SudokuDuel:
 
         return self.board
 
-    def get_base_pattern(self):
-        def pattern(r, c):
-            return (3 * (r % 3) + r // 3 + c) % 9
-        nums = list(range(1, 10))
-        random.shuffle(nums)
-        return [[nums[pattern(r, c)] for c in range(9)] for r in range(9)]
-
-    def shuffle_board(self, board):
-        for i in range(0, 9, 3):
-            block = board[i:i+3]
-            random.shuffle(block)
-            board[i:i+3] = block
-        board = list(map(list, zip(*board)))
-        for i in range(0, 9, 3):
-            block = board[i:i+3]
-            random.shuffle(block)
-            board[i:i+3] = block
-        board = list(map(list, zip(*board)))
-        return board
-
-
-    
-
     # --------------------------------------------------
     # DP SOLVER (Bitmasking + MRV)
     # --------------------------------------------------
@@ -406,23 +200,33 @@ class SudokuDuel:
             list[list[int]] | None: The fully solved board grid if a solution exists, 
                                     otherwise None.
         """
-        # Instantiate the high-performance Bitmask solver
-        solver = BitmaskSolver()
-        
-        # Create a deep copy to prevent the solver's internal state mutations 
-        # from affecting the live UI board before a solution is confirmed.
-        board_copy = copy.deepcopy(board_snapshot)
-        
-        result = solver.solve(board_copy)
-        return result
+        # Positions solved before (by this or a sibling game) come from disk;
+        # the cache hands the solver a copy, so the live board is never touched.
+        return get_default_cache().solve(board_snapshot, BitmaskSolver().solve)
 
     
     # --------------------------------------------------
     # AI Logic
     # --------------------------------------------------
 
+    def show_conflicts(self):
+        """Highlight the entries that left the board unsolvable; True if there are any."""
+        conflicts = find_conflicts(self.board, self.initial_board, self.solution_board)
+        if not conflicts:
+            return False
+        self.conflicts = conflicts
+        for r, c in conflicts:
+            self.cells[r][c].config(bg="#ffcdd2")
+        self.status_label.config(text="Conflicting entries - User's Turn")
+        cells = ", ".join(f"Row {r + 1}, Col {c + 1}" for r, c in conflicts)
+        messagebox.showinfo("Conflict", f"No solution exists with these entries:\n{cells}\n"
+                                        "Clear or change the highlighted cells to continue.")
+        return True
+
     def ai_turn(self):
-        if self.game_over:
+        if self.game_over or self.race is not None:
+            return
+        if self.show_conflicts():
             return
 
         # 1. Analyze the board incrementally for logical deductions
@@ -463,14 +267,63 @@ class SudokuDuel:
         else:
             # FALLBACK: If there are no obvious 1-option deductions, pick the cell with 
             # the fewest options and use DP to ensure we stay on a valid solve path.
-            solved = self.solve_dp(self.board)
+            if self.portfolio_var.get():
+                self.start_race(r, c)
+                return
+            solved = timed("ai_move", "DP (Bitmask)", self.solve_dp, self.board)
             if not solved:
                 messagebox.showinfo("Game Over", "No solution exists from this state.")
                 return
             best_val = solved[r][c]
 
+        self.play_ai_move(r, c, best_val)
+
+    def start_race(self, r, c):
+        """Race every engine on a worker thread so Tk stays responsive; poll_race plays the result."""
+        snapshot = [row[:] for row in self.board]
+        results = queue.Queue(1)
+        cancel = threading.Event()
+
+        def race(board):
+            return portfolio_solve(board, cancel=cancel)[0]
+
+        def worker():
+            solved = None
+            try:
+                solved = timed("ai_move", PORTFOLIO, get_default_cache().solve, snapshot, race)
+            finally:
+                results.put(solved)
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.race = (results, cancel, r, c)
+        self.status_label.config(text="AI is Thinking (Portfolio)...")
+        self.root.after(PORTFOLIO_POLL_MS, self.poll_race, self.race)
+
+    def poll_race(self, race):
+        if race is not self.race:
+            return      # dropped by New Game or Reset
+        results, _, r, c = race
+        try:
+            solved = results.get_nowait()
+        except queue.Empty:
+            self.root.after(PORTFOLIO_POLL_MS, self.poll_race, race)
+            return
+        self.race = None
+        self.status_label.config(text=f"User's Turn ({self.difficulty})")
+        if not solved:
+            messagebox.showinfo("Game Over", "No solution exists from this state.")
+            return
+        self.play_ai_move(r, c, solved[r][c])
+
+    def cancel_race(self):
+        """Stop a portfolio race in flight; its engines are terminated."""
+        if self.race is not None:
+            self.race[1].set()
+            self.race = None
+
+    def play_ai_move(self, r, c, best_val):
         # 3. Apply the Move
-        self.board[r][c] = best_val
+        self.state.set(r, c, best_val)
         self.cells[r][c].delete(0, tk.END)
         self.cells[r][c].insert(0, str(best_val))
         self.cells[r][c].config(fg="red")
@@ -488,10 +341,19 @@ class SudokuDuel:
             return
 
         cell = self.cells[row][col]
+        if self.race is not None:
+            # The AI is still moving: the board stays as it is until it has
+            cell.delete(0, tk.END)
+            if self.board[row][col]:
+                cell.insert(0, str(self.board[row][col]))
+            return
         v = cell.get().strip()
+        if (row, col) in self.conflicts:
+            self.conflicts.remove((row, col))
+            cell.config(bg="white")
 
         if v == "":
-            self.board[row][col] = 0
+            self.state.set(row, col, 0)
             return
 
         try:
@@ -506,7 +368,7 @@ class SudokuDuel:
                     cell.delete(0, tk.END)
                     return
 
-            self.board[row][col] = num
+            self.state.set(row, col, num)
             cell.config(fg="blue")
 
             if self.is_complete():
@@ -547,9 +409,12 @@ class SudokuDuel:
     # --------------------------------------------------
 
     def new_game(self):
+        self.cancel_race()
         self.game_over = False
         self.board = self.generate_puzzle()
-        self.initial_board = copy.deepcopy(self.board)
+        self.initial_board = [row[:] for row in self.board]
+        self.state = BoardState(self.board)
+        self.start_mark = self.state.mark()
         self.render_board()
         self.status_label.config(
             text=f"User's Turn ({self.difficulty})"
@@ -570,26 +435,31 @@ class SudokuDuel:
                         cell.config(fg="blue")
 
     def show_hint(self):
-        solved = self.solve_dp(self.board)
-        if not solved:
+        # Logic first; the DP solver only runs when no logical step exists
+        hint = next_hint(self.board, solve=lambda b: timed("hint", "DP (Bitmask)", self.solve_dp, b))
+        if not hint:
             return
 
-        for r in range(9):
-            for c in range(9):
-                if self.board[r][c] == 0:
-                    messagebox.showinfo(
-                        "Hint",
-                        f"Row {r+1}, Col {c+1} = {solved[r][c]}"
-                    )
-                    return
+        messagebox.showinfo(
+            "Hint",
+            f"Row {hint.row+1}, Col {hint.col+1} = {hint.value}\n\n{hint.explanation}"
+        )
 
     def reset_board(self):
-        self.board = copy.deepcopy(self.initial_board)
+        self.state.undo_to(self.start_mark)
+        self.cancel_race()
         self.game_over = False
         self.render_board()
+        self.status_label.config(text=f"User's Turn ({self.difficulty})")
 
 
 if __name__ == "__main__":
+    from sudoku_metrics import install_from_env as install_metrics
+    from sudoku_uimonitor import install_from_env
+    install_metrics()
     root = tk.Tk()
-    SudokuDuel(root)
+    monitor = install_from_env(root)
+    game = SudokuDuel(root)
+    if monitor:
+        monitor.watch(game)
     root.mainloop()
\ No newline at end of file
@@ -15,7 +15,11 @@ import tkinter as tk
 from tkinter import messagebox
 import heapq
 import random
-import copy
+
+from sudoku_board import BoardState, PEERS, ROW_OF, COL_OF
+from sudoku_canvas import BoardCanvas
+from sudoku_conflicts import find_conflicts
+from sudoku_hints import next_hint
 
 class SudokuDuel:
     STRICT_MODE = False  # If True, user can only enter correct solution values
@@ -32,6 +36,7 @@ class SudokuDuel:
         self.current_turn = "user"
         self.cells = [[None]*9 for _ in range(9)]
         self.cell_colors = [[None]*9 for _ in range(9)]
+        self.conflicts = []
         
         # Create GUI
         self.create_widgets()
@@ -49,18 +54,15 @@ class SudokuDuel:
         board_frame = tk.Frame(self.root, bg="#d0d0d0", bd=4, relief=tk.SUNKEN)
         board_frame.pack(pady=10)
         
-        for i in range(9):
-            for j in range(9):
-                pady_top = 2 if i % 3 == 0 and i != 0 else 0
-                padx_left = 2 if j % 3 == 0 and j != 0 else 0
-                
-                cell = tk.Entry(board_frame, width=3, font=("Helvetica", 20, "bold"),
-                                justify="center", bd=1, relief=tk.SOLID,
-                                bg="white", disabledbackground="white",
-                                disabledforeground="black")
-                cell.grid(row=i, column=j, padx=(padx_left, 0), pady=(pady_top, 0))
-                cell.bind("<KeyRelease>", lambda e, r=i, c=j: self.on_cell_edit(r, c))
-                self.cells[i][j] = cell
+        # One canvas for the whole grid instead of 81 Entry widgets;
+        # board_view.cells keeps the Entry-style API.
+        self.board_view = BoardCanvas(board_frame, font=("Helvetica", 20, "bold"),
+                                      on_edit=self.on_cell_edit)
+        self.board_view.pack()
+        self.cells = self.board_view.cells
+        for row in self.cells:
+            for cell in row:
+                cell.configure(disabledbackground="white", disabledforeground="black")
         
         button_frame = tk.Frame(self.root, bg="#ffffff")
         
@@ -83,8 +85,8 @@ class SudokuDuel:
 
     def generate_puzzle(self):
         full_board = self.shuffle_board(self.get_base_pattern())
-        self.solution_board = copy.deepcopy(full_board)
-        self.board = copy.deepcopy(full_board)
+        self.solution_board = [row[:] for row in full_board]
+        self.board = [row[:] for row in full_board]
         cells = [(i, j) for i in range(9) for j in range(9)]
         random.shuffle(cells)
         for i in range(random.randint(40, 45)):
@@ -149,15 +151,8 @@ class SudokuDuel:
                         heapq.heappush(self.pq, (len(c), i, j, c))
 
     def update_neighbors(self, row, col):
-        neighbours = set()
-        for i in range(9):
-            neighbours.add((row, i))
-            neighbours.add((i, col))
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for i in range(br, br + 3):
-            for j in range(bc, bc + 3):
-                neighbours.add((i, j))
-        for r, c in neighbours:
+        for p in PEERS[row * 9 + col]:
+            r, c = ROW_OF[p], COL_OF[p]
             if self.board[r][c] == 0:
                 cand = self.get_candidates(self.board, r, c)
                 if cand:
@@ -172,7 +167,7 @@ class SudokuDuel:
             if not candidates:
                 return False
             value = random.choice(list(candidates))
-            self.board[row][col] = value
+            self.state.set(row, col, value)
             self.cells[row][col].config(state="normal")
             self.cells[row][col].delete(0, tk.END)
             self.cells[row][col].insert(0, str(value))
@@ -186,13 +181,16 @@ class SudokuDuel:
             return
         cell = self.cells[row][col]
         v = cell.get().strip()
+        if (row, col) in self.conflicts:
+            self.conflicts.remove((row, col))
+            cell.config(bg="white")
         if v == "":
-            self.board[row][col] = 0
+            self.state.set(row, col, 0)
             return
         try:
             num = int(v)
             if not (1 <= num <= 9): raise ValueError
-            self.board[row][col] = 0
+            self.state.set(row, col, 0)
             # Strict mode: must match solution
             if self.STRICT_MODE and num != self.solution_board[row][col]:
                 messagebox.showerror("Incorrect", "That is not the correct value for this cell.")
@@ -200,7 +198,7 @@ class SudokuDuel:
                 return
 
             if self.is_valid(self.board, row, col, num):
-                self.board[row][col] = num
+                self.state.set(row, col, num)
                 self.update_neighbors(row, col)
                 cell.config(fg="blue")
                 self.current_turn = "ai"
@@ -211,7 +209,24 @@ class SudokuDuel:
         except ValueError:
             cell.delete(0, tk.END)
 
+    def show_conflicts(self):
+        """Highlight the entries that left the board unsolvable; True if there are any."""
+        conflicts = find_conflicts(self.board, self.initial_board, self.solution_board)
+        if not conflicts:
+            return False
+        self.conflicts = conflicts
+        for r, c in conflicts:
+            self.cells[r][c].config(bg="#ffcdd2")
+        self.current_turn = "user"
+        self.status_label.config(text="Conflicting entries - User's Turn")
+        cells = ", ".join(f"Row {r + 1}, Col {c + 1}" for r, c in conflicts)
+        messagebox.showinfo("Conflict", f"No solution exists with these entries:\n{cells}\n"
+                                        "Clear or change the highlighted cells to continue.")
+        return True
+
     def ai_turn(self):
+        if self.show_conflicts():
+            return
         if not self.ai_make_move():
             messagebox.showinfo("Game Over", "AI cannot make a move!")
             return
@@ -226,7 +241,9 @@ class SudokuDuel:
 
     def new_game(self):
         self.board = self.generate_puzzle()
-        self.initial_board = copy.deepcopy(self.board)
+        self.initial_board = [row[:] for row in self.board]
+        self.state = BoardState(self.board)
+        self.start_mark = self.state.mark()
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()
@@ -246,29 +263,36 @@ class SudokuDuel:
                         cell.config(fg="blue")
 
     def show_hint(self):
-        self.initialize_priority_queue()
-        if not self.pq:
-            messagebox.showinfo("Hint", "No empty cells remaining!")
+        hint = next_hint(self.board)
+        if hint is None:
+            if self.is_complete():
+                messagebox.showinfo("Hint", "No empty cells remaining!")
+            else:
+                messagebox.showinfo("Hint", "No solution exists from this state.")
             return
-        _, row, col, _ = self.pq[0]
         for i in range(9):
             for j in range(9):
                 self.cells[i][j].config(bg="white")
-        self.cells[row][col].config(bg="#ffeb3b")
-        cand = sorted(self.get_candidates(self.board, row, col))
-        messagebox.showinfo("Hint", f"Most constrained cell: Row {row+1}, Col {col+1}\nCandidates: {cand}")
+        self.cells[hint.row][hint.col].config(bg="#ffeb3b")
+        messagebox.showinfo("Hint", f"{hint.technique}: Row {hint.row+1}, Col {hint.col+1} = {hint.value}\n\n{hint.explanation}")
 
     def ai_play(self):
         self.ai_make_move()
 
     def reset_board(self):
-        self.board = copy.deepcopy(self.initial_board)
+        self.state.undo_to(self.start_mark)
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()
         self.status_label.config(text="User's Turn")
 
 if __name__ == "__main__":
+    from sudoku_metrics import install_from_env as install_metrics
+    from sudoku_uimonitor import install_from_env
+    install_metrics()
     root = tk.Tk()
-    SudokuDuel(root)
+    monitor = install_from_env(root)
+    game = SudokuDuel(root)
+    if monitor:
+        monitor.watch(game)
     root.mainloop()
@@ -0,0 +1,1110 @@
+"""
+Sudoku Solver Engine
+====================
+Headless solvers, puzzle generators and the benchmark engine shared by the
+GUI variants.  Every engine works on N²×N² boards (9×9, 16×16, 25×25 …);
+the box size is taken from the board itself, so 9×9 callers are unchanged.
+"""
+
+import heapq
+import itertools
+import math
+import multiprocessing
+import random
+import time
+
+from sudoku_board import Board, BoardState, unit_tables
+from sudoku_cache import get_default_cache
+from sudoku_metrics import observe, timed
+from sudoku_rating import DIFFICULTY_LEVELS, LogicState, apply_logic, rate
+
+
+def box_size_of(board):
+    """Return the box edge length (3 for 9×9, 4 for 16×16, …) of *board*."""
+    return math.isqrt(len(board))
+
+
+class BitmaskSolver:
+
+    def __init__(self, size=9):
+        self._configure(size)
+        self.nodes = 0          # placements tried by the last solve / count
+
+    def _configure(self, size):
+        self.size = size
+        self.box = math.isqrt(size)
+        self.full_mask = (1 << size) - 1
+        self.rows = [0] * size
+        self.cols = [0] * size
+        self.boxes = [0] * size
+
+    def _get_box_index(self, r, c):
+        return (r // self.box) * self.box + (c // self.box)
+
+    def _initialize_masks(self, board):
+        """Load the masks from *board* for _count_options; search keeps its own."""
+        self._configure(len(board))
+        n = self.size
+        empty_cells = []
+        for r in range(n):
+            for c in range(n):
+                if board[r][c] != 0:
+                    val = board[r][c] - 1
+                    mask = (1 << val)
+                    self.rows[r] |= mask
+                    self.cols[c] |= mask
+                    self.boxes[self._get_box_index(r, c)] |= mask
+                else:
+                    empty_cells.append((r, c))
+        return empty_cells
+
+    def solve(self, board):
+        count, self.nodes = search(board, limit=1, dynamic=False)
+        return board if count else None
+
+    def count_solutions(self, board, limit=2, workers=1):
+        """
+        Count solutions up to *limit*; workers > 1 splits the search across
+        processes.  limit=None counts every solution exactly.
+        """
+        if limit is None:
+            return count_all_solutions(board)
+        if workers > 1:
+            from sudoku_parallel import parallel_search
+            count, _, self.nodes = parallel_search(board, limit, workers)
+            return count
+        count, self.nodes = search(board, limit=limit)
+        return count
+
+    def _count_options(self, r, c):
+        box_idx = self._get_box_index(r, c)
+        taken = self.rows[r] | self.cols[c] | self.boxes[box_idx]
+        return (~taken & self.full_mask).bit_count()
+
+
+# ---------- Iterative search core ----------
+
+STOP_CHECK_INTERVAL = 1024          # nodes between should_stop() polls
+
+
+def search(board, limit=1, dynamic=True, should_stop=None):
+    """
+    Depth-first bitmask search shared by every solve and count path.
+
+    The search runs on preallocated per-depth arrays instead of the Python
+    call stack: cells[d] is the cell filled at depth d, untried[d] its
+    remaining candidate bits and placed[d] the bit currently in it (the undo
+    trail).  With *dynamic* the most constrained open cell is chosen at each
+    depth; otherwise cells are tried in a fixed order sorted by initial
+    option count.  Any board size works without touching the recursion
+    limit.
+
+    *board* may be a list-of-lists grid, a sudoku_board.Board or a
+    BoardState (whose masks are reused and whose trail records the
+    solution, so it can be undone).  Returns
+    (count, nodes): the number of solutions found, stopping at *limit*, and
+    the number of placements tried.  The board is only written when
+    limit=1 and a solution is found, so counting needs no defensive copy.
+    count is None if should_stop() returned True; it is polled every
+    STOP_CHECK_INTERVAL nodes.
+    """
+    flat = isinstance(board, Board)
+    state = board if isinstance(board, BoardState) else None
+    if flat:
+        n, values = board.n, board.cells
+    else:
+        grid = state.grid if state else board
+        n, values = len(grid), [v for row in grid for v in row]
+    row_of, col_of, box_of = unit_tables(n)[:3]
+    full = (1 << n) - 1
+    if state:
+        rows, cols, boxes = state.rows[:], state.cols[:], state.boxes[:]
+    else:
+        rows, cols, boxes = [0] * n, [0] * n, [0] * n
+    cells = []
+    for i, v in enumerate(values):
+        r, c, bi = row_of[i], col_of[i], box_of[i]
+        if not v:
+            cells.append((r, c, bi))
+        elif not state:
+            m = 1 << (v - 1)
+            rows[r] |= m
+            cols[c] |= m
+            boxes[bi] |= m
+    if not dynamic:
+        cells.sort(key=lambda cell: (~(rows[cell[0]] | cols[cell[1]] | boxes[cell[2]]) & full).bit_count())
+
+    total = len(cells)
+    untried = [0] * total
+    placed = [0] * total
+    count = nodes = 0
+    depth = 0
+    while True:
+        # Descend: open the next cell and place its first candidate.
+        if depth == total:
+            count += 1
+            if count >= limit:
+                if limit == 1:
+                    for (r, c, _), m in zip(cells, placed):
+                        if flat:
+                            board.cells[r * n + c] = m.bit_length()
+                        elif state:
+                            state.set(r, c, m.bit_length())
+                        else:
+                            board[r][c] = m.bit_length()
+                return count, nodes
+        else:
+            if dynamic:
+                best, best_opts = depth, n + 1
+                for j in range(depth, total):
+                    r, c, bi = cells[j]
+                    opts = (~(rows[r] | cols[c] | boxes[bi]) & full).bit_count()
+                    if opts < best_opts:
+                        best, best_opts = j, opts
+                        if opts <= 1:
+                            break
+                cells[depth], cells[best] = cells[best], cells[depth]
+            r, c, bi = cells[depth]
+            avail = ~(rows[r] | cols[c] | boxes[bi]) & full
+            if avail:
+                m = avail & -avail
+                untried[depth] = avail ^ m
+                placed[depth] = m
+                rows[r] |= m
+                cols[c] |= m
+                boxes[bi] |= m
+                nodes += 1
+                if should_stop is not None and not nodes % STOP_CHECK_INTERVAL and should_stop():
+                    return None, nodes
+                depth += 1
+                continue
+
+        # Backtrack: undo along the trail until a depth has candidates left.
+        depth -= 1
+        while depth >= 0:
+            r, c, bi = cells[depth]
+            m = placed[depth]
+            rows[r] ^= m
+            cols[c] ^= m
+            boxes[bi] ^= m
+            avail = untried[depth]
+            if avail:
+                m = avail & -avail
+                untried[depth] = avail ^ m
+                placed[depth] = m
+                rows[r] |= m
+                cols[c] |= m
+                boxes[bi] |= m
+                nodes += 1
+                if should_stop is not None and not nodes % STOP_CHECK_INTERVAL and should_stop():
+                    return None, nodes
+                break
+            depth -= 1
+        else:
+            return count, nodes
+        depth += 1
+
+
+def iter_solutions(board, limit=None):
+    """
+    Yield the solutions of *board* (a grid or Board) one at a time as new
+    list-of-lists grids, stopping after *limit* if given.
+
+    Runs the same explicit-stack MRV search as search(), suspended at each
+    solution, so memory stays O(cells) however many solutions there are.
+    *board* is never modified.
+    """
+    if isinstance(board, Board):
+        n, values = board.n, list(board.cells)
+    else:
+        n, values = len(board), [v for row in board for v in row]
+    row_of, col_of, box_of = unit_tables(n)[:3]
+    full = (1 << n) - 1
+    rows, cols, boxes = [0] * n, [0] * n, [0] * n
+    cells = []
+    for i, v in enumerate(values):
+        r, c, bi = row_of[i], col_of[i], box_of[i]
+        if not v:
+            cells.append((i, r, c, bi))
+        else:
+            m = 1 << (v - 1)
+            rows[r] |= m
+            cols[c] |= m
+            boxes[bi] |= m
+
+    total = len(cells)
+    untried = [0] * total
+    placed = [0] * total
+    found = 0
+    depth = 0
+    while True:
+        if depth == total:
+            solution = values[:]
+            for (i, _, _, _), m in zip(cells, placed):
+                solution[i] = m.bit_length()
+            yield [solution[r * n:(r + 1) * n] for r in range(n)]
+            found += 1
+            if limit is not None and found >= limit:
+                return
+        else:
+            best, best_opts = depth, n + 1
+            for j in range(depth, total):
+                _, r, c, bi = cells[j]
+                opts = (~(rows[r] | cols[c] | boxes[bi]) & full).bit_count()
+                if opts < best_opts:
+                    best, best_opts = j, opts
+                    if opts <= 1:
+                        break
+            cells[depth], cells[best] = cells[best], cells[depth]
+            _, r, c, bi = cells[depth]
+            avail = ~(rows[r] | cols[c] | boxes[bi]) & full
+            if avail:
+                m = avail & -avail
+                untried[depth] = avail ^ m
+                placed[depth] = m
+                rows[r] |= m
+                cols[c] |= m
+                boxes[bi] |= m
+                depth += 1
+                continue
+
+        depth -= 1
+        while depth >= 0:
+            _, r, c, bi = cells[depth]
+            m = placed[depth]
+            rows[r] ^= m
+            cols[c] ^= m
+            boxes[bi] ^= m
+            avail = untried[depth]
+            if avail:
+                m = avail & -avail
+                untried[depth] = avail ^ m
+                placed[depth] = m
+                rows[r] |= m
+                cols[c] |= m
+                boxes[bi] |= m
+                break
+            depth -= 1
+        else:
+            return
+        depth += 1
+
+
+# Residual states remembered by count_all_solutions; the memo is cleared
+# when it fills up, which keeps the recent (most reusable) tail states.
+MAX_COUNT_MEMO = 500_000
+# Open cells at or below which a position is checked for independent parts.
+COMPONENT_CELLS = 20
+
+
+def _peer_bits(n):
+    return [sum(1 << p for p in peers) for peers in unit_tables(n)[6]]
+
+
+def _count_node(open_cells, cand, singles, peer_bits, boxes, memo):
+    """
+    Count the completions of one position, as a generator for the
+    count_all_solutions trampoline: it yields sub-positions
+    (open_cells, cand, singles) and is sent back their counts.
+
+    *open_cells* is a bitset of open cells, cand[i] the candidate mask of
+    cell i (0 once filled) and *singles* cells that were just narrowed to
+    one candidate.  cand belongs to this node and is modified in place.
+    """
+    while True:
+        # Propagate naked singles.
+        while singles:
+            i = singles.pop()
+            if not open_cells >> i & 1:
+                continue
+            m = cand[i]
+            if not m:
+                return 0
+            cand[i] = 0
+            open_cells ^= 1 << i
+            todo = peer_bits[i] & open_cells
+            while todo:
+                low = todo & -todo
+                todo ^= low
+                j = low.bit_length() - 1
+                pm = cand[j]
+                if pm & m:
+                    pm ^= m
+                    if not pm:
+                        return 0
+                    cand[j] = pm
+                    if not pm & (pm - 1):
+                        singles.append(j)
+        if not open_cells:
+            return 1
+
+        # Hidden singles in boxes, and boxes whose open cells cannot all be
+        # filled.  Rows and columns are left to the search: checking them
+        # too cost more than the dead ends it saved.
+        for box in boxes:
+            once = twice = 0
+            k = 0
+            for i in box:
+                m = cand[i]
+                if m:
+                    twice |= once & m
+                    once |= m
+                    k += 1
+            if once.bit_count() < k:
+                return 0
+            hidden = once & ~twice
+            if hidden:
+                for i in box:
+                    m = cand[i] & hidden
+                    if m:
+                        if m & (m - 1):
+                            return 0
+                        if cand[i] != m:
+                            cand[i] = m
+                            singles.append(i)
+        if not singles:
+            break
+
+    # The remaining state is, for each digit, the set of open cells that
+    # still take it.  Renaming digits does not change the count, so those
+    # sets, sorted, are the memo key: positions reached by different
+    # guesses, or equal up to a relabelling of digits, are counted once.
+    sig = [0] * len(boxes)
+    todo = open_cells
+    while todo:
+        low = todo & -todo
+        todo ^= low
+        m = cand[low.bit_length() - 1]
+        while m:
+            bit = m & -m
+            m ^= bit
+            sig[bit.bit_length() - 1] |= low
+    key = tuple(sorted(sig))
+    known = memo.get(key)
+    if known is not None:
+        return known
+
+    # Peers only interact through a digit both still take.  Once few cells
+    # are open, groups with no such link are counted separately and
+    # multiplied.
+    parts = ()
+    if open_cells.bit_count() <= COMPONENT_CELLS:
+        parts = _components(open_cells, cand, sig, peer_bits)
+    if len(parts) > 1:
+        total = 1
+        for part in parts:
+            if not part & (part - 1):
+                total *= cand[part.bit_length() - 1].bit_count()
+            else:
+                sub = [0] * len(cand)
+                todo = part
+                while todo:
+                    low = todo & -todo
+                    todo ^= low
+                    j = low.bit_length() - 1
+                    sub[j] = cand[j]
+                total *= yield part, sub, []
+            if not total:
+                break
+    else:
+        # Branch on the most constrained cell.
+        best, best_count = -1, len(peer_bits)
+        todo = open_cells
+        while todo:
+            low = todo & -todo
+            todo ^= low
+            j = low.bit_length() - 1
+            count = cand[j].bit_count()
+            if count < best_count:
+                best, best_count = j, count
+                if count == 2:
+                    break
+        m = cand[best]
+        total = 0
+        while m:
+            bit = m & -m
+            m ^= bit
+            sub = cand[:]
+            sub[best] = bit
+            total += yield open_cells, sub, [best]
+    if len(memo) >= MAX_COUNT_MEMO:
+        memo.clear()
+    memo[key] = total
+    return total
+
+
+def _components(open_cells, cand, sig, peer_bits):
+    """The groups of *open_cells* linked by peers sharing a candidate, as bitsets."""
+    parts = []
+    rest = open_cells
+    while rest:
+        part = frontier = rest & -rest
+        while frontier:
+            low = frontier & -frontier
+            frontier ^= low
+            i = low.bit_length() - 1
+            shared = 0
+            m = cand[i]
+            while m:
+                bit = m & -m
+                m ^= bit
+                shared |= sig[bit.bit_length() - 1]
+            grow = peer_bits[i] & shared & rest & ~part
+            part |= grow
+            frontier |= grow
+        rest ^= part
+        parts.append(part)
+    return parts
+
+
+def count_all_solutions(board, should_stop=None):
+    """
+    Exact number of solutions of *board* (a grid or Board), however many;
+    None if should_stop() returned True (polled every STOP_CHECK_INTERVAL
+    nodes).
+
+    Naked singles, and hidden singles in boxes, are propagated at every
+    node.  Every subtree count is cached under the remaining open cells and
+    their candidates, with digits normalised away, so positions reached by
+    different guesses are counted once; and once few cells are open, groups
+    of cells that cannot affect each other are counted independently and
+    multiplied.  Nodes are generators driven from an explicit stack, so
+    depth is not limited by the recursion limit.
+    """
+    if not isinstance(board, Board):
+        board = Board.from_grid(board)
+    n = board.n
+    peer_bits = _peer_bits(n)
+    boxes = unit_tables(n)[5]
+    cand = [board.candidates(i) for i in range(n * n)]
+    empties = board.empties()
+    open_cells = sum(1 << i for i in empties)
+    singles = [i for i in empties if cand[i].bit_count() <= 1]
+    memo = {}
+
+    stack = [_count_node(open_cells, cand, singles, peer_bits, boxes, memo)]
+    result = None
+    nodes = 0
+    while stack:
+        try:
+            child = stack[-1].send(result)
+        except StopIteration as done:
+            stack.pop()
+            result = done.value
+            continue
+        nodes += 1
+        if should_stop is not None and not nodes % STOP_CHECK_INTERVAL and should_stop():
+            return None
+        stack.append(_count_node(*child, peer_bits, boxes, memo))
+        result = None
+    return result
+
+
+def _standalone_is_valid(board, row, col, num):
+    n = len(board)
+    box = math.isqrt(n)
+    for i in range(n):
+        if board[row][i] == num and i != col:
+            return False
+        if board[i][col] == num and i != row:
+            return False
+    br, bc = box * (row // box), box * (col // box)
+    for i in range(br, br + box):
+        for j in range(bc, bc + box):
+            if board[i][j] == num and (i, j) != (row, col):
+                return False
+    return True
+
+
+def _standalone_get_candidates(board, row, col):
+    if board[row][col] != 0:
+        return set()
+    n = len(board)
+    box = math.isqrt(n)
+    candidates = set(range(1, n + 1))
+    candidates -= set(board[row])
+    candidates -= {board[i][col] for i in range(n)}
+    br, bc = box * (row // box), box * (col // box)
+    for i in range(br, br + box):
+        for j in range(bc, bc + box):
+            candidates.discard(board[i][j])
+    return candidates
+
+
+def solve_greedy_standalone(board):
+    board = [row[:] for row in board]
+    n = len(board)
+    while True:
+        pq = []
+        for r in range(n):
+            for c in range(n):
+                if board[r][c] == 0:
+                    cands = _standalone_get_candidates(board, r, c)
+                    if not cands:
+                        return None
+                    heapq.heappush(pq, (len(cands), r, c, cands))
+        if not pq:
+            return board
+        _, r, c, cands = heapq.heappop(pq)
+        cands = _standalone_get_candidates(board, r, c)
+        if not cands:
+            return None
+        board[r][c] = min(cands)
+    return board
+
+
+def solve_dnc_standalone(board):
+    board = [row[:] for row in board]
+    return _dnc_helper(board)
+
+
+def _dnc_pivot(board):
+    """Return (row, col, candidates) of the most constrained empty cell, or None if full."""
+    n = len(board)
+    best = None
+    min_count = n + 1
+    for r in range(n):
+        for c in range(n):
+            if board[r][c] == 0:
+                cands = _standalone_get_candidates(board, r, c)
+                cnt = len(cands)
+                if cnt == 0:
+                    return r, c, cands
+                if cnt < min_count:
+                    min_count = cnt
+                    best = (r, c, cands)
+                    if cnt == 1:
+                        return best
+    return best
+
+
+def _dnc_helper(board):
+    # One (row, col, untried candidates) frame per pivot instead of one
+    # Python call per pivot.
+    stack = []
+    while True:
+        pivot = _dnc_pivot(board)
+        if pivot is None:
+            return board
+        stack.append((pivot[0], pivot[1], iter(pivot[2])))
+        while stack:
+            row, col, untried = stack[-1]
+            val = next(untried, None)
+            if val is not None:
+                board[row][col] = val
+                break
+            board[row][col] = 0
+            stack.pop()
+        else:
+            return None
+
+
+def solve_dp_standalone(board):
+    # Bitmask state with a fixed cell order sorted by initial option count.
+    board = Board.from_grid(board)
+    count, _ = search(board, dynamic=False)
+    return board.to_grid() if count else None
+
+
+def solve_backtracking_standalone(board):
+    """
+    Solves a Sudoku puzzle using an optimized backtracking algorithm.
+
+    This version is highly optimized with:
+    1.  Bitmasking: For O(1) constraint checks.
+    2.  Dynamic MRV (Minimum Remaining Values): At each step, it finds the
+        cell with the fewest possible candidates to explore next. This
+        dramatically prunes the search tree compared to a static ordering
+        and efficiently handles "naked singles".
+    """
+    board = Board.from_grid(board)
+    count, _ = search(board)
+    return board.to_grid() if count else None
+
+
+def solve_hybrid_standalone(board):
+    board = [row[:] for row in board]
+    n = len(board)
+    box = math.isqrt(n)
+    for br in range(0, n, box):
+        for bc in range(0, n, box):
+            for r in range(br, br + box):
+                for c in range(bc, bc + box):
+                    if board[r][c] == 0:
+                        cands = _standalone_get_candidates(board, r, c)
+                        if len(cands) == 1:
+                            board[r][c] = cands.pop()
+    return solve_dp_standalone(board)
+
+
+BENCHMARK_SOLVERS = {
+    "Greedy":           solve_greedy_standalone,
+    "Divide & Conquer": solve_dnc_standalone,
+    "DP (Bitmask)":     solve_dp_standalone,
+    "Backtracking":     solve_backtracking_standalone,
+    "Hybrid (D&C+DP)":  solve_hybrid_standalone,
+}
+
+# ---------- Shared helper functions ----------
+
+def get_base_pattern(box=3):
+    """Create a valid completed Sudoku board using a mathematical pattern."""
+    n = box * box
+    def pattern(r, c):
+        return (box * (r % box) + r // box + c) % n
+    nums = list(range(1, n + 1))
+    random.shuffle(nums)
+    return [[nums[pattern(r, c)] for c in range(n)] for r in range(n)]
+
+
+def shuffle_board(board):
+    """Randomise a valid board by shuffling rows/columns within bands."""
+    n = len(board)
+    box = math.isqrt(n)
+    for i in range(0, n, box):
+        block = board[i:i + box]
+        random.shuffle(block)
+        board[i:i + box] = block
+    board = list(map(list, zip(*board)))
+    for i in range(0, n, box):
+        block = board[i:i + box]
+        random.shuffle(block)
+        board[i:i + box] = block
+    board = list(map(list, zip(*board)))
+    return board
+
+
+# Fraction of cells removed per difficulty (30 / 45 / 55 holes on a 9×9 board)
+DIFFICULTY_HOLES = {"Easy": 30, "Medium": 45, "Hard": 55}
+
+
+def _holes_for(difficulty, box):
+    n = box * box
+    return round(DIFFICULTY_HOLES.get(difficulty, 55) * n * n / 81)
+
+
+# Rated digging: the last GUIDED_HOLES removals (and any needed beyond the
+# hole target) each rate DIG_SAMPLES removable cells and keep the hardest.
+# A dig that ends out of range is redone on the same grid at most
+# DIG_ATTEMPTS times, then on a fresh grid, GENERATE_ATTEMPTS grids in all.
+GUIDED_HOLES = 20
+DIG_SAMPLES = 6
+DIG_ATTEMPTS = 3
+GENERATE_ATTEMPTS = 20
+
+# Larger boards are dug with uniqueness probes of at most DIG_PROBE_NODES
+# search nodes; a probe that runs out keeps its clue.  Past the sparsity of
+# a 25×25 Easy puzzle nearly every probe runs out, so harder 25×25 targets
+# are refused rather than dug for minutes to the same board.
+DIG_PROBE_NODES = 2048
+GENERATE_DIFFICULTIES = {       # box: difficulties generate_puzzle accepts
+    3: tuple(DIFFICULTY_HOLES),
+    4: tuple(DIFFICULTY_HOLES),
+    5: ("Easy",),
+}
+
+
+def generate_puzzle(difficulty="Medium", box=3, should_stop=None):
+    """
+    Generate (puzzle, solution) with a unique solution.
+
+    9×9 puzzles are dug from a solved grid towards *difficulty* as rated by
+    sudoku_rating: after a random start, each removal picks the hardest of a
+    few sampled cells whose rating stays within the target range, until the
+    puzzle has DIFFICULTY_HOLES[difficulty] holes and is rated in range (or
+    no cell can be removed).  The puzzle returned is always rated in range;
+    RuntimeError if no grid yields one.  Larger boards are dug towards a
+    hole count only, as far as DIG_PROBE_NODES allows.  ValueError for a
+    box size or difficulty not in GENERATE_DIFFICULTIES; None if
+    should_stop() returned True (polled before each removal).
+    """
+    if difficulty not in GENERATE_DIFFICULTIES.get(box, ()):
+        raise ValueError(f"cannot generate {difficulty!r} puzzles with box size {box}")
+    start = time.perf_counter()
+    if box != 3:
+        solution = shuffle_board(get_base_pattern(box))
+        board = _dig(solution, _holes_for(difficulty, box), probe_nodes=DIG_PROBE_NODES,
+                     should_stop=should_stop)
+        if board is None:
+            return None
+        observe("generate", f"{difficulty} {box * box}x{box * box}", "ok",
+                time.perf_counter() - start)
+        return board, solution
+
+    min_level, max_level = DIFFICULTY_LEVELS.get(difficulty, DIFFICULTY_LEVELS["Medium"])
+    for _ in range(GENERATE_ATTEMPTS):
+        solution = shuffle_board(get_base_pattern(box))
+        for _ in range(DIG_ATTEMPTS):
+            dug = _dig(solution, _holes_for(difficulty, box), min_level, max_level,
+                       should_stop=should_stop)
+            if dug is None:
+                return None
+            board, level = dug
+            if min_level <= level <= max_level:
+                observe("generate", difficulty, "ok", time.perf_counter() - start)
+                return board, solution
+    observe("generate", difficulty, "error", time.perf_counter() - start)
+    raise RuntimeError(f"could not generate a {difficulty} puzzle")
+
+
+def _still_unique(state, r, c, probe_nodes=None):
+    """
+    True if *state*, unique before (r, c) was emptied, is provably still
+    unique.  A cell only its old digit fits needs no search; otherwise the
+    search may use *probe_nodes* nodes (None: no limit), and running out
+    counts as not unique.
+    """
+    m = state.candidates(r, c)
+    if not m & (m - 1):
+        return True
+    should_stop = None
+    if probe_nodes is not None:
+        polls = itertools.count(1)
+        should_stop = lambda: next(polls) * STOP_CHECK_INTERVAL >= probe_nodes
+    return search(state, limit=2, should_stop=should_stop)[0] == 1
+
+
+def _dig(solution, target_holes, min_level=None, max_level=None, probe_nodes=None,
+         should_stop=None):
+    """
+    Remove clues from *solution* while keeping the solution unique.  Without
+    a level range, returns the board once target_holes cells are empty (or
+    no more can be removed); with one, returns (board, rated level) as
+    described in generate_puzzle.  *probe_nodes* bounds each uniqueness
+    check; None if should_stop() returned True.
+    """
+    state = BoardState([row[:] for row in solution])
+    board = state.grid
+    n = state.n
+    rated = min_level is not None
+    random_holes = target_holes - GUIDED_HOLES if rated else target_holes
+
+    cells = [(r, c) for r in range(n) for c in range(n)]
+    random.shuffle(cells)
+
+    holes = 0
+
+    while cells and holes < random_holes:
+        if should_stop is not None and should_stop():
+            return None
+        r, c = cells.pop()
+        mark = state.mark()
+        state.set(r, c, 0)
+        if _still_unique(state, r, c, probe_nodes):
+            holes += 1
+        else:
+            state.undo_to(mark)
+
+    if not rated:
+        return board
+
+    level = rate(board).level
+    while cells and (holes < target_holes or level < min_level):
+        if should_stop is not None and should_stop():
+            return None
+        best = None
+        tried = 0
+        for r, c in reversed(cells[:]):
+            if tried == DIG_SAMPLES:
+                break
+            mark = state.mark()
+            state.set(r, c, 0)
+            if not _still_unique(state, r, c):
+                state.undo_to(mark)
+                cells.remove((r, c))      # a needed clue stays needed as holes grow
+                continue
+            tried += 1
+            rating = rate(board)
+            state.undo_to(mark)
+            if rating.level > max_level:
+                cells.remove((r, c))
+            elif best is None or rating.key > best[0].key:
+                best = (rating, r, c)
+        if best is None:
+            if tried == 0:
+                break
+            continue
+        rating, r, c = best
+        state.set(r, c, 0)
+        cells.remove((r, c))
+        holes += 1
+        level = rating.level
+
+    return board, level
+
+
+def generate_benchmark_puzzle(holes=45, box=3):
+    """Generate a puzzle with a given number of holes for benchmarking."""
+    board = shuffle_board(get_base_pattern(box))
+    n = box * box
+    cells = [(r, c) for r in range(n) for c in range(n)]
+    random.shuffle(cells)
+    for i in range(min(holes, len(cells))):
+        r, c = cells[i]
+        board[r][c] = 0
+    return board
+
+
+def get_candidates(board, row, col):
+    """Return the set of valid digits for the given cell."""
+    return _standalone_get_candidates(board, row, col)
+
+
+def is_valid(board, row, col, num):
+    """Check whether placing ⁠ num ⁠ at (row, col) violates Sudoku rules."""
+    return _standalone_is_valid(board, row, col, num)
+
+
+def solve_with_backtracking(board_snapshot, entry="solve"):
+    """Solve *board_snapshot* (left untouched) with the Backtracking engine, consulting the solution cache first."""
+    return solve_cached(board_snapshot, "Backtracking", entry=entry)
+
+
+PORTFOLIO = "Portfolio"     # solver name that races every engine (sudoku_portfolio)
+
+
+def _solver_named(solver_name):
+    if solver_name == PORTFOLIO:
+        from sudoku_portfolio import solve_portfolio
+        return solve_portfolio
+    return BENCHMARK_SOLVERS[solver_name]
+
+
+def solve_cached(board, solver_name="Backtracking", cache=None, entry="solve"):
+    """
+    Return a solution for *board*, looking it up in the persistent solution
+    cache before running BENCHMARK_SOLVERS[solver_name] (or racing all of
+    them when solver_name is PORTFOLIO).  Fresh solutions are written back
+    so sibling processes can reuse them.  The call is recorded in
+    sudoku_metrics under *entry*.
+    """
+    if cache is None:
+        cache = get_default_cache()
+    start = time.perf_counter()
+    solution = cache.get(board)
+    if solution is not None:
+        observe(entry, solver_name, "cache_hit", time.perf_counter() - start)
+        return solution
+    solution = timed(entry, solver_name, _solver_named(solver_name), board)
+    if solution is not None:
+        cache.put(board, solution)
+    return solution
+
+
+def solve_batch(puzzles, solver_name="Backtracking", cache=None):
+    """Solve a list of puzzles through the cache; unsolvable entries are None."""
+    if cache is None:
+        cache = get_default_cache()
+    return [solve_cached(puzzle, solver_name, cache, "batch_solve") for puzzle in puzzles]
+
+
+# ---------- Anytime AI move ----------
+
+AI_MOVE_BUDGET_MS = 250             # per-move latency budget of the duel AIs
+AI_MOVE_SOURCES = {                 # anytime_move() source: where the value came from
+    "forced": "logic propagation",
+    "cache_hit": "the solution cache",
+    "solved": "a budgeted search",
+    "fallback": "the stored solution",
+}
+
+
+def _agrees(board, reference):
+    """True if every filled cell of *board* matches *reference*."""
+    return all(v == ref for row, ref_row in zip(board, reference)
+               for v, ref in zip(row, ref_row) if v)
+
+
+def anytime_move(board, target=None, budget_ms=AI_MOVE_BUDGET_MS, reference=None,
+                 solver_name="Backtracking", entry="ai_move"):
+    """
+    Pick the AI's next move on *board* within *budget_ms*, cheapest source
+    first.  Returns (row, col, value, source):
+
+        forced      a cell fixed by logic propagation (sudoku_rating); the
+                    *target* cell if logic fixes it, else the first one found
+        cache_hit   the target's value from the solution cache
+        solved      the target's value from a search bounded by what is left
+                    of the budget (the solution is cached for the next move)
+        fallback    the budget ran out: the target's value in *reference*
+                    (the generator's solution), used only while every filled
+                    cell still agrees with it
+
+    value is None when there is no safe move: source "unsolvable" when logic
+    or the search proves the board has no solution, "timeout" when the
+    budget ran out with nothing to fall back on.  *target* defaults to the
+    open cell with the fewest candidates.  The outcome is recorded in
+    sudoku_metrics under *entry* / *solver_name*.
+    """
+    start = time.perf_counter()
+    deadline = start + budget_ms / 1000
+
+    def result(r, c, value, source):
+        observe(entry, solver_name, "unsolved" if source == "unsolvable" else source,
+                time.perf_counter() - start)
+        return r, c, value, source
+
+    logic = LogicState(board)
+    n = logic.n
+    if not logic.broken:
+        apply_logic(logic)
+    if logic.broken:
+        return result(None, None, None, "unsolvable")
+
+    if target is None:
+        open_cells = [(logic.cand[r * n + c].bit_count(), r, c)
+                      for r in range(n) for c in range(n) if not board[r][c]]
+        if not open_cells:
+            return result(None, None, None, "unsolvable")
+        _, r, c = min(open_cells)
+        target = (r, c)
+    row, col = target
+
+    forced = [(r, c) for r in range(n) for c in range(n)
+              if not board[r][c] and logic.values[r * n + c]]
+    if forced:
+        r, c = target if target in forced else forced[0]
+        return result(r, c, logic.values[r * n + c], "forced")
+
+    cache = get_default_cache()
+    solution = cache.get(board)
+    if solution is not None:
+        return result(row, col, solution[row][col], "cache_hit")
+
+    reduced = logic.board()
+    count, _ = search(reduced, should_stop=lambda: time.perf_counter() > deadline)
+    if count:
+        cache.put(board, reduced)
+        return result(row, col, reduced[row][col], "solved")
+    if count == 0:
+        return result(row, col, None, "unsolvable")
+
+    if reference is not None and _agrees(board, reference):
+        return result(row, col, reference[row][col], "fallback")
+    return result(row, col, None, "timeout")
+
+
+# ---------- Benchmarking engine ----------
+
+def _bench_stats(times, successes, cpu_times=None):
+    stats = {
+        "avg": sum(times) / len(times),
+        "min": min(times),
+        "max": max(times),
+        "times": list(times),
+        "success_rate": (successes / len(times)) * 100
+    }
+    if cpu_times:
+        stats["cpu_avg"] = sum(cpu_times) / len(cpu_times)
+    return stats
+
+
+def benchmark_all_solvers(num_trials=5, on_result=None, cancel=None, precise=False):
+    """
+    Benchmark all solvers across Easy / Medium / Hard difficulties with
+    success tracking, on the first *num_trials* puzzles of each tier of the
+    frozen benchmark corpus.
+
+    on_result(difficulty, solver_name, stats) is called after every single
+    solve with the running stats of that pair, so a UI can draw results as
+    they arrive.  Setting the *cancel* event (any object with is_set())
+    stops the run before the next solve; the partial results are returned.
+
+    With *precise* every time comes from sudoku_timing.precise_time (median
+    of repeated runs, collector off, harness cost subtracted) and the stats
+    gain "cpu_avg"; results are then not fed to the cache.
+    """
+    from sudoku_corpus import corpus_puzzles
+    from sudoku_timing import precise_time
+    # Timings always measure the solver itself; the cache is only fed.
+    cache = get_default_cache()
+    results = {}
+    for diff_name in DIFFICULTY_HOLES:
+        puzzles = corpus_puzzles(diff_name, num_trials)
+        results[diff_name] = {}
+        for solver_name in BENCHMARK_SOLVERS:
+            times = []
+            cpu_times = []
+            successes = 0
+            for puzzle in puzzles:
+                if cancel is not None and cancel.is_set():
+                    return results
+                if precise:
+                    timing = precise_time(BENCHMARK_SOLVERS[solver_name], puzzle)
+                    times.append(timing["wall_ms"])
+                    cpu_times.append(timing["cpu_ms"])
+                    successes += timing["solved"]
+                else:
+                    # Every solver works on its own copy of the puzzle.
+                    start = time.perf_counter()
+                    result = BENCHMARK_SOLVERS[solver_name](puzzle)
+                    end = time.perf_counter()
+
+                    times.append((end - start) * 1000)
+
+                    if result is not None:
+                        successes += 1
+                        cache.put(puzzle, result)
+
+                results[diff_name][solver_name] = _bench_stats(times, successes, cpu_times)
+                if on_result:
+                    on_result(diff_name, solver_name, results[diff_name][solver_name])
+    return results
+
+
+# Large-board corpus tiers.  Scaling problems only show up once the board
+# outgrows 9×9; at these densities the static-order solvers already blow up
+# while the dynamic-MRV ones stay in milliseconds.
+LARGE_BOARD_TIERS = ("16×16", "25×25")
+LARGE_BOARD_TIMEOUT = 5.0           # seconds per solve
+
+
+def _timed_solve_child(solver_fn, board, conn):
+    start = time.perf_counter()
+    result = solver_fn(board)
+    conn.send(((time.perf_counter() - start) * 1000, result is not None))
+    conn.close()
+
+
+def _time_solver_in_process(solver_fn, board, timeout):
+    """Return (ms, solved) measured in a child process, or (None, False) on timeout."""
+    recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=_timed_solve_child,
+                                   args=(solver_fn, board, send_conn), daemon=True)
+    proc.start()
+    send_conn.close()
+    outcome = (None, False)
+    if recv_conn.poll(timeout):
+        try:
+            outcome = recv_conn.recv()
+        except EOFError:
+            pass
+    if proc.is_alive():
+        proc.terminate()
+    proc.join()
+    return outcome
+
+
+def benchmark_large_boards(num_trials=3, timeout=LARGE_BOARD_TIMEOUT):
+    """
+    Benchmark every solver on the LARGE_BOARD_TIERS.
+
+    Each solve runs in its own process so a solver that explodes can be
+    killed after *timeout* seconds; it is then counted as a failure and
+    charged the full timeout.  The result shape matches benchmark_all_solvers.
+    """
+    from sudoku_corpus import corpus_puzzles
+    results = {}
+    for tier_name in LARGE_BOARD_TIERS:
+        results[tier_name] = {}
+        puzzles = corpus_puzzles(tier_name, num_trials)
+        for solver_name, solver_fn in BENCHMARK_SOLVERS.items():
+            times = []
+            successes = 0
+            for puzzle in puzzles:
+                ms, solved = _time_solver_in_process(solver_fn, puzzle, timeout)
+                times.append(ms if ms is not None else timeout * 1000)
+                if solved:
+                    successes += 1
+            results[tier_name][solver_name] = _bench_stats(times, successes)
+    return results
@@ -0,0 +1,245 @@
+"""
+Logic Hints
+===========
+Finds the next cell a person could fill by reasoning alone and says why,
+without solving the puzzle.  It works on sudoku_rating's LogicState, whose
+candidate bitmasks are updated incrementally as digits are placed or ruled
+out, and tries the techniques one instance at a time, easiest first (the
+same order sudoku_rating rates by):
+
+    Hidden Single, Naked Single          place a digit: the hint
+    Locked Candidates, Naked Pair,       only rule candidates out; the
+    Hidden Pair                          search for a single then restarts
+
+Each elimination taken on the way is kept as a step of the explanation.
+Only when no technique applies is the puzzle solved (by the caller's
+solver) to reveal the most constrained cell.
+
+    hint = next_hint(board)
+    hint.row, hint.col, hint.value, hint.technique, hint.explanation
+"""
+
+import time
+
+from sudoku_board import unit_tables
+from sudoku_engine import solve_cached
+from sudoku_metrics import observe
+from sudoku_rating import TECHNIQUES, LogicState
+
+
+def _cell(n, i):
+    return f"R{i // n + 1}C{i % n + 1}"
+
+
+def _digits(mask):
+    out = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        out.append(str(bit.bit_length()))
+    return " and ".join(out) if len(out) <= 2 else ", ".join(out[:-1]) + " and " + out[-1]
+
+
+def _unit_name(n, u):
+    kind = ("row", "column", "box")[u // n]
+    return f"{kind} {u % n + 1}"
+
+
+def _line_name(n, cells):
+    row_of, col_of = unit_tables(n)[:2]
+    if len({row_of[i] for i in cells}) == 1:
+        return f"row {row_of[cells[0]] + 1}"
+    return f"column {col_of[cells[0]] + 1}"
+
+
+# ---------- Placing techniques: (cell, value, technique, reason) or None ----------
+
+def _hidden_single(state):
+    n, cand = state.n, state.cand
+    units = state.units
+    for u in list(range(2 * n, 3 * n)) + list(range(2 * n)):     # boxes read easiest
+        once = twice = 0
+        for i in units[u]:
+            m = cand[i]
+            twice |= once & m
+            once |= m
+        singles = once & ~twice
+        if singles:
+            bit = singles & -singles
+            for i in units[u]:
+                if cand[i] & bit:
+                    d = bit.bit_length()
+                    return i, d, "Hidden Single", (
+                        f"{_cell(n, i)} is the only cell in {_unit_name(n, u)} "
+                        f"where {d} can go.")
+    return None
+
+
+def _naked_single(state):
+    n = state.n
+    for i, m in enumerate(state.cand):
+        if m and not m & (m - 1):
+            return i, m.bit_length(), "Naked Single", (
+                f"{_cell(n, i)} can only be {m.bit_length()}: its row, column and box "
+                f"already hold every other digit.")
+    return None
+
+
+# ---------- Eliminating techniques: apply one instance, return its step ----------
+
+def _locked_candidates(state):
+    n, cand = state.n, state.cand
+    box_of = unit_tables(n)[2]
+    for segment, line_rest, box_rest in state.intersections:
+        seg_m = line_m = box_m = 0
+        for i in segment:
+            seg_m |= cand[i]
+        if not seg_m:
+            continue
+        for i in line_rest:
+            line_m |= cand[i]
+        for i in box_rest:
+            box_m |= cand[i]
+        line = _line_name(n, segment)
+        box = f"box {box_of[segment[0]] + 1}"
+        pointing = seg_m & ~box_m & line_m
+        if pointing:
+            state.eliminate(line_rest, pointing)
+            return "Locked Candidates", (
+                f"In {box}, {_digits(pointing)} can only go in {line}, "
+                f"so the rest of {line} cannot hold {_digits(pointing)}.")
+        claiming = seg_m & ~line_m & box_m
+        if claiming:
+            state.eliminate(box_rest, claiming)
+            return "Locked Candidates", (
+                f"In {line}, {_digits(claiming)} can only go in {box}, "
+                f"so the rest of {box} cannot hold {_digits(claiming)}.")
+    return None
+
+
+def _naked_pair(state):
+    n, cand = state.n, state.cand
+    for u, unit in enumerate(state.units):
+        seen = {}
+        for i in unit:
+            m = cand[i]
+            if m and m.bit_count() == 2:
+                j = seen.get(m)
+                if j is None:
+                    seen[m] = i
+                    continue
+                others = [k for k in unit if k != i and k != j and cand[k] & m]
+                if others:
+                    state.eliminate(others, m)
+                    return "Naked Pair", (
+                        f"{_cell(n, j)} and {_cell(n, i)} can only hold {_digits(m)}, "
+                        f"so no other cell of {_unit_name(n, u)} can.")
+    return None
+
+
+def _hidden_pair(state):
+    n, cand = state.n, state.cand
+    for u, unit in enumerate(state.units):
+        positions = [0] * n
+        for k, i in enumerate(unit):
+            m = cand[i]
+            while m:
+                bit = m & -m
+                m ^= bit
+                positions[bit.bit_length() - 1] |= 1 << k
+        seen = {}
+        for d, pos in enumerate(positions):
+            if pos.bit_count() != 2:
+                continue
+            other = seen.get(pos)
+            if other is None:
+                seen[pos] = d
+                continue
+            pair = (1 << d) | (1 << other)
+            cells = [unit[k] for k in range(len(unit)) if pos >> k & 1]
+            if any(cand[i] & ~pair for i in cells):
+                state.eliminate(cells, ~pair & state.full)
+                return "Hidden Pair", (
+                    f"In {_unit_name(n, u)}, {_digits(pair)} only fit in "
+                    f"{_cell(n, cells[0])} and {_cell(n, cells[1])}, so those cells "
+                    f"hold nothing else.")
+    return None
+
+
+PLACING = [_hidden_single, _naked_single]
+ELIMINATING = [_locked_candidates, _naked_pair, _hidden_pair]
+
+
+class Hint:
+    """A cell to fill, its value and the reasoning behind it."""
+
+    def __init__(self, row, col, value, technique, reason, steps=()):
+        self.row = row
+        self.col = col
+        self.value = value
+        self.technique = technique      # hardest technique used, or "Search"
+        self.reason = reason
+        self.steps = list(steps)        # eliminations needed first, in order
+
+    @property
+    def level(self):
+        return TECHNIQUES.index(self.technique) + 1
+
+    @property
+    def explanation(self):
+        return "\n".join(self.steps + [self.reason])
+
+    def as_dict(self):
+        return {"row": self.row, "col": self.col, "value": self.value,
+                "technique": self.technique, "explanation": self.explanation}
+
+    def __repr__(self):
+        return f"Hint(R{self.row + 1}C{self.col + 1}={self.value}, {self.technique})"
+
+
+def next_hint(board, solve=None):
+    """
+    The next logical step on *board* as a Hint, or None if the board is full
+    or has no solution.  When logic stalls, solve(board) (default: the
+    cached Backtracking engine) supplies the value of the most constrained
+    cell, with technique "Search".
+    """
+    start = time.perf_counter()
+    state = LogicState(board)
+    n = state.n
+    if state.broken or not state.unsolved:
+        return None
+    steps = []
+    hardest = 0
+    while not state.broken:
+        for technique in PLACING:
+            found = technique(state)
+            if found:
+                i, value, name, reason = found
+                level = max(hardest, TECHNIQUES.index(name) + 1)
+                observe("hint", "Logic", "forced", time.perf_counter() - start)
+                return Hint(i // n, i % n, value, TECHNIQUES[level - 1], reason,
+                            [text for _, text in steps])
+        for technique in ELIMINATING:
+            step = technique(state)
+            if step:
+                steps.append(step)
+                hardest = max(hardest, TECHNIQUES.index(step[0]) + 1)
+                break
+        else:
+            break
+    if state.broken:
+        return None
+
+    if solve is None:
+        solution = solve_cached(board, entry="hint")
+    else:
+        solution = solve(board)
+    if solution is None:
+        return None
+    open_cells = [i for i, m in enumerate(state.cand) if m]
+    i = min(open_cells, key=lambda i: state.cand[i].bit_count())
+    row, col = divmod(i, n)
+    return Hint(row, col, solution[row][col], "Search",
+                f"No logical step applies here; the solution has {solution[row][col]} "
+                f"in {_cell(n, i)}, the cell with the fewest candidates.")
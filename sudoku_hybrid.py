@@ -2,8 +2,16 @@ import tkinter as tk
 from tkinter import messagebox
 import heapq
 import random
-import copy
 import threading
+
+from sudoku_board import BoardState, PEERS, ROW_OF, COL_OF
+from sudoku_cache import get_default_cache
+from sudoku_canvas import BoardCanvas
+from sudoku_engine import AI_MOVE_BUDGET_MS, anytime_move, get_base_pattern, shuffle_board
+from sudoku_conflicts import find_conflicts
+from sudoku_hints import next_hint
+from sudoku_metrics import timed
+from sudoku_speculation import Speculator
 """
 Strategy & Architecture
 This implementation constitutes a Hybrid AI Solver designed to solve Sudoku puzzles efficiently by synthesizing two distinct algorithmic strategies: Constraint Propagation (Divide & Conquer) and Backtracking with Bitmasks (Dynamic Programming).
@@ -22,7 +30,7 @@ Memoization: The solve_dp function caches previously encountered board configura
 
 3. The "Duel" Logic
 The application facilitates a turn-based interaction between the user and the AI.
-AI Turn: The AI identifies the cell with the highest priority (via the MRV Priority Queue), computes the solution for the entire board to ascertain the correct value for that specific cell, populates it, and subsequently yields control back to the user.
+AI Turn: The AI identifies the cell with the highest priority (via the MRV Priority Queue) and asks sudoku_engine.anytime_move for its value within a per-move time budget: a move forced by constraint propagation is played at once, otherwise the board is searched for as long as the budget allows, falling back to the stored solution when it runs out. It populates the cell and yields control back to the user.
 
 Function Reference
 Initialization & UI
@@ -32,7 +40,7 @@ render_board: Updates the user interface to reflect the current state of self.bo
 
 Game Logic & Generation
 generate_puzzle: constructs a fully solved board, randomizes it, and selectively removes numbers in accordance with the specified difficulty level.
-shuffle_board & get_base_pattern: Auxiliary functions for generating a randomized, valid Sudoku grid.
+shuffle_board & get_base_pattern (sudoku_engine): Auxiliary functions for generating a randomized, valid Sudoku grid.
 is_valid & get_candidates: Implements standard rule validation to determine if a number is permissible within a given cell.
 
 The Solver (The "Brain")
@@ -44,7 +52,7 @@ _find_mrv_cell_bitmask: Scans the board to identify the empty cell with the mini
 
 AI Interaction
 initialize_priority_queue: Analyzes the board and populates the self.pq heap with empty cells, prioritized by solution difficulty.
-ai_make_move: Retrieves the most constrained cell from the queue, executes the solve_hybrid solver to determine its true value, and updates the board.
+ai_make_move: Retrieves the most constrained cell from the queue, determines a safe value for it (or for a forced cell) within ai_budget_ms, and updates the board.
 ai_turn & ai_play_button: Manages the AI's turn execution sequence while maintaining UI responsiveness.
 """
 
@@ -65,6 +73,10 @@ class SudokuDuel:
 
         self.current_turn = "user"
         self.game_over = False
+        self.ai_budget_ms = AI_MOVE_BUDGET_MS
+        self.ai_last_source = None
+        self.speculator = Speculator()
+        self.conflicts = []
         self.difficulty = "Medium"
         self.difficulty_var = tk.StringVar(value=self.difficulty)
 
@@ -101,29 +113,15 @@ class SudokuDuel:
         board_frame = tk.Frame(self.root, bg="#d0d0d0", bd=4, relief=tk.SUNKEN)
         board_frame.pack(pady=10)
 
-        # Register validation command for Entry widgets
-        vcmd = (self.root.register(self.validate_input), '%P')
-
-        for i in range(9):
-            for j in range(9):
-                pady_top = 2 if i % 3 == 0 and i != 0 else 0
-                padx_left = 2 if j % 3 == 0 and j != 0 else 0
-
-                cell = tk.Entry(
-                    board_frame, width=3,
-                    font=("Helvetica", 20, "bold"),
-                    justify="center", bd=1, relief=tk.SOLID,
-                    bg="white", disabledbackground="white",
-                    disabledforeground="black",
-                    validate="key", validatecommand=vcmd
-                )
-                cell.grid(row=i, column=j,
-                          padx=(padx_left, 0), pady=(pady_top, 0))
-                
-                # Bind event for logic handling
-                cell.bind("<KeyRelease>",
-                          lambda e, r=i, c=j: self.on_cell_edit(r, c))
-                self.cells[i][j] = cell
+        # One canvas for the whole grid instead of 81 Entry widgets;
+        # board_view.cells keeps the Entry-style API.
+        self.board_view = BoardCanvas(board_frame, font=("Helvetica", 20, "bold"),
+                                      on_edit=self.on_cell_edit)
+        self.board_view.pack()
+        self.cells = self.board_view.cells
+        for row in self.cells:
+            for cell in row:
+                cell.configure(disabledbackground="white", disabledforeground="black")
 
         self.strict_var = tk.BooleanVar(value=False)
         tk.Checkbutton(
@@ -154,12 +152,6 @@ class SudokuDuel:
             font=("Helvetica", 12), bg="#FF9800", fg="white",
         ).grid(row=0, column=3, padx=5)
 
-    def validate_input(self, P):
-        """Ensures only digits 1-9 or empty string can be entered."""
-        if P == "" or (P.isdigit() and 1 <= int(P) <= 9):
-            return True
-        return False
-
     def on_difficulty_change(self):
         self.difficulty = self.difficulty_var.get()
         self.new_game()
@@ -169,9 +161,9 @@ class SudokuDuel:
         if difficulty is None:
             difficulty = self.difficulty
 
-        full_board = self.shuffle_board(self.get_base_pattern())
-        self.solution_board = copy.deepcopy(full_board)
-        self.board = copy.deepcopy(full_board)
+        full_board = shuffle_board(get_base_pattern())
+        self.solution_board = [row[:] for row in full_board]
+        self.board = [row[:] for row in full_board]
 
         cells = [(i, j) for i in range(9) for j in range(9)]
         random.shuffle(cells)
@@ -191,31 +183,6 @@ class SudokuDuel:
 
         return self.board
 
-    def get_base_pattern(self):
-        def pattern(r, c):
-            return (3 * (r % 3) + r // 3 + c) % 9
-        nums = list(range(1, 10))
-        random.shuffle(nums)
-        return [[nums[pattern(r, c)] for c in range(9)] for r in range(9)]
-
-    def shuffle_board(self, board):
-        # Shuffle rows within blocks
-        for i in range(0, 9, 3):
-            block = board[i:i + 3]
-            random.shuffle(block)
-            board[i:i + 3] = block
-        
-        # Transpose to shuffle columns (as rows)
-        board = list(map(list, zip(*board)))
-        for i in range(0, 9, 3):
-            block = board[i:i + 3]
-            random.shuffle(block)
-            board[i:i + 3] = block
-        
-        # Transpose back
-        board = list(map(list, zip(*board)))
-        return board
-
     # --- VALIDATION & HELPERS ---
     def is_valid(self, board, row, col, num):
         for i in range(9):
@@ -308,45 +275,54 @@ class SudokuDuel:
         return self._solve_dp_helper(board)
 
     def _solve_dp_helper(self, board):
-        state = tuple(tuple(row) for row in board)
-        if state in self.dp_cache: return self.dp_cache[state]
-
-        mrv = self._find_mrv_cell_bitmask(board)
-        if mrv is None:
-            self.dp_cache[state] = board
-            return board
-
-        row, col, candidates = mrv
-        if not candidates:
-            self.dp_cache[state] = None
-            return None
-
-        box_id = (row // 3) * 3 + col // 3
-        for num in candidates:
-            bit = 1 << (num - 1)
-            board[row][col] = num
-            self.row_mask[row] |= bit
-            self.col_mask[col] |= bit
-            self.box_mask[box_id] |= bit
-
-            result = self._solve_dp_helper(board)
-            if result:
-                self.dp_cache[state] = result
-                return result
-
-            board[row][col] = 0
-            self.row_mask[row] &= ~bit
-            self.col_mask[col] &= ~bit
-            self.box_mask[box_id] &= ~bit
-
-        self.dp_cache[state] = None
-        return None
+        # Explicit stack of [state, row, col, box_id, untried, bit] frames; bit
+        # is the digit currently placed by the frame and is undone on retry.
+        stack = []
+        while True:
+            state = tuple(tuple(row) for row in board)
+            if state in self.dp_cache:
+                solved = self.dp_cache[state]
+                if solved is not None:
+                    return [list(row) for row in solved]
+            else:
+                mrv = self._find_mrv_cell_bitmask(board)
+                if mrv is None:
+                    # Solved: cache the immutable state, as *board* is reused
+                    self.dp_cache[state] = state
+                    return board
+                row, col, candidates = mrv
+                box_id = (row // 3) * 3 + col // 3
+                stack.append([state, row, col, box_id, iter(sorted(candidates)), 0])
+
+            while stack:
+                frame = stack[-1]
+                state, row, col, box_id, untried, bit = frame
+                if bit:
+                    board[row][col] = 0
+                    self.row_mask[row] &= ~bit
+                    self.col_mask[col] &= ~bit
+                    self.box_mask[box_id] &= ~bit
+                num = next(untried, None)
+                if num is not None:
+                    bit = 1 << (num - 1)
+                    frame[5] = bit
+                    board[row][col] = num
+                    self.row_mask[row] |= bit
+                    self.col_mask[col] |= bit
+                    self.box_mask[box_id] |= bit
+                    break
+                self.dp_cache[state] = None
+                stack.pop()
+            else:
+                return None
 
     def solve_hybrid(self, board_snapshot):
-        board = copy.deepcopy(board_snapshot)
+        # Positions solved before (by this or a sibling game) come from disk
+        return get_default_cache().solve(board_snapshot, self._solve_hybrid_phases)
+
+    def _solve_hybrid_phases(self, board):
         self.solve_dnc_phase(board)
-        solved = self.solve_dp(board)
-        return solved
+        return self.solve_dp(board)
 
     # --- AI & GAMEPLAY LOGIC ---
     def initialize_priority_queue(self):
@@ -362,16 +338,8 @@ class SudokuDuel:
 
     def update_neighbors(self, row, col):
         """Updates priorities of neighbors after a move."""
-        neighbours = set()
-        for i in range(9):
-            neighbours.add((row, i))
-            neighbours.add((i, col))
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for i in range(br, br + 3):
-            for j in range(bc, bc + 3):
-                neighbours.add((i, j))
-
-        for r, c in neighbours:
+        for p in PEERS[row * 9 + col]:
+            r, c = ROW_OF[p], COL_OF[p]
             if self.board[r][c] == 0 and (r, c) != (row, col):
                 cand = self.get_candidates(self.board, r, c)
                 # We simply push to heap; lazy deletion handles stale entries later
@@ -380,6 +348,8 @@ class SudokuDuel:
                     self.pq_entries.add((r, c))
 
     def ai_make_move(self):
+        self.ai_last_source = None
+
         # Clean stale entries from PQ
         while self.pq and self.board[self.pq[0][1]][self.pq[0][2]] != 0:
             _, r, c = heapq.heappop(self.pq)
@@ -392,14 +362,23 @@ class SudokuDuel:
         if not self.pq:
             return False
 
-        _, row, col = heapq.heappop(self.pq)
+        cands_len, row, col = heapq.heappop(self.pq)
         self.pq_entries.discard((row, col))
 
-        solved_board = self.solve_hybrid(self.board)
-
-        if solved_board:
-            correct_val = solved_board[row][col]
-            self.board[row][col] = correct_val
+        # Reply precomputed during the user's turn, else a forced move from
+        # propagation, then a search bounded by the budget
+        reply = self.speculator.take(self.board)
+        if reply is None:
+            reply = anytime_move(self.board, (row, col), self.ai_budget_ms, self.solution_board,
+                                 solver_name="Hybrid (D&C+DP)")
+        r, c, correct_val, self.ai_last_source = reply
+        if correct_val is None or (r, c) != (row, col):
+            heapq.heappush(self.pq, (cands_len, row, col))
+            self.pq_entries.add((row, col))
+
+        if correct_val is not None:
+            row, col = r, c
+            self.state.set(row, col, correct_val)
 
             self.cells[row][col].config(state="normal")
             self.cells[row][col].delete(0, tk.END)
@@ -424,10 +403,17 @@ class SudokuDuel:
     def ai_turn(self):
         if self.game_over: return
 
+        # A wrong entry makes the board unsolvable: point at it instead of searching
+        if self.show_conflicts(): return
+
         if not self.ai_make_move():
             if self.is_complete():
                 self.game_over = True
                 messagebox.showinfo("Game Over", "Puzzle Complete!")
+            elif self.ai_last_source == "timeout":
+                self.current_turn = "user"
+                self.status_label.config(text="AI passed (out of time) - User's Turn")
+                self.speculate()
             else:
                 messagebox.showinfo("Game Over", "AI cannot find a solution (unsolvable state).")
                 self.new_game()
@@ -440,6 +426,26 @@ class SudokuDuel:
 
         self.current_turn = "user"
         self.status_label.config(text="User's Turn")
+        self.speculate()
+
+    def show_conflicts(self):
+        """Highlight the entries that left the board unsolvable; True if there are any."""
+        conflicts = find_conflicts(self.board, self.initial_board, self.solution_board)
+        if not conflicts:
+            return False
+        self.conflicts = conflicts
+        for r, c in conflicts:
+            self.cells[r][c].config(bg="#ffcdd2")
+        self.current_turn = "user"
+        self.status_label.config(text="Conflicting entries - User's Turn")
+        cells = ", ".join(f"Row {r + 1}, Col {c + 1}" for r, c in conflicts)
+        messagebox.showinfo("Conflict", f"No solution exists with these entries:\n{cells}\n"
+                                        "Clear or change the highlighted cells to continue.")
+        return True
+
+    def speculate(self):
+        """Precompute the AI's replies to the likely user moves while the user thinks."""
+        self.speculator.start(self.board, self.solution_board, "Hybrid (D&C+DP)")
 
     def on_cell_edit(self, row, col):
         if self.game_over: return
@@ -449,9 +455,14 @@ class SudokuDuel:
         cell = self.cells[row][col]
         v = cell.get().strip()
 
+        # Editing a highlighted conflict clears its highlight
+        if (row, col) in self.conflicts:
+            self.conflicts.remove((row, col))
+            cell.config(bg="white")
+
         # FIX: Handle Deletion
         if v == "":
-            self.board[row][col] = 0
+            self.state.set(row, col, 0)
             # Re-add to queue because it is now an empty cell needing solution
             self.initialize_priority_queue() 
             return
@@ -464,11 +475,11 @@ class SudokuDuel:
                 if num != self.solution_board[row][col]:
                     messagebox.showerror("Incorrect", "Strict Mode: Wrong value.")
                     cell.delete(0, tk.END)
-                    self.board[row][col] = 0
+                    self.state.set(row, col, 0)
                     return
 
             if self.is_valid(self.board, row, col, num):
-                self.board[row][col] = num
+                self.state.set(row, col, num)
                 self.pq_entries.discard((row, col))
                 self.update_neighbors(row, col)
                 cell.config(fg="blue")
@@ -487,18 +498,21 @@ class SudokuDuel:
                 # You might want to allow it but mark red. 
                 # For now, we revert to behavior: delete if invalid.
                 cell.delete(0, tk.END)
-                self.board[row][col] = 0
+                self.state.set(row, col, 0)
         except ValueError:
             cell.delete(0, tk.END)
 
     def new_game(self):
         self.game_over = False
         self.board = self.generate_puzzle()
-        self.initial_board = copy.deepcopy(self.board)
+        self.initial_board = [row[:] for row in self.board]
+        self.state = BoardState(self.board)
+        self.start_mark = self.state.mark()
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()
         self.status_label.config(text=f"User's Turn ({self.difficulty})")
+        self.speculate()
 
     def render_board(self):
         # FIX: Aggressively reset all styles before applying state
@@ -525,44 +539,46 @@ class SudokuDuel:
 
     def show_hint(self):
         if self.game_over: return
-        
-        # Ensure PQ is fresh
-        self.initialize_priority_queue()
-        
-        # Clean stale
-        while self.pq and self.board[self.pq[0][1]][self.pq[0][2]] != 0:
-            heapq.heappop(self.pq)
 
-        if not self.pq:
-            messagebox.showinfo("Hint", "No empty cells remaining!")
+        # Next logical step; the hybrid solver only runs if logic stalls
+        hint = next_hint(self.board, solve=lambda b: timed("hint", "Hybrid (D&C+DP)", self.solve_hybrid, b))
+        if hint is None:
+            if self.is_complete():
+                messagebox.showinfo("Hint", "No empty cells remaining!")
+            else:
+                messagebox.showinfo("Hint", "No solution exists from this state.")
             return
 
-        _, row, col = self.pq[0]
-
         # Reset any previous highlights (by redrawing board)
         self.render_board()
 
         # Highlight specific cell
-        hint_cell = self.cells[row][col]
+        hint_cell = self.cells[hint.row][hint.col]
         hint_cell.config(bg="#ffeb3b") # Yellow highlight
 
-        cand = sorted(self.get_candidates(self.board, row, col))
         messagebox.showinfo(
             "Hint",
-            f"Hybrid D&C+DP Target:\nRow {row + 1}, Col {col + 1}\nValid Options: {cand}"
+            f"{hint.technique}:\nRow {hint.row + 1}, Col {hint.col + 1} = {hint.value}\n\n{hint.explanation}"
         )
         # The yellow background will be cleared on next render_board call (e.g. next move)
 
     def reset_board(self):
         # FIX: Complete logic reset
         self.game_over = False
-        self.board = copy.deepcopy(self.initial_board)
+        self.state.undo_to(self.start_mark)
         self.current_turn = "user"
         self.initialize_priority_queue() # Critical: Reset AI memory
         self.render_board() # Redraw clean board
         self.status_label.config(text="User's Turn")
+        self.speculate()
 
 if __name__ == "__main__":
+    from sudoku_metrics import install_from_env as install_metrics
+    from sudoku_uimonitor import install_from_env
+    install_metrics()
     root = tk.Tk()
-    SudokuDuel(root)
+    monitor = install_from_env(root)
+    game = SudokuDuel(root)
+    if monitor:
+        monitor.watch(game)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Solver Metrics
+==============
+A small in-process registry of counters and histograms, exported in the
+Prometheus text exposition format (version 0.0.4) to a file or over a local
+HTTP endpoint.  Two metrics are fed by the solver and generator entry points:
+
+    sudoku_solve_duration_seconds{entry, solver}   histogram of call latency
+    sudoku_solves_total{entry, solver, outcome}    calls by outcome
+
+entry is where the call came from (ai_move, speculate, hint, generate,
+batch_solve, solve, or a server op), outcome one of solved, unsolved,
+cache_hit, error, timeout, ok (generation), or forced / fallback /
+speculated (anytime and precomputed AI moves).
+
+Recording is off unless enabled, and then costs a single flag test per call.
+It can be switched on with enable(), or from the environment by entry points
+that call install_from_env() (importing the module never does):
+
+    SUDOKU_METRICS=1                   record
+    SUDOKU_METRICS_PORT=9464           record and serve http://127.0.0.1:9464/metrics
+    SUDOKU_METRICS_FILE=metrics.prom   record and write metrics.<pid>.prom at exit
+
+Each process has its own registry.  Games started from the launcher inherit
+its environment: only the first process to bind the port serves it, and each
+writes its own file, so none overwrites another's.
+"""
+
+import atexit
+import bisect
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_PORT = 9464
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+                for labels, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram per label set, in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}            # labels: [bucket counts..., +Inf count, sum]
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        k = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            row = self.series.get(labels)
+            if row is None:
+                row = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[k] += 1
+            row[-1] += value
+
+    def render(self):
+        with self.lock:
+            items = sorted((labels, list(row)) for labels, row in self.series.items())
+        lines = []
+        for labels, row in items:
+            running = 0
+            for bound, count in zip(self.buckets + (math.inf,), row):
+                running += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(row[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {running}")
+        return lines
+
+
+class Registry:
+    """A named collection of metrics rendered together."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help_text, labelnames=()):
+        metric = Counter(name, help_text, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """The whole registry in Prometheus text format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+SOLVE_DURATION = REGISTRY.histogram(
+    "sudoku_solve_duration_seconds", "Latency of solver and generator calls.",
+    ("entry", "solver"))
+SOLVES = REGISTRY.counter(
+    "sudoku_solves_total", "Solver and generator calls by outcome.",
+    ("entry", "solver", "outcome"))
+
+enabled = False
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def observe(entry, solver, outcome, seconds):
+    """Record one call; a no-op while recording is disabled."""
+    if not enabled:
+        return
+    SOLVE_DURATION.observe((entry, solver), seconds)
+    SOLVES.inc((entry, solver, outcome))
+
+
+def timed(entry, solver, fn, *args):
+    """
+    Return fn(*args), recording its latency under *entry* / *solver* with
+    outcome solved (a result), unsolved (None) or error (an exception).
+    """
+    if not enabled:
+        return fn(*args)
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Exception:
+        observe(entry, solver, "error", time.perf_counter() - start)
+        raise
+    observe(entry, solver, "unsolved" if result is None else "solved",
+            time.perf_counter() - start)
+    return result
+
+
+# ---------- Export ----------
+
+def write_textfile(path, registry=REGISTRY):
+    """Write the registry to *path* atomically (node_exporter textfile style)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_http_server(port=DEFAULT_PORT, host="127.0.0.1", registry=REGISTRY):
+    """Serve *registry* at http://host:port/metrics from a daemon thread; returns the server."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def textfile_path(path, pid=None):
+    """*path* with the process id (default: this one) before its extension."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid() if pid is None else pid}{ext}"
+
+
+def install_from_env():
+    """
+    Enable recording and export as the environment asks (see the module
+    docstring).  Returns the HTTP server, or None if there is none or the
+    port is already taken by another process.
+    """
+    port = os.environ.get("SUDOKU_METRICS_PORT")
+    path = os.environ.get("SUDOKU_METRICS_FILE")
+    if not (os.environ.get("SUDOKU_METRICS") or port or path):
+        return None
+    enable()
+    if path:
+        atexit.register(write_textfile, textfile_path(path))
+    if port:
+        try:
+            return start_http_server(int(port))
+        except OSError:
+            return None     # served by another process, e.g. the launcher
+    return None
@@ -0,0 +1,184 @@
+"""
+Multi-core Benchmark Runner
+===========================
+Runs the analysis benchmark (sudoku_analysis.run_benchmarks) with its
+independent (solver, puzzle) measurements spread across worker processes,
+each pinned to its own core with os.sched_setaffinity, and merges the
+results back into the usual avg / records structures.
+
+Pinning keeps a measurement on one core's caches and stops the scheduler
+from migrating it mid-solve.  When more than two cores are available one is
+left to the parent and the rest of the system.  Each measurement also
+records how noisy it was: wall time well above the process's CPU time
+means the worker sat waiting for its core while something else ran on it.
+The involuntary context switches during the solve are kept alongside (a
+thread handoff costs a few, so they are informative rather than a test).
+A noisy measurement is repeated up to NOISE_RETRIES times and the fastest
+attempt kept; the ones still noisy after that are flagged in their record
+and counted in the noise report.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Value
+
+try:
+    import resource
+except ImportError:     # not on Windows
+    resource = None
+
+from sudoku_analysis import DIFFICULTIES, PUZZLES_PER_DIFFICULTY, SOLVERS, _time_solver
+from sudoku_cache import decode_board
+from sudoku_corpus import load_corpus
+
+
+NOISE_RETRIES = 2
+NOISE_RATIO = 1.25          # wall / CPU time above this is interference...
+NOISE_FLOOR_MS = 0.5        # ...once the gap is larger than timer jitter
+
+
+def available_cores():
+    """Cores this process may run on, in ascending order."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _involuntary_switches():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_nivcsw if resource else 0
+
+
+# ---------- Worker side ----------
+
+_core = None
+
+
+def _pin(cores, counter):
+    """Pool initialiser: claim the next core of *cores* and bind this process to it."""
+    global _core
+    with counter.get_lock():
+        _core = cores[counter.value % len(cores)]
+        counter.value += 1
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {_core})
+
+
+def _measure(name, key):
+    """Time SOLVERS[name] on the encoded board; returns (ms, cpu_ms, switches, noisy, attempts, core)."""
+    fn = SOLVERS[name]
+    puzzle = decode_board(key)
+    best = None
+    for attempt in range(1, NOISE_RETRIES + 2):
+        switches = _involuntary_switches()
+        cpu = time.process_time()
+        ms = _time_solver(fn, puzzle)
+        cpu_ms = (time.process_time() - cpu) * 1000
+        switches = _involuntary_switches() - switches
+        if ms is None:
+            return None, cpu_ms, switches, False, attempt, _core
+        noisy = ms > NOISE_RATIO * cpu_ms + NOISE_FLOOR_MS
+        if best is None or ms < best[0]:
+            best = (ms, cpu_ms, switches, noisy)
+        if not noisy:
+            break
+    return best + (attempt, _core)
+
+
+# ---------- Parent side ----------
+
+def run_parallel_benchmarks(workers=None, progress_cb=None, on_record=None, cancel=None):
+    """
+    Parallel run_benchmarks().  Returns (avg, records, noise): avg and
+    records have run_benchmarks' shape (records gain "cpu_ms", "switches",
+    "noisy", "attempts" and "core" keys and come back in the serial order),
+    noise is noise_report() of the records plus the cores used and the load
+    average before and after.  Callbacks fire in completion order; setting
+    *cancel* drops the measurements that have not started.
+    """
+    cores = available_cores()
+    if len(cores) > 2:
+        cores = cores[1:]
+    workers = min(workers or len(cores), len(cores))
+
+    tasks = []
+    for diff in DIFFICULTIES:
+        for pidx, entry in enumerate(load_corpus()["tiers"][diff][:PUZZLES_PER_DIFFICULTY]):
+            for name in SOLVERS:
+                tasks.append({
+                    "difficulty": diff,
+                    "puzzle": pidx + 1,
+                    "algorithm": name,
+                    "technique": entry["technique"],
+                    "board": entry["board"],
+                })
+
+    load_before = os.getloadavg()[0] if hasattr(os, "getloadavg") else None
+    records = [None] * len(tasks)
+    done = 0
+    with ProcessPoolExecutor(workers, initializer=_pin, initargs=(cores, Value("i", 0))) as pool:
+        pending = {pool.submit(_measure, task["algorithm"], task["board"]): i
+                   for i, task in enumerate(tasks)}
+        while pending:
+            finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.is_set():
+                for future in pending:
+                    future.cancel()
+            for future in finished:
+                i = pending.pop(future)
+                ms, cpu_ms, switches, noisy, attempts, core = future.result()
+                rec = dict(tasks[i], time_ms=ms, cpu_ms=cpu_ms, switches=switches,
+                           noisy=noisy, attempts=attempts, core=core)
+                records[i] = rec
+                done += 1
+                if progress_cb:
+                    progress_cb(done, len(tasks))
+                if on_record:
+                    on_record(rec)
+            pending = {f: i for f, i in pending.items() if not f.cancelled()}
+
+    records = [rec for rec in records if rec is not None]
+    noise = noise_report(records)
+    noise["workers"] = workers
+    noise["cores"] = cores[:workers]
+    noise["load_before"] = load_before
+    noise["load_after"] = os.getloadavg()[0] if hasattr(os, "getloadavg") else None
+    return merge_records(records), records, noise
+
+
+def merge_records(records):
+    """Rebuild run_benchmarks' {difficulty: {solver: avg_ms}} from *records*."""
+    avg = {}
+    for diff in DIFFICULTIES:
+        avg[diff] = {}
+        for name in SOLVERS:
+            times = [rec["time_ms"] for rec in records
+                     if rec["difficulty"] == diff and rec["algorithm"] == name
+                     and rec["time_ms"] is not None]
+            avg[diff][name] = sum(times) / len(times) if times else None
+    return avg
+
+
+def noise_report(records):
+    """Count noisy and repeated measurements; *noisy* ones are worth re-running."""
+    noisy = [rec for rec in records if rec.get("noisy")]
+    return {
+        "measurements": len(records),
+        "noisy": len(noisy),
+        "retried": sum(1 for rec in records if rec.get("attempts", 1) > 1),
+        "noisy_keys": sorted({(rec["difficulty"], rec["algorithm"]) for rec in noisy}),
+    }
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    avg, records, noise = run_parallel_benchmarks()
+    elapsed = time.perf_counter() - start
+    print(f"{len(records)} measurements on {noise['workers']} core(s) {noise['cores']} "
+          f"in {elapsed:.1f}s")
+    for diff in DIFFICULTIES:
+        print(f"  {diff:<7}" + "  ".join(
+            f"{name}={ms:.2f}" if ms is not None else f"{name}=TIMEOUT"
+            for name, ms in avg[diff].items()))
+    print(f"noise: {noise['noisy']} noisy, {noise['retried']} retried; "
+          f"load {noise['load_before']} -> {noise['load_after']}")
@@ -0,0 +1,187 @@
+"""
+Parallel Sudoku Search
+======================
+Splits one puzzle's search tree across a pool of worker processes, so a
+single hard or sparse board (above all when counting its solutions) can use
+every core instead of one.
+
+The parent expands the top levels of the MRV tree breadth-first until there
+are about TASKS_PER_WORKER open subproblems per worker, then hands them out
+through a shared queue.  When a worker goes idle while others are still
+busy, the next busy worker to poll gives up its subproblem and sends it back
+split one level further (work stealing); the pieces are small by then, so
+the work redone is cheap.  In solve mode everything is cancelled as soon as
+one worker finds a solution; in counting mode the per-subtree counts are
+summed, stopping early once *limit* is reached.
+"""
+
+import math
+import multiprocessing
+import os
+import queue
+from collections import deque
+
+from sudoku_board import Board
+from sudoku_engine import search
+
+
+TASKS_PER_WORKER = 16
+# Polls (of STOP_CHECK_INTERVAL nodes each) a worker spends on a subproblem
+# before it will hand it over to an idle worker.
+STEAL_AFTER_POLLS = 4
+JOIN_TIMEOUT = 1.0
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def expand(cells, n, target):
+    """
+    Split the position *cells* (bytes of an n×n Board) breadth-first on its
+    most constrained cell until at least *target* subproblems are open or the
+    tree runs out.  Returns (subproblems, solutions) as lists of bytes; dead
+    branches are dropped.
+    """
+    frontier = deque([bytes(cells)])
+    solutions = []
+    while frontier and len(frontier) < target:
+        board = Board(frontier.popleft(), n)
+        best, best_mask, best_count = -1, 0, n + 1
+        for i in board.empties():
+            mask = board.candidates(i)
+            count = mask.bit_count()
+            if count < best_count:
+                best, best_mask, best_count = i, mask, count
+                if count == 0:
+                    break
+        if best < 0:
+            solutions.append(bytes(board.cells))
+            continue
+        while best_mask:
+            bit = best_mask & -best_mask
+            best_mask ^= bit
+            board[best] = bit.bit_length()
+            frontier.append(bytes(board.cells))
+    return list(frontier), solutions
+
+
+def _worker(n, limit, tasks, results, stop, idle):
+    while True:
+        with idle.get_lock():
+            idle.value += 1
+        cells = tasks.get()
+        with idle.get_lock():
+            idle.value -= 1
+        if cells is None:
+            return
+        if stop.is_set():
+            results.put((0, 0, None, []))
+            continue
+
+        polls = 0
+
+        def should_stop():
+            nonlocal polls
+            polls += 1
+            return stop.is_set() or (polls > STEAL_AFTER_POLLS and idle.value > 0)
+
+        board = Board(cells, n)
+        count, nodes = search(board, limit, should_stop=should_stop)
+        if count is None:
+            # Stolen: give the subproblem back in pieces (none if cancelled).
+            pieces, solutions = ([], []) if stop.is_set() else expand(cells, n, 2)
+            results.put((len(solutions), nodes, solutions[0] if solutions else None, pieces))
+        else:
+            solution = bytes(board.cells) if count and limit == 1 else None
+            results.put((count, nodes, solution, []))
+
+
+def parallel_search(board, limit=1, workers=None):
+    """
+    Search *board* (a grid or Board) on *workers* processes.
+
+    Returns (count, solution, nodes): the number of solutions found, capped
+    at *limit* (pass math.inf to count them all); the first solution found
+    as a new list-of-lists grid when limit=1, else None; and the total
+    placements tried.  *board* itself is never modified.
+    """
+    if not isinstance(board, Board):
+        board = Board.from_grid(board)
+    n = board.n
+    workers = workers or default_workers()
+    if workers <= 1:
+        copy = board.copy()
+        count, nodes = search(copy, limit)
+        return min(count, limit), copy.to_grid() if count and limit == 1 else None, nodes
+
+    subproblems, solutions = expand(board.cells, n, workers * TASKS_PER_WORKER)
+    count = len(solutions)
+    solution = solutions[0] if solutions else None
+    nodes = 0
+    if count >= limit or not subproblems:
+        return min(count, limit), _grid(solution, n, limit), nodes
+
+    tasks = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    idle = multiprocessing.Value("i", 0)
+    procs = [multiprocessing.Process(target=_worker, args=(n, limit, tasks, results, stop, idle),
+                                     daemon=True)
+             for _ in range(workers)]
+    for cells in subproblems:
+        tasks.put(cells)
+    for proc in procs:
+        proc.start()
+
+    outstanding = len(subproblems)
+    try:
+        while outstanding:
+            found, task_nodes, task_solution, pieces = results.get()
+            # Pieces are queued by the parent, so their results can never
+            # arrive before the message that created them.
+            for cells in pieces:
+                tasks.put(cells)
+            outstanding += len(pieces) - 1
+            count += found
+            nodes += task_nodes
+            if solution is None:
+                solution = task_solution
+            if count >= limit:
+                break
+    finally:
+        stop.set()
+        _shutdown(procs, tasks)
+    return min(count, limit), _grid(solution, n, limit), nodes
+
+
+def _grid(cells, n, limit):
+    if cells is None or limit != 1:
+        return None
+    return Board(cells, n).to_grid()
+
+
+def _shutdown(procs, tasks):
+    # Drain what is left so the workers reach their sentinels quickly.
+    try:
+        while True:
+            tasks.get_nowait()
+    except queue.Empty:
+        pass
+    for _ in procs:
+        tasks.put(None)
+    for proc in procs:
+        proc.join(JOIN_TIMEOUT)
+        if proc.is_alive():
+            proc.terminate()
+            proc.join()
+
+
+def parallel_solve(board, workers=None):
+    """Return a solution of *board* as a new grid, or None, using every worker."""
+    return parallel_search(board, 1, workers)[1]
+
+
+def parallel_count_solutions(board, limit=math.inf, workers=None):
+    """Count the solutions of *board* in parallel, stopping at *limit*."""
+    return parallel_search(board, limit, workers)[0]
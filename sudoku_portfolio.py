@@ -0,0 +1,90 @@
+"""
+Portfolio Solver
+================
+Races several engines from BENCHMARK_SOLVERS on the same puzzle, each in its
+own process, and returns the first solution that verifies.  Every engine has
+boards it is slow on (D&C on sparse boards, the static-order DP on
+adversarial ones), but rarely all at once, so the race's time is close to
+that of the best engine for each puzzle.  The losers are terminated as soon
+as there is a winner.
+"""
+
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+
+from sudoku_cache import is_solution
+from sudoku_engine import BENCHMARK_SOLVERS
+
+
+PORTFOLIO_SOLVERS = tuple(BENCHMARK_SOLVERS)
+JOIN_TIMEOUT = 0.5      # seconds a terminated loser gets to exit before it is killed
+CANCEL_POLL = 0.05      # seconds between checks of the cancel event
+
+
+def _race_child(solver_name, board, conn):
+    try:
+        conn.send(BENCHMARK_SOLVERS[solver_name](board))
+    finally:
+        conn.close()
+
+
+def portfolio_solve(board, solvers=PORTFOLIO_SOLVERS, timeout=None, cancel=None):
+    """
+    Race *solvers* (names in BENCHMARK_SOLVERS) on *board*.
+
+    Returns (solution, winner): the first verified solution as a new grid
+    and the name of the engine that found it, or (None, None) if every
+    engine failed, *timeout* seconds passed or the *cancel* event was set.
+    *board* is not modified.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    racers = {}
+    try:
+        for name in solvers:
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            proc = multiprocessing.Process(target=_race_child,
+                                           args=(name, board, send_conn), daemon=True)
+            proc.start()
+            send_conn.close()
+            racers[recv_conn] = (name, proc)
+
+        while racers:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            if cancel is not None:
+                if cancel.is_set():
+                    break
+                remaining = CANCEL_POLL if remaining is None else min(remaining, CANCEL_POLL)
+            ready = wait(list(racers), remaining)
+            for conn in ready:
+                name, proc = racers.pop(conn)
+                try:
+                    solution = conn.recv()
+                except (EOFError, OSError):
+                    solution = None
+                conn.close()
+                proc.join()
+                if is_solution(board, solution):
+                    return solution, name
+        return None, None
+    finally:
+        _stop(racers)
+
+
+def _stop(racers):
+    for conn, (_, proc) in racers.items():
+        if proc.is_alive():
+            proc.terminate()
+        conn.close()
+    for _, proc in racers.values():
+        proc.join(JOIN_TIMEOUT)
+        if proc.is_alive():
+            proc.kill()
+            proc.join()
+
+
+def solve_portfolio(board):
+    """BENCHMARK_SOLVERS-style wrapper: the portfolio's solution or None."""
+    return portfolio_solve(board)[0]
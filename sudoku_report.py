@@ -0,0 +1,220 @@
+"""
+Headless Benchmark Report
+=========================
+Runs the benchmarks without a display and writes what the benchmark windows
+show as files: the same charts (sudoku_charts, rendered by Agg through
+Figure.savefig, so no GUI backend is ever loaded) and an index.html with the
+averages, the complexity table and every per-puzzle record.  The analysis
+records are also saved as records.json, which sudoku_selector can train on.
+
+    analysis   sudoku_analysis.run_benchmarks: all 5 solvers, per-puzzle records
+    engine     sudoku_engine.benchmark_all_solvers: success rates, min / max
+
+    python sudoku_report.py [--output-dir benchmark_report] [--format svg]
+                            [--suites analysis] [--precise] [--workers 4]
+
+--workers runs the analysis suite with sudoku_multibench (one pinned process
+per core) and adds its noise report; it cannot be combined with --precise.
+"""
+
+import argparse
+import html
+import os
+import platform
+import sys
+import time
+
+from matplotlib.figure import Figure
+
+from sudoku_analysis import COMPLEXITY_HEADERS, COMPLEXITY_TABLE, DIFFICULTIES, SOLVERS, run_benchmarks
+from sudoku_charts import (
+    COMPARISON_BG, COMPARISON_COLORS, COMPARISON_LABELS, COMPARISON_SOLVERS,
+    ComparisonChart, PerformanceChart,
+)
+from sudoku_corpus import CORPUS_VERSION
+from sudoku_engine import DIFFICULTY_HOLES, benchmark_all_solvers
+from sudoku_selector import save_records
+
+
+DEFAULT_OUTPUT_DIR = "benchmark_report"
+ENGINE_TRIALS = 5
+SUITES = ("analysis", "engine")
+
+PAGE_STYLE = """
+body { background: #0f0f1a; color: #e0e0e0; font-family: "Segoe UI", sans-serif; margin: 24px; }
+h1, h2 { color: #4fc3f7; }
+table { border-collapse: collapse; margin-bottom: 24px; }
+th { color: #4fc3f7; text-align: left; border-bottom: 1px solid #2a3a5e; }
+th, td { padding: 4px 12px; }
+tr:nth-child(even) { background: #151528; }
+.fail { color: #ff6b81; }
+img { max-width: 100%; margin-bottom: 24px; }
+"""
+
+
+# ---------- Charts ----------
+
+def render_analysis_chart(avg, path):
+    """Save the analysis window's performance chart for run_benchmarks() averages."""
+    fig = Figure(figsize=(10, 5.5), dpi=100)
+    chart = PerformanceChart(fig, DIFFICULTIES, list(SOLVERS))
+    chart.update({(diff, name): ms for diff, row in avg.items() for name, ms in row.items()})
+    fig.savefig(path, facecolor=fig.get_facecolor())
+    return path
+
+
+def render_engine_chart(results, path, num_trials=ENGINE_TRIALS):
+    """Save the benchmark window's comparison chart for benchmark_all_solvers() results."""
+    fig = Figure(figsize=(9.2, 3.2), dpi=100)
+    chart = ComparisonChart(
+        fig, list(DIFFICULTY_HOLES), COMPARISON_SOLVERS, COMPARISON_LABELS,
+        COMPARISON_COLORS, COMPARISON_BG,
+        title=f"Solve Time Comparison — Greedy / Backtracking / Hybrid (avg of {num_trials} runs, ms)")
+    chart.update_all(results)
+    fig.savefig(path, facecolor=fig.get_facecolor())
+    return path
+
+
+# ---------- HTML ----------
+
+def _ms(value):
+    return "TIMEOUT" if value is None else f"{value:.3f}"
+
+
+def _table(headers, rows, fail=None):
+    """An escaped HTML table, headed by *headers* if given; rows where fail(row) holds are marked."""
+    out = ["<table>"]
+    if headers:
+        out.append("<tr>" + "".join(f"<th>{html.escape(str(h))}</th>" for h in headers) + "</tr>")
+    for row in rows:
+        cls = ' class="fail"' if fail and fail(row) else ""
+        out.append(f"<tr{cls}>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in row) + "</tr>")
+    out.append("</table>")
+    return "\n".join(out)
+
+
+def render_html(meta, analysis=None, engine=None, charts=None):
+    """
+    The summary page.  *analysis* is (avg, records, noise or None), *engine*
+    benchmark_all_solvers() results, *charts* {suite: image file name}.
+    """
+    charts = charts or {}
+    parts = ["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\">",
+             "<title>Sudoku Benchmark Report</title>", f"<style>{PAGE_STYLE}</style>",
+             "</head><body>", "<h1>Sudoku Benchmark Report</h1>",
+             _table(None, meta.items())]
+
+    if analysis is not None:
+        avg, records, noise = analysis
+        parts.append("<h2>Average Solve Time (ms)</h2>")
+        if "analysis" in charts:
+            parts.append(f'<img src="{html.escape(charts["analysis"])}" alt="performance chart">')
+        parts.append(_table(["Difficulty"] + list(SOLVERS),
+                            [[diff] + [_ms(avg[diff][name]) for name in SOLVERS] for diff in avg]))
+        if noise is not None:
+            parts.append("<h2>Noise</h2>")
+            parts.append(_table(None, [
+                ("workers / cores", f"{noise['workers']} / {noise['cores']}"),
+                ("noisy / retried", f"{noise['noisy']} / {noise['retried']} of {noise['measurements']}"),
+                ("noisy pairs", ", ".join(f"{d} {a}" for d, a in noise["noisy_keys"]) or "none"),
+                ("load before / after", f"{noise['load_before']} / {noise['load_after']}"),
+            ]))
+
+    if engine is not None:
+        parts.append("<h2>Solver Comparison</h2>")
+        if "engine" in charts:
+            parts.append(f'<img src="{html.escape(charts["engine"])}" alt="comparison chart">')
+        parts.append(_table(
+            ["Difficulty", "Solver", "Avg ms", "Min ms", "Max ms", "Success %"],
+            [[diff, name, f"{s['avg']:.3f}", f"{s['min']:.3f}", f"{s['max']:.3f}",
+              f"{s['success_rate']:.0f}"]
+             for diff, row in engine.items() for name, s in row.items()],
+            fail=lambda row: row[5] != "100"))
+
+    parts.append("<h2>Time Complexity</h2>")
+    parts.append(_table(COMPLEXITY_HEADERS, COMPLEXITY_TABLE))
+
+    if analysis is not None:
+        records = analysis[1]
+        extra = [key for key in ("cpu_ms", "noisy", "core") if records and key in records[0]]
+        parts.append("<h2>Per-Puzzle Results</h2>")
+        parts.append(_table(
+            ["Difficulty", "Puzzle", "Algorithm", "Time (ms)"] + extra + ["Technique", "Board"],
+            [[rec["difficulty"], rec["puzzle"], rec["algorithm"], _ms(rec["time_ms"])]
+             + [_ms(rec[key]) if key == "cpu_ms" else rec[key] for key in extra]
+             + [rec["technique"], rec["board"]]
+             for rec in records],
+            fail=lambda row: row[3] == "TIMEOUT"))
+
+    parts.append("</body></html>")
+    return "\n".join(parts) + "\n"
+
+
+# ---------- Runner ----------
+
+def _progress(label):
+    def report(done, total):
+        print(f"\r  {label}: {done}/{total}", end="", file=sys.stderr, flush=True)
+        if done == total:
+            print(file=sys.stderr)
+    return report
+
+
+def build_report(output_dir=DEFAULT_OUTPUT_DIR, fmt="png", suites=SUITES,
+                 precise=False, workers=None, num_trials=ENGINE_TRIALS):
+    """Run *suites* and write charts and index.html into *output_dir*; returns the page path."""
+    os.makedirs(output_dir, exist_ok=True)
+    meta = {
+        "Generated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "Python": platform.python_version(),
+        "Platform": platform.platform(),
+        "Corpus version": CORPUS_VERSION,
+        "Timing": "precise" if precise else "standard",
+    }
+    analysis = engine = None
+    charts = {}
+
+    if "analysis" in suites:
+        start = time.perf_counter()
+        if workers:
+            from sudoku_multibench import run_parallel_benchmarks
+            analysis = run_parallel_benchmarks(workers, progress_cb=_progress("analysis"))
+        else:
+            analysis = run_benchmarks(progress_cb=_progress("analysis"), precise=precise) + (None,)
+        meta["Analysis suite"] = f"{time.perf_counter() - start:.1f} s"
+        charts["analysis"] = f"analysis.{fmt}"
+        render_analysis_chart(analysis[0], os.path.join(output_dir, charts["analysis"]))
+        save_records(analysis[1], os.path.join(output_dir, "records.json"))
+
+    if "engine" in suites:
+        start = time.perf_counter()
+        engine = benchmark_all_solvers(num_trials, precise=precise)
+        meta["Engine suite"] = f"{time.perf_counter() - start:.1f} s ({num_trials} puzzles per tier)"
+        charts["engine"] = f"engine.{fmt}"
+        render_engine_chart(engine, os.path.join(output_dir, charts["engine"]), num_trials)
+
+    path = os.path.join(output_dir, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_html(meta, analysis, engine, charts))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmarks headless and write an HTML report.")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--format", choices=("png", "svg"), default="png")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--precise", action="store_true", help="time with sudoku_timing.precise_time")
+    parser.add_argument("--workers", type=int, help="run the analysis suite on this many cores")
+    parser.add_argument("--trials", type=int, default=ENGINE_TRIALS, help="puzzles per tier (engine suite)")
+    args = parser.parse_args()
+    if args.precise and args.workers:
+        parser.error("--precise and --workers cannot be combined")
+
+    path = build_report(args.output_dir, args.format, args.suites,
+                        args.precise, args.workers, args.trials)
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
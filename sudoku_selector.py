@@ -0,0 +1,229 @@
+"""
+Algorithm Selector
+==================
+Learns from benchmark records which engine is fastest for a given puzzle
+and dispatches each puzzle to it.
+
+Every puzzle is summarised by a few cheap features (clue count, candidate
+histogram, naked singles, box density, log search-space size).  One ridge
+regression per solver predicts log solve time from them; the selector picks
+the solver with the lowest prediction.  Failures and timeouts are trained as
+PENALTY_MS, so engines that often fail are only chosen where they shine.
+
+Records are the dicts produced by sudoku_analysis.run_benchmarks or by
+collect_records() below; each needs "board" (sudoku_cache.encode_board),
+"algorithm" and "time_ms" (None for a failure).  The analysis window's short
+solver names are mapped to BENCHMARK_SOLVERS' through SOLVER_ALIASES.
+Records can be kept as JSON (save_records / load_records; sudoku_report
+writes its run to records.json) and trained on later:
+
+    python sudoku_selector.py [--records records.json] [--save-records out.json]
+"""
+
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+from sudoku_board import Board
+from sudoku_cache import decode_board, encode_board, is_solution
+from sudoku_engine import BENCHMARK_SOLVERS, DIFFICULTY_HOLES, _time_solver_in_process, generate_puzzle
+
+
+PENALTY_MS = 10_000.0
+RIDGE_LAMBDA = 1.0
+TRAIN_TIMEOUT = 5.0     # seconds per solve when collecting records
+
+SOLVER_ALIASES = {      # sudoku_analysis.SOLVERS name: BENCHMARK_SOLVERS name
+    "D&C":    "Divide & Conquer",
+    "Hybrid": "Hybrid (D&C+DP)",
+}
+
+
+def extract_features(board):
+    """Return the feature vector of *board* (a grid or Board) as a float array."""
+    if not isinstance(board, Board):
+        board = Board.from_grid(board)
+    n = board.n
+    cells = n * n
+    empties = board.empties()
+    hist = [0] * (n + 1)
+    log_space = 0.0
+    for i in empties:
+        k = board.candidates(i).bit_count()
+        hist[k] += 1
+        if k:
+            log_space += math.log(k)
+    box = math.isqrt(n)
+    box_clues = [0] * n
+    for i, v in enumerate(board.cells):
+        if v:
+            r, c = divmod(i, n)
+            box_clues[(r // box) * box + c // box] += 1
+    density = np.array(box_clues, dtype=float) / n
+    open_cells = max(len(empties), 1)
+    return np.array(
+        [1.0 - len(empties) / cells]                # clue density
+        + [h / open_cells for h in hist]            # candidate histogram (0 = dead cell)
+        + [hist[1] / cells,                         # naked singles
+           density.min(), density.max(), density.std(),
+           log_space / cells],
+        dtype=float,
+    )
+
+
+class AlgorithmSelector:
+    """Per-solver ridge models over extract_features(); see fit() and choose()."""
+
+    def __init__(self, solvers=None, ridge=RIDGE_LAMBDA):
+        self.solvers = BENCHMARK_SOLVERS if solvers is None else solvers
+        self.ridge = ridge
+        self.names = []
+        self.weights = None     # (features + 1, solvers), bias row last
+        self.mean = None
+        self.scale = None
+
+    def fit(self, records):
+        """
+        Train on benchmark *records*.  Records of solvers not in self.solvers
+        are ignored; ValueError if a solver in self.solvers has none.
+        """
+        times = {}
+        for rec in records:
+            name = SOLVER_ALIASES.get(rec["algorithm"], rec["algorithm"])
+            if name not in self.solvers or not rec.get("board"):
+                continue
+            ms = rec["time_ms"]
+            times.setdefault(rec["board"], {})[name] = PENALTY_MS if ms is None else max(ms, 1e-3)
+        self.names = sorted({name for row in times.values() for name in row})
+        missing = [name for name in self.solvers if name not in self.names]
+        if missing:
+            raise ValueError(f"no benchmark records for {', '.join(missing)}")
+        boards = [key for key, row in times.items() if len(row) == len(self.names)]
+        if not boards:
+            raise ValueError("no complete benchmark records to train on")
+
+        X = np.array([extract_features(decode_board(key)) for key in boards])
+        Y = np.log(np.array([[times[key][name] for name in self.names] for key in boards]))
+        self.mean = X.mean(axis=0)
+        self.scale = X.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        Z = np.hstack([(X - self.mean) / self.scale, np.ones((len(X), 1))])
+        penalty = self.ridge * np.eye(Z.shape[1])
+        penalty[-1, -1] = 0.0       # the bias is not regularised
+        self.weights = np.linalg.solve(Z.T @ Z + penalty, Z.T @ Y)
+        return self
+
+    def predict(self, board):
+        """Return {solver name: predicted ms} for *board*."""
+        if self.weights is None:
+            raise RuntimeError("selector has not been trained")
+        z = np.append((extract_features(board) - self.mean) / self.scale, 1.0)
+        return dict(zip(self.names, np.exp(z @ self.weights)))
+
+    def choose(self, board):
+        predicted = self.predict(board)
+        return min(predicted, key=predicted.get)
+
+    def solve(self, board):
+        """Solve *board* with the solver predicted fastest; returns its result."""
+        return self.solvers[self.choose(board)](board)
+
+    def save(self, path):
+        np.savez(path, names=np.array(self.names), weights=self.weights,
+                 mean=self.mean, scale=self.scale)
+
+    @classmethod
+    def load(cls, path, solvers=None):
+        data = np.load(path)
+        selector = cls(solvers)
+        selector.names = [str(name) for name in data["names"]]
+        selector.weights = data["weights"]
+        selector.mean = data["mean"]
+        selector.scale = data["scale"]
+        return selector
+
+
+# ---------- Training data and evaluation ----------
+
+def collect_records(puzzles_per_difficulty=20, solvers=None, timeout=TRAIN_TIMEOUT):
+    """
+    Time every solver on fresh puzzles of each difficulty and return
+    run_benchmarks-style records.  Each solve runs in its own process so a
+    runaway engine can be cut off after *timeout* seconds.
+    """
+    solvers = BENCHMARK_SOLVERS if solvers is None else solvers
+    records = []
+    for diff in DIFFICULTY_HOLES:
+        for pidx in range(puzzles_per_difficulty):
+            puzzle, _ = generate_puzzle(diff)
+            key = encode_board(puzzle)
+            for name, fn in solvers.items():
+                ms, solved = _time_solver_in_process(fn, puzzle, timeout)
+                records.append({
+                    "difficulty": diff,
+                    "puzzle": pidx + 1,
+                    "algorithm": name,
+                    "time_ms": ms if solved else None,
+                    "board": key,
+                })
+    return records
+
+
+def save_records(records, path):
+    """Write benchmark *records* to *path* as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+
+def load_records(path):
+    """Read benchmark records written by save_records()."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def benchmark_selector(selector, puzzles):
+    """
+    Compare *selector* with always using each single solver on *puzzles*.
+
+    Returns {label: {"total_ms", "failures"}} for every solver and for
+    "Selector", whose time includes feature extraction and prediction.
+    """
+    results = {}
+    for name, fn in list(selector.solvers.items()) + [("Selector", selector.solve)]:
+        total = 0.0
+        failures = 0
+        for puzzle in puzzles:
+            start = time.perf_counter()
+            solution = fn(puzzle)
+            total += (time.perf_counter() - start) * 1000
+            if not is_solution(puzzle, solution):
+                failures += 1
+        results[name] = {"total_ms": total, "failures": failures}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the algorithm selector and compare it with each solver.")
+    parser.add_argument("--records", help="train on saved records instead of timing fresh puzzles")
+    parser.add_argument("--save-records", help="write the freshly collected records here")
+    parser.add_argument("--puzzles", type=int, default=10, help="fresh puzzles per difficulty")
+    args = parser.parse_args()
+
+    if args.records:
+        records = load_records(args.records)
+    else:
+        records = collect_records(args.puzzles)
+        if args.save_records:
+            save_records(records, args.save_records)
+    selector = AlgorithmSelector().fit(records)
+    test = [generate_puzzle(diff)[0] for diff in DIFFICULTY_HOLES for _ in range(args.puzzles)]
+    for label, res in sorted(benchmark_selector(selector, test).items(),
+                             key=lambda item: item[1]["total_ms"]):
+        print(f"{label:<18} {res['total_ms']:>10.1f} ms  failures: {res['failures']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Sudoku Solving Server
+=====================
+A local asyncio service exposing the engines over a JSON-lines protocol on
+TCP, plus a load generator that measures it.
+
+Each request is one JSON object per line:
+
+    {"id": 7, "op": "solve", "board": [[...], ...], "deadline_ms": 500}
+
+op is one of solve, count, hint or generate.  Replies carry the same id and
+may arrive out of order:
+
+    {"id": 7, "ok": true, "result": ...}  /  {"id": 7, "ok": false, "error": "..."}
+
+Requests are gathered into micro-batches (up to BATCH_SIZE, waiting at most
+BATCH_WINDOW seconds for a batch to fill) that run on a process pool, so a
+burst of small requests costs one inter-process round trip instead of many.
+The pending queue is bounded: when it is full the server stops reading from
+clients, which pushes back through TCP.  A request whose deadline passes
+before its batch finishes is answered with an error and skipped by the
+worker if it has not started yet.
+
+Request latency (receipt to reply) is recorded in sudoku_metrics under the
+op as entry and solver "server"; --metrics-port serves it for Prometheus.
+
+    python sudoku_server.py serve [--port 8765] [--metrics-port 9464]
+    python sudoku_server.py load  [--port 8765] [--requests 2000] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sudoku_board import Board
+from sudoku_cache import get_default_cache
+from sudoku_engine import count_all_solutions, generate_puzzle, search, solve_cached
+from sudoku_hints import next_hint
+from sudoku_metrics import enable as enable_metrics, install_from_env as install_metrics, observe, start_http_server
+from sudoku_rating import DIFFICULTY_LEVELS
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+BATCH_SIZE = 32
+BATCH_WINDOW = 0.005            # seconds
+MAX_PENDING = 1024              # queued requests before clients are throttled
+DEFAULT_DEADLINE_MS = 5000
+BOARD_SIZES = (4, 9, 16, 25)    # board edges accepted (box sizes 2-5)
+OPS = ("solve", "count", "hint", "generate")
+
+
+# ---------- Work done in the pool ----------
+
+def _hint(board, deadline):
+    """Next logical step (sudoku_hints) with its explanation; solved only if logic stalls."""
+    hint = next_hint(board, solve=lambda b: _solve(b, deadline))
+    return hint.as_dict() if hint else None
+
+
+def _stopper(deadline):
+    return lambda: time.time() > deadline
+
+
+def _solve(board, deadline):
+    cache = get_default_cache()
+    solution = cache.get(board)
+    if solution is None:
+        b = Board.from_grid(board)
+        count, _ = search(b, should_stop=_stopper(deadline))
+        if count is None:
+            raise TimeoutError("deadline exceeded")
+        if count:
+            solution = b.to_grid()
+            cache.put(board, solution)
+    return solution
+
+
+def _check_board(board):
+    """Raise ValueError unless *board* is an n×n grid of ints 0..n with n in BOARD_SIZES."""
+    if not isinstance(board, list) or len(board) not in BOARD_SIZES:
+        raise ValueError(f"board must be a list of {', '.join(map(str, BOARD_SIZES))} rows")
+    n = len(board)
+    for row in board:
+        if not isinstance(row, list) or len(row) != n:
+            raise ValueError(f"every row must be a list of {n} cells")
+        for v in row:
+            if type(v) is not int or not 0 <= v <= n:
+                raise ValueError(f"cells must be integers 0..{n}, got {v!r}")
+
+
+def handle(op, params, deadline=math.inf):
+    """
+    Run one request; raises ValueError for bad input and TimeoutError when
+    a search or generation runs past *deadline*.  Solving with a named
+    engine cannot be interrupted.
+    """
+    if op == "generate":
+        difficulty = params.get("difficulty", "Medium")
+        box = params.get("box", 3)
+        if difficulty not in DIFFICULTY_LEVELS:
+            raise ValueError(f"difficulty must be one of {', '.join(DIFFICULTY_LEVELS)}")
+        if type(box) is not int or not 3 <= box <= 5:
+            raise ValueError("box must be 3, 4 or 5")
+        generated = generate_puzzle(difficulty, box, should_stop=_stopper(deadline))
+        if generated is None:
+            raise TimeoutError("deadline exceeded")
+        puzzle, solution = generated
+        return {"puzzle": puzzle, "solution": solution}
+    board = params.get("board")
+    _check_board(board)
+    if op == "solve":
+        if "solver" in params:
+            return solve_cached(board, params["solver"])
+        return _solve(board, deadline)
+    if op == "count":
+        limit = params.get("limit", 2)
+        if limit is not None and (type(limit) is not int or limit < 1):
+            raise ValueError("limit must be a positive integer or null")
+        if limit is None:
+            count = count_all_solutions(board, should_stop=_stopper(deadline))
+        else:
+            count, _ = search(Board.from_grid(board), limit, should_stop=_stopper(deadline))
+        if count is None:
+            raise TimeoutError("deadline exceeded")
+        return count
+    if op == "hint":
+        return _hint(board, deadline)
+    raise ValueError(f"unknown op {op!r}")
+
+
+def run_batch(batch):
+    """Pool entry point: [(op, params, deadline)] → [(ok, result or error)]."""
+    out = []
+    for op, params, deadline in batch:
+        if time.time() > deadline:
+            out.append((False, "deadline exceeded"))
+            continue
+        try:
+            out.append((True, handle(op, params, deadline)))
+        except TimeoutError:
+            out.append((False, "deadline exceeded"))
+        except Exception as exc:        # reported to the client, never fatal
+            out.append((False, f"{type(exc).__name__}: {exc}"))
+    return out
+
+
+# ---------- Server ----------
+
+class SudokuServer:
+    """JSON-lines server with micro-batching onto a process pool."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None,
+                 batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW, max_pending=MAX_PENDING):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.queue = asyncio.Queue(max_pending)
+        self.pool = None
+        self.server = None
+        self._batchers = []
+
+    async def start(self):
+        self.pool = ProcessPoolExecutor(self.workers)
+        # One batcher per worker keeps every process busy.
+        self._batchers = [asyncio.create_task(self._batcher()) for _ in range(self.workers)]
+        self.server = await asyncio.start_server(self._client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in self._batchers:
+            task.cancel()
+        await asyncio.gather(*self._batchers, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _client(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    op = request["op"]
+                    if op not in OPS:
+                        raise ValueError(f"unknown op {op!r}")
+                    deadline_ms = request.get("deadline_ms", DEFAULT_DEADLINE_MS)
+                    if (isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float))
+                            or not math.isfinite(deadline_ms)):
+                        raise ValueError("deadline_ms must be a finite number")
+                except (ValueError, KeyError, TypeError) as exc:
+                    request_id = request.get("id") if isinstance(request, dict) else None
+                    await self._reply(writer, lock, {"id": request_id, "ok": False,
+                                                     "error": f"bad request: {exc}"})
+                    continue
+                received = time.perf_counter()
+                deadline = time.time() + deadline_ms / 1000
+                future = asyncio.get_running_loop().create_future()
+                # Blocks while the queue is full: backpressure on this client.
+                await self.queue.put((op, request, deadline, future))
+                task = asyncio.create_task(self._answer(writer, lock, request.get("id"), future,
+                                                        deadline, op, received))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # A cancelled handler (server shutdown) just drops the connection.
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(self, writer, lock, request_id, future, deadline, op, received):
+        try:
+            ok, result = await asyncio.wait_for(asyncio.shield(future), max(deadline - time.time(), 0))
+        except asyncio.TimeoutError:
+            ok, result = False, "deadline exceeded"
+        outcome = "ok" if ok else "timeout" if result == "deadline exceeded" else "error"
+        observe(op, "server", outcome, time.perf_counter() - received)
+        reply = {"id": request_id, "ok": ok}
+        reply["result" if ok else "error"] = result
+        await self._reply(writer, lock, reply)
+
+    async def _reply(self, writer, lock, reply):
+        async with lock:
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            end = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = end - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            now = time.time()
+            live = []
+            for item in batch:
+                if now > item[2]:
+                    _settle(item[3], (False, "deadline exceeded"))
+                else:
+                    live.append(item)
+            if not live:
+                continue
+            work = [(op, request, deadline) for op, request, deadline, _ in live]
+            try:
+                results = await loop.run_in_executor(self.pool, run_batch, work)
+            except Exception as exc:
+                results = [(False, f"server error: {exc}")] * len(live)
+            for item, result in zip(live, results):
+                _settle(item[3], result)
+
+
+def _settle(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+# ---------- Load generator ----------
+
+def _percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, requests=2000, concurrency=32,
+                   ops=("solve", "count", "hint"), puzzles=50, deadline_ms=DEFAULT_DEADLINE_MS):
+    """
+    Fire *requests* requests from *concurrency* connections, each keeping one
+    request in flight, and return throughput and latency percentiles (ms).
+    """
+    boards = [generate_puzzle(random.choice(["Easy", "Medium", "Hard"]))[0] for _ in range(puzzles)]
+    latencies = []
+    errors = 0
+    remaining = [requests]
+
+    async def connection(cid):
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        seq = 0
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                seq += 1
+                request = {"id": f"{cid}-{seq}", "op": random.choice(ops),
+                           "board": random.choice(boards), "deadline_ms": deadline_ms}
+                start = time.perf_counter()
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                reply = json.loads(await reader.readline())
+                latencies.append((time.perf_counter() - start) * 1000)
+                if not reply.get("ok"):
+                    errors += 1
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": _percentile(latencies, 50),
+        "p90": _percentile(latencies, 90),
+        "p99": _percentile(latencies, 99),
+        "max": latencies[-1] if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("mode", choices=("serve", "load"))
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on this port")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        install_metrics()
+        if args.metrics_port:
+            enable_metrics()
+            start_http_server(args.metrics_port)
+        server = SudokuServer(args.host, args.port, args.workers)
+        print(f"Serving on {args.host}:{args.port}")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+    else:
+        stats = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency))
+        print(f"{stats['requests']} requests in {stats['seconds']:.2f}s "
+              f"({stats['throughput']:.0f} req/s), {stats['errors']} errors")
+        print(f"latency ms  p50 {stats['p50']:.2f}  p90 {stats['p90']:.2f}  "
+              f"p99 {stats['p99']:.2f}  max {stats['max']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Speculative AI Replies
+======================
+While the user is thinking, a worker thread plays the user's most likely
+moves on copies of the board and works out the AI's reply to each with
+sudoku_engine.anytime_move.  When the user's actual move is one of them the
+AI answers from that table instead of solving from scratch.
+
+The worker shares the GIL with Tk, so each reply gets only a short search
+budget and the worker sleeps between replies to let the UI run.  Only one
+worker runs at a time: starting a new turn stops the previous one and waits
+for it (at most one reply's budget).
+
+Likely moves are the open cells with the fewest candidates (the top of the
+MRV queue) filled with their solution value: from the generator's solution
+while the board still agrees with it, else from the solution cache, else
+only the cells logic propagation fixes.  Replies are keyed by the board they
+answer, so a reply is only ever used on exactly the position it was worked
+out for; any other move is a miss and the AI solves as usual.
+"""
+
+import threading
+import time
+
+from sudoku_cache import encode_board, get_default_cache
+from sudoku_engine import _agrees, anytime_move
+from sudoku_metrics import observe
+from sudoku_rating import LogicState, apply_logic
+
+
+SPECULATION_WIDTH = 8           # likely user moves answered in advance
+SPECULATION_BUDGET_MS = 30      # search budget per speculative reply
+SPECULATION_PAUSE = 0.005       # seconds the worker yields to the UI between replies
+
+
+def likely_moves(board, reference=None, width=SPECULATION_WIDTH):
+    """Up to *width* (row, col, value) user moves, most constrained cells first."""
+    logic = LogicState(board)
+    if logic.broken:
+        return []
+    n = logic.n
+    order = sorted((logic.cand[r * n + c].bit_count(), r, c)
+                   for r in range(n) for c in range(n) if not board[r][c])
+    if reference is not None and _agrees(board, reference):
+        solution = reference
+    else:
+        solution = get_default_cache().get(board)
+    if solution is None:
+        apply_logic(logic)
+        if logic.broken:
+            return []
+        solution = logic.board()
+    moves = [(r, c, solution[r][c]) for _, r, c in order if solution[r][c]]
+    return moves[:width]
+
+
+class Speculator:
+    """Precomputes the AI's replies to likely user moves; see the module docstring."""
+
+    def __init__(self, budget_ms=SPECULATION_BUDGET_MS, width=SPECULATION_WIDTH):
+        self.budget_ms = budget_ms
+        self.width = width
+        self.replies = {}           # encoded board after the user's move: anytime_move() result
+        self.generation = 0         # bumped to stop the worker
+        self.lock = threading.Lock()
+        self.thread = None
+        self.solver_name = "Backtracking"
+        self.hits = 0
+        self.misses = 0
+
+    def start(self, board, reference=None, solver_name="Backtracking"):
+        """Drop earlier replies and speculate on *board* (copied) in the background."""
+        snapshot = [row[:] for row in board]
+        self.cancel()
+        with self.lock:
+            generation = self.generation
+        self.solver_name = solver_name
+        self.thread = threading.Thread(target=self._run,
+                                       args=(generation, snapshot, reference, solver_name),
+                                       daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """Drop the replies and stop the worker, waiting for it to finish."""
+        with self.lock:
+            self.generation += 1
+            self.replies = {}
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def take(self, board):
+        """
+        The reply worked out for *board* (row, col, value, source), or None.
+        Either way speculation for this turn is over.
+        """
+        start = time.perf_counter()
+        key = encode_board(board)
+        with self.lock:
+            reply = self.replies.get(key)
+            self.generation += 1
+            self.replies = {}
+        if reply is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        observe("ai_move", self.solver_name, "speculated", time.perf_counter() - start)
+        return reply
+
+    def _run(self, generation, board, reference, solver_name):
+        for r, c, v in likely_moves(board, reference, self.width):
+            time.sleep(SPECULATION_PAUSE)
+            if self.generation != generation:
+                return
+            board[r][c] = v
+            key = encode_board(board)
+            reply = anytime_move(board, budget_ms=self.budget_ms, reference=reference,
+                                 solver_name=solver_name, entry="speculate")
+            board[r][c] = 0
+            if reply[2] is None:
+                continue    # no safe reply: leave it to the live move
+            with self.lock:
+                if self.generation != generation:
+                    return
+                self.replies[key] = reply
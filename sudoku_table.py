@@ -0,0 +1,222 @@
+"""
+Virtual Table
+=============
+A read-only table on a Tk canvas that only draws the rows in view, so it
+stays responsive with hundreds of thousands of records.  A fixed pool of
+canvas items (one row of cells per visible line) is re-labelled on every
+scroll; nothing is created per record.
+
+Records are dicts; columns are (title, key, width) tuples.  Clicking a
+header sorts by that column (again to reverse), set_filter() keeps only the
+records whose *key* equals a value, and extend() appends records while the
+table is shown, keeping the current order and filters.
+"""
+
+import bisect
+import tkinter as tk
+
+
+ROW_HEIGHT = 24
+RESORT_FRACTION = 8         # extend() re-sorts instead of inserting when the batch is this big a part
+
+
+def _default_sort_key(value):
+    # None (e.g. a timed-out solve) sorts after every real value.
+    return (value is None, value if value is not None else 0)
+
+
+class VirtualTable(tk.Frame):
+    """Canvas table drawing only its visible rows; see the module docstring."""
+
+    def __init__(self, parent, columns, records=(), formats=None, sort_keys=None,
+                 cell_color=None, row_height=ROW_HEIGHT, height=320,
+                 bg="#1a1a2e", alt_bg="#151528", fg="#e0e0e0",
+                 header_bg="#1a1a2e", header_fg="#4fc3f7", font=("Segoe UI", 10)):
+        super().__init__(parent, bg=bg)
+        self.columns = list(columns)
+        self.formats = formats or {}
+        self.sort_keys = sort_keys or {}
+        self.cell_color = cell_color
+        self.row_height = row_height
+        self.colors = (bg, alt_bg, fg)
+        self.font = font
+        self.records = []
+        self.view = []              # filtered records, ascending by the sort column
+        self.filters = {}
+        self.sort_column = None
+        self.descending = False
+        self.top = 0                # index of the first visible row
+        self._pool = []             # [(background rect, [text item per column])]
+
+        width = sum(col[2] for col in self.columns)
+        self.header = tk.Canvas(self, height=row_height + 6, width=width, bg=header_bg,
+                                highlightthickness=0)
+        self.header.grid(row=0, column=0, sticky="ew")
+        self.canvas = tk.Canvas(self, height=height, width=width, bg=bg, highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self._header_items = []
+        x = 0
+        for title, _, col_width in self.columns:
+            item = self.header.create_text(x + 8, (row_height + 6) // 2, anchor="w", text=title,
+                                           fill=header_fg, font=(font[0], font[1] + 1, "bold"))
+            self._header_items.append(item)
+            x += col_width
+        self.header.bind("<Button-1>", self._on_header_click)
+
+        self.canvas.bind("<Configure>", lambda e: self._build_pool())
+        for widget in (self.canvas, self.header):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", lambda e: self._scroll(-3))
+            widget.bind("<Button-5>", lambda e: self._scroll(3))
+        self.set_records(records)
+
+    # ----- data -----
+
+    def set_records(self, records):
+        self.records = list(records)
+        self._rebuild_view()
+
+    def extend(self, records):
+        """Append *records*, slotting the ones that pass the filters into the current order."""
+        records = list(records)
+        self.records.extend(records)
+        fresh = [rec for rec in records if self._passes(rec)]
+        if not fresh:
+            return
+        if self.sort_column is None:
+            self.view.extend(fresh)
+        elif len(fresh) * RESORT_FRACTION > len(self.view):
+            self.view.extend(fresh)
+            self.view.sort(key=self._key)
+        else:
+            for rec in fresh:
+                bisect.insort(self.view, rec, key=self._key)
+        self.refresh()
+
+    def set_filter(self, key, value):
+        """Show only records with rec[key] == value; None removes the filter on *key*."""
+        if value is None:
+            self.filters.pop(key, None)
+        else:
+            self.filters[key] = value
+        self._rebuild_view()
+
+    def sort_by(self, column_index):
+        """Sort by the column (clicking the same column again reverses the order)."""
+        if self.sort_column == column_index:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column_index
+            self.descending = False
+        for ci, item in enumerate(self._header_items):
+            title = self.columns[ci][0]
+            if ci == column_index:
+                title += " ▼" if self.descending else " ▲"
+            self.header.itemconfigure(item, text=title)
+        self._rebuild_view()
+
+    def visible_count(self):
+        return len(self.view)
+
+    def row(self, index):
+        """The record shown on line *index* of the current view."""
+        return self.view[len(self.view) - 1 - index] if self.descending else self.view[index]
+
+    def _passes(self, rec):
+        return all(rec.get(key) == value for key, value in self.filters.items())
+
+    def _key(self, rec):
+        key = self.columns[self.sort_column][1]
+        value = rec.get(key)
+        return self.sort_keys.get(key, _default_sort_key)(value)
+
+    def _rebuild_view(self):
+        if self.filters:
+            self.view = [rec for rec in self.records if self._passes(rec)]
+        else:
+            self.view = list(self.records)
+        if self.sort_column is not None:
+            self.view.sort(key=self._key)
+        self.top = 0
+        self.refresh()
+
+    # ----- drawing -----
+
+    def _lines(self):
+        return max(self.canvas.winfo_height() // self.row_height, 1)
+
+    def _build_pool(self):
+        self.canvas.delete("all")
+        self._pool = []
+        width = max(self.canvas.winfo_width(), sum(col[2] for col in self.columns))
+        for line in range(self._lines() + 1):
+            y = line * self.row_height
+            rect = self.canvas.create_rectangle(0, y, width, y + self.row_height, width=0)
+            texts = []
+            x = 0
+            for _, _, col_width in self.columns:
+                texts.append(self.canvas.create_text(x + 8, y + self.row_height // 2,
+                                                     anchor="w", font=self.font))
+                x += col_width
+            self._pool.append((rect, texts))
+        self.refresh()
+
+    def refresh(self):
+        """Re-label the pooled rows for the current scroll position."""
+        total = len(self.view)
+        lines = self._lines()
+        self.top = max(0, min(self.top, total - lines))
+        bg, alt_bg, fg = self.colors
+        for line, (rect, texts) in enumerate(self._pool):
+            index = self.top + line
+            if index >= total:
+                self.canvas.itemconfigure(rect, state="hidden")
+                for item in texts:
+                    self.canvas.itemconfigure(item, state="hidden")
+                continue
+            rec = self.row(index)
+            self.canvas.itemconfigure(rect, state="normal", fill=bg if index % 2 == 0 else alt_bg)
+            for item, (_, key, _) in zip(texts, self.columns):
+                value = rec.get(key)
+                fmt = self.formats.get(key)
+                color = self.cell_color(rec, key) if self.cell_color else None
+                self.canvas.itemconfigure(item, state="normal", fill=color or fg,
+                                          text=fmt(value) if fmt else str(value))
+        if total:
+            self.scrollbar.set(self.top / total, min((self.top + lines) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # ----- scrolling -----
+
+    def yview(self, *args):
+        """Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"/"pages")."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.view))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self._lines() if args[2] == "pages" else 1)
+            self.top += step
+        self.refresh()
+
+    def _on_header_click(self, event):
+        x = 0
+        for ci, (_, _, col_width) in enumerate(self.columns):
+            x += col_width
+            if event.x < x:
+                self.sort_by(ci)
+                return
+
+    def _scroll(self, lines):
+        self.top += lines
+        self.refresh()
+        return "break"      # keep an enclosing scrollable frame from scrolling too
+
+    def _on_wheel(self, event):
+        return self._scroll(-3 if event.delta > 0 else 3)
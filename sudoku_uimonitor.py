@@ -0,0 +1,213 @@
+"""
+UI Latency Monitor
+==================
+Finds out which Tk handlers make the duel windows lag.  When attached to a
+root window it
+
+    times every Python callback Tk runs (commands, bindings, after() jobs)
+    by wrapping tkinter's CallWrapper, plus the game methods given to
+    watch() under their own names
+    keeps a heartbeat on after() and measures how late each beat runs: the
+    event-loop lag, and a stall whenever it exceeds STALL_MS
+    shows a small live readout in the window's bottom-right corner
+    writes everything as a Chrome trace (chrome://tracing, Perfetto) with
+    dump_trace()
+
+Only callbacks registered after start() are wrapped, so attach the monitor
+before the game builds its widgets.  The games do that from the environment:
+
+    SUDOKU_UI_MONITOR=1 python sudoku_duel.py              trace in ui_trace.json
+    SUDOKU_UI_MONITOR=trace.json python sudoku_dp.py       trace in trace.json
+"""
+
+import atexit
+import inspect
+import json
+import os
+import time
+import tkinter
+from collections import deque
+
+
+MONITOR_ENV = "SUDOKU_UI_MONITOR"
+DEFAULT_TRACE = "ui_trace.json"
+HEARTBEAT_MS = 50
+READOUT_MS = 500
+STALL_MS = 100              # heartbeat lateness reported as a stall
+MAX_EVENTS = 100_000        # spans and stalls kept for the trace
+LAG_WINDOW = 200            # heartbeats behind the readout's lag figures
+WATCHED = ("on_cell_edit", "ai_turn", "ai_make_move", "show_hint", "new_game", "reset_board")
+AI_MOVE = "ai_turn"
+
+
+def _callback_name(func):
+    """
+    Readable name of a Tk callback, or None for the monitor's own jobs and
+    watch() wrappers (which time themselves).  after() jobs are named after
+    the function they run.
+    """
+    name = getattr(func, "__qualname__", None) or repr(func)
+    if name.endswith("after.<locals>.callit"):
+        inner = inspect.getclosurevars(func).nonlocals.get("func")
+        if inner is not None:
+            return _callback_name(inner)
+    if getattr(func, "_monitored", False):
+        return None
+    return name
+
+
+class LoopMonitor:
+    """Callback spans, heartbeat lag and stalls of one Tk root; see the module docstring."""
+
+    def __init__(self, root, heartbeat_ms=HEARTBEAT_MS):
+        self.root = root
+        self.heartbeat_ms = heartbeat_ms
+        self.origin = time.perf_counter_ns()
+        self.spans = deque(maxlen=MAX_EVENTS)      # (name, start_ns, dur_ns)
+        self.stalls = deque(maxlen=MAX_EVENTS)     # (start_ns, lag_ns)
+        self.lags = deque(maxlen=LAG_WINDOW)       # recent lateness in ms
+        self.stats = {}                            # name: [calls, total_ns, max_ns]
+        self.last_ms = {}
+        self.readout = None
+        self._saved_wrapper = None
+        self._expected = None
+
+    # ----- recording -----
+
+    def record(self, name, start_ns, dur_ns):
+        self.spans.append((name, start_ns - self.origin, dur_ns))
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = [0, 0, 0]
+        entry[0] += 1
+        entry[1] += dur_ns
+        entry[2] = max(entry[2], dur_ns)
+        self.last_ms[name] = dur_ns / 1e6
+
+    def start(self):
+        """Wrap Tk callbacks registered from now on and start the heartbeat."""
+        monitor = self
+        base = self._saved_wrapper = tkinter.CallWrapper
+
+        class TimedCallWrapper(base):
+            def __init__(self, func, subst, widget):
+                base.__init__(self, func, subst, widget)
+                self.span_name = _callback_name(func)
+
+            def __call__(self, *args):
+                if self.span_name is None:
+                    return base.__call__(self, *args)
+                start = time.perf_counter_ns()
+                try:
+                    return base.__call__(self, *args)
+                finally:
+                    monitor.record(self.span_name, start, time.perf_counter_ns() - start)
+
+        tkinter.CallWrapper = TimedCallWrapper
+        self._expected = time.perf_counter_ns() + self.heartbeat_ms * 1_000_000
+        self.root.after(self.heartbeat_ms, self._heartbeat)
+        return self
+
+    def stop(self):
+        if self._saved_wrapper is not None:
+            tkinter.CallWrapper = self._saved_wrapper
+            self._saved_wrapper = None
+
+    def watch(self, obj, names=WATCHED):
+        """Time obj's methods *names* (those it has) under "Class.method" on every call."""
+        for name in names:
+            method = getattr(obj, name, None)
+            if callable(method):
+                setattr(obj, name, self._timed(f"{type(obj).__name__}.{name}", method))
+        return self
+
+    def _timed(self, span_name, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(span_name, start, time.perf_counter_ns() - start)
+        timed._monitored = True
+        timed.__qualname__ = span_name
+        return timed
+
+    def _heartbeat(self):
+        now = time.perf_counter_ns()
+        lag = max(now - self._expected, 0)
+        self.lags.append(lag / 1e6)
+        if lag >= STALL_MS * 1_000_000:
+            self.stalls.append((self._expected - self.origin, lag))
+        self._expected = now + self.heartbeat_ms * 1_000_000
+        self.root.after(self.heartbeat_ms, self._heartbeat)
+    _heartbeat._monitored = True
+
+    # ----- reporting -----
+
+    def summary(self):
+        """Lag percentiles, stall count, AI move latency and the slowest handlers."""
+        lags = sorted(self.lags)
+        slowest = sorted(self.stats.items(), key=lambda item: item[1][2], reverse=True)[:10]
+        ai = [stats for name, stats in self.stats.items() if name.endswith(AI_MOVE)]
+        return {
+            "lag_p50_ms": lags[len(lags) // 2] if lags else 0.0,
+            "lag_p95_ms": lags[int(len(lags) * 0.95)] if lags else 0.0,
+            "lag_max_ms": lags[-1] if lags else 0.0,
+            "stalls": len(self.stalls),
+            "ai_moves": sum(s[0] for s in ai),
+            "ai_move_avg_ms": sum(s[1] for s in ai) / max(sum(s[0] for s in ai), 1) / 1e6,
+            "slowest": [{"name": name, "calls": calls, "avg_ms": total / calls / 1e6,
+                         "max_ms": worst / 1e6}
+                        for name, (calls, total, worst) in slowest],
+        }
+
+    def show_readout(self):
+        """Overlay a live lag / slowest-handler / AI-move readout on the root window."""
+        self.readout = tkinter.Label(self.root, font=("Consolas", 8), bg="#202020",
+                                     fg="#e0e0e0", padx=4, pady=1)
+        self.readout.place(relx=1.0, rely=1.0, anchor="se")
+        self._refresh()
+        return self
+
+    def _refresh(self):
+        s = self.summary()
+        worst = s["slowest"][0] if s["slowest"] else None
+        ai = [ms for name, ms in self.last_ms.items() if name.endswith(AI_MOVE)]
+        text = f"lag p95 {s['lag_p95_ms']:.0f} ms  max {s['lag_max_ms']:.0f} ms  stalls {s['stalls']}"
+        if worst:
+            text += f"  |  slowest {worst['name'].split('.<locals>')[0]} {worst['max_ms']:.0f} ms"
+        if ai:
+            text += f"  |  AI move {ai[0]:.0f} ms"
+        self.readout.config(text=text, fg="#ff6b6b" if s["lag_max_ms"] >= STALL_MS else "#e0e0e0")
+        self.readout.lift()
+        self.root.after(READOUT_MS, self._refresh)
+    _refresh._monitored = True
+
+    def dump_trace(self, path=DEFAULT_TRACE):
+        """Write callback spans and stalls as Chrome trace events (times in µs)."""
+        pid = os.getpid()
+        events = [{"name": name, "cat": "callback", "ph": "X", "pid": pid, "tid": 1,
+                   "ts": start / 1000, "dur": dur / 1000}
+                  for name, start, dur in self.spans]
+        events += [{"name": "event-loop stall", "cat": "stall", "ph": "X", "pid": pid, "tid": 2,
+                    "ts": start / 1000, "dur": lag / 1000}
+                   for start, lag in self.stalls]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": self.summary()}, f)
+        return path
+
+
+def install_from_env(root):
+    """
+    Start a LoopMonitor with readout on *root* if SUDOKU_UI_MONITOR is set,
+    dumping the trace at exit; returns it (or None).  Call before building
+    the game, then watch() the game object.
+    """
+    value = os.environ.get(MONITOR_ENV)
+    if not value:
+        return None
+    monitor = LoopMonitor(root).start().show_readout()
+    path = DEFAULT_TRACE if value.lower() in ("1", "true", "yes") else value
+    atexit.register(monitor.dump_trace, path)
+    return monitor
@@ -0,0 +1,97 @@
+"""
+Solution Cache Tests
+====================
+Only verified solutions are stored, least-recently-used entries are evicted
+past the size cap, a forked process reopens its own connection, and
+SolutionCache.solve puts a solver behind the cache.
+
+    python -m pytest test_sudoku_cache.py
+"""
+
+import multiprocessing
+import random
+
+import pytest
+
+import sudoku_cache
+from sudoku_cache import SolutionCache, decode_board, encode_board, is_solution
+from sudoku_engine import get_base_pattern, shuffle_board
+
+
+def _puzzle(seed):
+    random.seed(seed)
+    solution = shuffle_board(get_base_pattern(3))
+    puzzle = [row[:] for row in solution]
+    for i in random.sample(range(81), 40):
+        puzzle[i // 9][i % 9] = 0
+    return puzzle, solution
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+def test_encoding_round_trips():
+    puzzle, _ = _puzzle(1)
+    assert decode_board(encode_board(puzzle)) == puzzle
+
+
+def test_stores_only_verified_solutions(cache):
+    puzzle, solution = _puzzle(2)
+    wrong = [row[:] for row in solution]
+    wrong[0][0], wrong[0][1] = wrong[0][1], wrong[0][0]
+    assert not cache.put(puzzle, wrong)
+    assert cache.get(puzzle) is None
+    assert cache.put(puzzle, solution)
+    assert cache.get(puzzle) == solution
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(sudoku_cache, "EVICT_EVERY", 1)
+    monkeypatch.setattr(sudoku_cache, "TOUCH_INTERVAL", 0.0)
+    cache = SolutionCache(str(tmp_path / "lru.db"), max_entries=2)
+    first, second, third = (_puzzle(seed) for seed in (3, 4, 5))
+    cache.put(*first)
+    cache.put(*second)
+    cache.get(first[0])             # first is now more recent than second
+    cache.put(*third)
+    assert len(cache) == 2
+    assert cache.get(second[0]) is None
+    assert cache.get(first[0]) == first[1]
+    cache.close()
+
+
+def _child_get(cache, puzzle, conn):
+    conn.send(cache.get(puzzle))
+    conn.close()
+
+
+def test_forked_process_reconnects(cache):
+    puzzle, solution = _puzzle(6)
+    cache.put(puzzle, solution)
+    ctx = multiprocessing.get_context("fork")
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child_get, args=(cache, puzzle, send_conn))
+    proc.start()
+    assert recv_conn.recv() == solution
+    proc.join()
+    assert cache.get(puzzle) == solution
+
+
+def test_solve_runs_solver_on_a_copy_once(cache):
+    puzzle, solution = _puzzle(7)
+    calls = []
+
+    def solver(board):
+        calls.append(board)
+        board[0][0] = -1            # must not reach the caller's board
+        return solution
+
+    original = [row[:] for row in puzzle]
+    assert cache.solve(puzzle, solver) == solution
+    assert cache.solve(puzzle, solver) == solution
+    assert len(calls) == 1 and puzzle == original
+    assert is_solution(puzzle, cache.get(puzzle))
@@ -0,0 +1,53 @@
+"""
+Canonical Form Tests
+====================
+Every symmetric variant of a puzzle has the same canonical form, and the
+returned Transform maps the canonical solution back onto the variant.
+
+    python -m pytest test_sudoku_canonical.py
+"""
+
+import random
+
+from sudoku_cache import decode_board, is_solution
+from sudoku_canonical import canonical_key, canonicalise, equivalence_classes
+from sudoku_engine import solve_dp_standalone
+
+
+PUZZLE = decode_board("530070000600195000098000060800060003400803001700020006060000280000419005000080079")
+
+
+def _variant(board, rng):
+    """A random element of the symmetry group applied to *board*."""
+    bands = rng.sample(range(3), 3)
+    rows = [3 * b + i for b in bands for i in rng.sample(range(3), 3)]
+    stacks = rng.sample(range(3), 3)
+    cols = [3 * s + j for s in stacks for j in rng.sample(range(3), 3)]
+    digits = [0] + rng.sample(range(1, 10), 9)
+    out = [[digits[board[r][c]] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        out = [list(col) for col in zip(*out)]
+    return out
+
+
+def test_variants_share_a_canonical_form():
+    rng = random.Random(5)
+    key = canonical_key(PUZZLE)
+    for _ in range(5):
+        assert canonical_key(_variant(PUZZLE, rng)) == key
+
+
+def test_transform_maps_solution_back():
+    rng = random.Random(6)
+    variant = _variant(PUZZLE, rng)
+    canon, transform = canonicalise(variant)
+    solution = transform.invert(solve_dp_standalone(canon))
+    assert is_solution(variant, solution)
+
+
+def test_equivalence_classes():
+    rng = random.Random(7)
+    other = [row[:] for row in PUZZLE]
+    other[0][0] = 0
+    classes = equivalence_classes([PUZZLE, _variant(PUZZLE, rng), other])
+    assert sorted(classes.values()) == [[0, 1], [2]]
@@ -0,0 +1,81 @@
+"""
+Conflict Localiser Tests
+========================
+A solvable board has no conflicts, a wrong entry on a unique puzzle is
+found (from the cached solution on later calls), and givens without a
+solution are reported as such.
+
+    python -m pytest test_sudoku_conflicts.py
+"""
+
+import pytest
+
+import sudoku_conflicts
+from sudoku_cache import SolutionCache
+from sudoku_conflicts import entered_cells, find_conflicts
+from sudoku_corpus import corpus_puzzles
+from sudoku_engine import search
+from sudoku_rating import LogicState
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = SolutionCache(str(tmp_path / "solutions.db"))
+    monkeypatch.setattr(sudoku_conflicts, "get_default_cache", lambda: cache)
+    monkeypatch.setattr(sudoku_conflicts, "_unique", set())
+    yield cache
+    cache.close()
+
+
+def _solved(board):
+    grid = [row[:] for row in board]
+    search(grid)
+    return grid
+
+
+def _wrong_entry(puzzle, solution):
+    """(row, col, value): an empty cell and a candidate of it that is not its solution."""
+    logic = LogicState(puzzle)
+    for r in range(9):
+        for c in range(9):
+            others = logic.cand[r * 9 + c] & ~(1 << (solution[r][c] - 1))
+            if not puzzle[r][c] and others:
+                return r, c, (others & -others).bit_length()
+    raise AssertionError("no cell with a second candidate")
+
+
+def test_entered_cells():
+    initial = [[0, 1], [0, 0]]
+    assert entered_cells([[2, 1], [0, 2]], initial) == [(0, 0), (1, 1)]
+
+
+def test_wrong_entry_is_found(cache):
+    puzzle = corpus_puzzles("Hard", 1)[0]
+    solution = _solved(puzzle)
+    board = [row[:] for row in puzzle]
+    r, c, value = _wrong_entry(puzzle, solution)
+    board[r][c] = value
+    assert find_conflicts(board, puzzle) == [(r, c)]
+    assert cache.get(puzzle) == solution
+
+    right = next((i, j) for i in range(9) for j in range(9) if not board[i][j])
+    board[right[0]][right[1]] = solution[right[0]][right[1]]
+    assert find_conflicts(board, puzzle) == [(r, c)]
+    board[r][c] = solution[r][c]
+    assert find_conflicts(board, puzzle) == []
+    assert find_conflicts(board, puzzle, solution) == []
+
+
+def test_several_solutions():
+    puzzle = [[0] * 9 for _ in range(9)]
+    board = [row[:] for row in puzzle]
+    board[0][0] = board[4][4] = 3
+    assert find_conflicts(board, puzzle) == []
+
+
+def test_givens_without_a_solution():
+    puzzle = [[0] * 9 for _ in range(9)]
+    puzzle[0][0] = puzzle[0][8] = 4
+    board = [row[:] for row in puzzle]
+    board[5][5] = 1
+    assert find_conflicts(board, puzzle) is None
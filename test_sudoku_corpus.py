@@ -0,0 +1,74 @@
+"""
+Benchmark Corpus Tests
+======================
+The frozen corpus is valid and free of symmetric duplicates, rebuilding it
+is deterministic, and the suite runner reports on the tiers it is given.
+
+    python -m pytest test_sudoku_corpus.py
+"""
+
+import json
+
+import pytest
+
+from sudoku_cache import encode_board
+from sudoku_corpus import (
+    CORPUS_VERSION,
+    build_corpus,
+    corpus_classes,
+    load_corpus,
+    run_suite,
+    verify_corpus,
+)
+from sudoku_engine import search
+
+
+def test_frozen_corpus_is_valid():
+    corpus = load_corpus()
+    assert corpus["version"] == CORPUS_VERSION
+    assert verify_corpus(corpus) == []
+    assert corpus_classes(corpus) == {tier: len(entries) for tier, entries in corpus["tiers"].items()}
+
+
+def test_verify_flags_ambiguous_puzzles():
+    corpus = {"tiers": {"Easy": [{"id": "blank", "board": encode_board([[0] * 9 for _ in range(9)])}]}}
+    assert verify_corpus(corpus) == ["blank"]
+
+
+def test_symmetric_variants_share_a_class():
+    corpus = load_corpus()
+    entry = corpus["tiers"]["Expert"][0]
+    rows = [entry["board"][r * 9:(r + 1) * 9] for r in range(9)]
+    mirrored = dict(entry, id="mirrored", board="".join(row[::-1] for row in rows))
+    assert corpus_classes({"tiers": {"Expert": [entry, mirrored]}}) == {"Expert": 1}
+
+
+def test_build_is_deterministic():
+    first = build_corpus(seed=7, per_tier=1)
+    assert first == build_corpus(seed=7, per_tier=1)
+    assert verify_corpus(first) == []
+    assert corpus_classes(first) == {tier: len(entries) for tier, entries in first["tiers"].items()}
+
+
+def test_version_mismatch(tmp_path):
+    path = str(tmp_path / "corpus.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": CORPUS_VERSION + 1, "tiers": {}}, f)
+    with pytest.raises(ValueError):
+        load_corpus(path)
+
+
+def _search(board):
+    return board if search(board, 1, dynamic=True)[0] else None
+
+
+def _wrong(board):
+    return [[1] * len(board) for _ in board]
+
+
+def test_run_suite():
+    report = run_suite({"Search": _search, "Wrong": _wrong}, tiers=["Expert"], timeout=10)
+    assert report["classes"] == {"Expert": 4}
+    assert len(report["records"]) == 8
+    assert report["summary"]["Expert"]["Search"]["success_rate"] == 100
+    assert report["summary"]["Expert"]["Wrong"]["success_rate"] == 0
@@ -0,0 +1,164 @@
+"""
+Engine Tests
+============
+Exact solution counting: count_all_solutions must agree with enumerating
+every solution, and must count a large set without visiting each one.
+The search core needs no recursion, and solve and count modes agree.
+Large-board generation must finish with a unique puzzle or refuse, and
+anytime_move reports where each move came from.
+
+    python -m pytest test_sudoku_engine.py
+"""
+
+import random
+import sys
+import time
+
+import pytest
+
+import sudoku_engine
+from sudoku_board import Board, BoardState
+from sudoku_cache import SolutionCache, is_solution
+from sudoku_corpus import corpus_puzzles
+from sudoku_engine import (anytime_move, count_all_solutions, generate_puzzle, get_base_pattern,
+                           iter_solutions, search, shuffle_board)
+
+
+# 16×16 with 80,633 solutions: enumerating them takes over ten times as
+# long as counting them.
+LARGE_16 = [
+    [ 1,  0,  0,  0,  0,  3,  0,  0, 13,  0,  0,  0,  2, 11,  0,  7],
+    [ 0,  0,  0,  0, 15,  0,  0, 12, 11,  0,  7,  2,  0,  0,  4,  6],
+    [ 0, 15,  0, 13,  7,  0,  2, 16,  0,  0,  0,  1,  0,  3,  0,  5],
+    [ 2,  0,  0, 11,  0,  0,  0,  0,  0, 10,  0,  0,  0, 13, 12,  0],
+    [ 0,  0,  0,  0,  0,  0,  6, 14,  9,  3,  0,  5, 15,  0, 13, 16],
+    [ 0, 10, 14,  0, 12,  0,  5,  0,  0, 13, 16,  0,  0,  0,  0,  0],
+    [15,  0, 13,  8,  0,  2,  0,  0,  0,  0, 10,  0,  5,  9,  0,  0],
+    [ 5,  0,  3,  9,  0,  8, 15,  0,  0,  0,  4,  0,  6,  1,  0, 10],
+    [ 4,  0,  0,  0,  3,  0,  0,  1,  0,  0,  0, 12,  0, 15,  0, 11],
+    [10,  3,  0,  0, 13,  0, 12,  0, 15,  0, 11,  0,  4,  0,  2,  0],
+    [ 0, 11,  0,  0,  0,  0,  4,  2,  6,  0,  0, 10,  0,  0,  0, 13],
+    [ 0,  0,  9,  0, 11,  0, 16,  0,  7,  2, 14,  0,  0,  0,  1,  0],
+    [13,  8,  0, 12,  2,  0, 11, 15,  0,  0,  1,  0,  0, 10,  6,  0],
+    [14,  1,  0,  4,  0,  0,  3,  0, 12,  5,  8, 13,  0,  0, 15,  2],
+    [ 0,  2, 15,  0,  1,  0,  0,  0,  0,  0,  9,  0,  0,  0,  5,  0],
+    [ 0,  0,  0,  0,  0, 12,  0,  0,  0,  0,  2, 11, 14,  0,  7,  0],
+]
+
+
+def _holed(box, holes, rng):
+    n = box * box
+    board = shuffle_board(get_base_pattern(box))
+    for i in rng.sample(range(n * n), holes):
+        board[i // n][i % n] = 0
+    return board
+
+
+def test_search_needs_no_recursion():
+    board = corpus_puzzles("25×25", 1)[0]
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(100)
+    try:
+        grid = [row[:] for row in board]
+        count, nodes = search(grid, limit=1)
+    finally:
+        sys.setrecursionlimit(limit)
+    assert count == 1 and nodes >= sum(not v for row in board for v in row)
+    assert is_solution(board, grid)
+
+
+def test_search_modes_agree():
+    rng = random.Random(4)
+    random.seed(4)
+    for holes in (40, 50, 55):
+        board = _holed(3, holes, rng)
+        grid = [row[:] for row in board]
+        count = search(Board.from_grid(board), limit=10**6)[0]
+        assert count == sum(1 for _ in iter_solutions(board))
+        assert search(grid, limit=1)[0] == 1 and is_solution(board, grid)
+        static = [row[:] for row in board]
+        assert search(static, limit=1, dynamic=False)[0] == 1 and is_solution(board, static)
+        state = BoardState([row[:] for row in board])
+        mark = state.mark()
+        assert search(state, limit=1)[0] == 1 and is_solution(board, state.grid)
+        state.undo_to(mark)
+        assert state.grid == board
+
+
+def test_count_matches_enumeration():
+    rng = random.Random(11)
+    random.seed(11)
+    for box, holes in ((2, 12), (3, 50), (3, 55), (3, 57), (4, 120)):
+        board = _holed(box, holes, rng)
+        assert count_all_solutions(board) == sum(1 for _ in iter_solutions(board))
+
+
+def test_count_empty_4x4():
+    assert count_all_solutions([[0] * 4 for _ in range(4)]) == 288
+
+
+def test_count_large_set_quickly():
+    start = time.perf_counter()
+    assert count_all_solutions(LARGE_16) == 80_633
+    assert time.perf_counter() - start < 2.0
+
+
+def test_count_stops_when_asked():
+    assert count_all_solutions([[0] * 9 for _ in range(9)], should_stop=lambda: True) is None
+
+
+def test_generate_hard_16x16():
+    random.seed(1)
+    start = time.perf_counter()
+    puzzle, solution = generate_puzzle("Hard", box=4)
+    assert time.perf_counter() - start < 10.0
+    assert search(puzzle, limit=2)[0] == 1
+    assert all(v in (0, solution[r][c]) for r, row in enumerate(puzzle) for c, v in enumerate(row))
+
+
+def test_generate_refuses_unsupported():
+    with pytest.raises(ValueError):
+        generate_puzzle("Hard", box=5)
+    with pytest.raises(ValueError):
+        generate_puzzle("Extreme")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = SolutionCache(str(tmp_path / "solutions.db"))
+    monkeypatch.setattr(sudoku_engine, "get_default_cache", lambda: cache)
+    yield cache
+    cache.close()
+
+
+def test_anytime_forced(cache):
+    board = shuffle_board(get_base_pattern(3))
+    value, board[4][4] = board[4][4], 0
+    assert anytime_move(board) == (4, 4, value, "forced")
+
+
+def test_anytime_search_then_cache(cache):
+    board = corpus_puzzles("Expert")[1]      # no logic move; over a thousand search nodes
+    solution = [row[:] for row in board]
+    search(solution)
+    r, c, value, source = anytime_move(board, target=(0, 1), budget_ms=10_000)
+    assert (r, c, value, source) == (0, 1, solution[0][1], "solved")
+    assert cache.get(board) == solution
+    assert anytime_move(board, target=(0, 2))[2:] == (solution[0][2], "cache_hit")
+
+
+def test_anytime_out_of_budget(cache):
+    board = corpus_puzzles("Expert")[1]
+    solution = [row[:] for row in board]
+    search(solution)
+    assert anytime_move(board, (0, 1), budget_ms=0, reference=solution) == (0, 1, solution[0][1], "fallback")
+    wrong = [row[:] for row in solution]
+    wrong[0][0] = wrong[0][0] % 9 + 1
+    assert anytime_move(board, (0, 1), budget_ms=0, reference=wrong) == (0, 1, None, "timeout")
+    assert anytime_move(board, (0, 1), budget_ms=0) == (0, 1, None, "timeout")
+
+
+def test_anytime_unsolvable(cache):
+    board = [[0] * 9 for _ in range(9)]
+    board[0][0] = board[0][8] = 5
+    assert anytime_move(board)[2:] == (None, "unsolvable")
@@ -0,0 +1,62 @@
+"""
+Logic Hint Tests
+================
+Every hint places the solution's digit and says why; the easiest technique
+is preferred, the search fallback only runs when logic stalls, and full or
+broken boards get no hint.
+
+    python -m pytest test_sudoku_hints.py
+"""
+
+import random
+
+from sudoku_corpus import corpus_puzzles
+from sudoku_engine import generate_puzzle, get_base_pattern, search, shuffle_board
+from sudoku_hints import next_hint
+
+
+def _solve(board):
+    grid = [row[:] for row in board]
+    return grid if search(grid)[0] else None
+
+
+def test_single_hole_is_a_hidden_single():
+    board = shuffle_board(get_base_pattern(3))
+    value, board[2][7] = board[2][7], 0
+    hint = next_hint(board, _solve)
+    assert (hint.row, hint.col, hint.value) == (2, 7, value)
+    assert hint.technique == "Hidden Single" and hint.level == 1
+    assert hint.explanation == f"R3C8 is the only cell in box 3 where {value} can go."
+    assert hint.as_dict()["explanation"] == hint.explanation
+
+
+def test_hints_play_out_the_puzzle():
+    random.seed(5)
+    puzzle, solution = generate_puzzle("Medium")
+    board = [row[:] for row in puzzle]
+    calls = []
+    while True:
+        hint = next_hint(board, lambda b: calls.append(b) or _solve(b))
+        if hint is None:
+            break
+        assert not board[hint.row][hint.col] and hint.value == solution[hint.row][hint.col]
+        assert hint.technique != "Search" or calls
+        board[hint.row][hint.col] = hint.value
+    assert board == solution
+
+
+def test_search_fallback():
+    board = corpus_puzzles("Expert")[1]     # Easter Monster: no logical first step
+    solution = _solve(board)
+    hint = next_hint(board, _solve)
+    assert hint.technique == "Search" and hint.value == solution[hint.row][hint.col]
+    assert "fewest candidates" in hint.explanation
+    assert next_hint(board, lambda b: None) is None
+
+
+def test_no_hint():
+    full = shuffle_board(get_base_pattern(3))
+    assert next_hint(full, _solve) is None
+    broken = [[0] * 9 for _ in range(9)]
+    broken[0][0] = broken[0][5] = 7
+    assert next_hint(broken, _solve) is None
@@ -0,0 +1,109 @@
+"""
+Solver Metrics Tests
+====================
+Counters and histograms render in the Prometheus text format, timed()
+records each outcome only while enabled, and install_from_env() copes with
+a taken port and gives every process its own metrics file.
+
+    python -m pytest test_sudoku_metrics.py
+"""
+
+import os
+import socket
+import urllib.request
+
+import pytest
+
+import sudoku_metrics
+from sudoku_metrics import Registry, install_from_env, start_http_server, textfile_path, timed, write_textfile
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Recording on, into empty copies of the shared metrics."""
+    registry = Registry()
+    monkeypatch.setattr(sudoku_metrics, "SOLVE_DURATION", registry.histogram(
+        "sudoku_solve_duration_seconds", "Latency.", ("entry", "solver")))
+    monkeypatch.setattr(sudoku_metrics, "SOLVES", registry.counter(
+        "sudoku_solves_total", "Calls.", ("entry", "solver", "outcome")))
+    monkeypatch.setattr(sudoku_metrics, "enabled", True)
+    return registry
+
+
+def test_render():
+    registry = Registry()
+    counter = registry.counter("calls_total", "Calls.", ("name",))
+    histogram = registry.histogram("latency_seconds", "Latency.", ("name",), buckets=(0.1, 1.0))
+    counter.inc(('say "hi"\n',))
+    counter.inc(('say "hi"\n',), 2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("x",), value)
+    assert registry.render() == (
+        "# HELP calls_total Calls.\n"
+        "# TYPE calls_total counter\n"
+        'calls_total{name="say \\"hi\\"\\n"} 3\n'
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{name="x",le="0.1"} 2\n'
+        'latency_seconds_bucket{name="x",le="1.0"} 3\n'
+        'latency_seconds_bucket{name="x",le="+Inf"} 4\n'
+        'latency_seconds_sum{name="x"} 3.65\n'
+        'latency_seconds_count{name="x"} 4\n'
+    )
+
+
+def test_timed_outcomes(metrics):
+    assert timed("solve", "Test", lambda: [[1]]) == [[1]]
+    assert timed("solve", "Test", lambda: None) is None
+    with pytest.raises(ZeroDivisionError):
+        timed("solve", "Test", lambda: 1 / 0)
+    assert sudoku_metrics.SOLVES.values == {("solve", "Test", outcome): 1
+                                            for outcome in ("solved", "unsolved", "error")}
+    assert sum(sudoku_metrics.SOLVE_DURATION.series[("solve", "Test")][:-1]) == 3
+
+
+def test_disabled_records_nothing(metrics, monkeypatch):
+    monkeypatch.setattr(sudoku_metrics, "enabled", False)
+    assert timed("solve", "Test", lambda: 1) == 1
+    sudoku_metrics.observe("solve", "Test", "solved", 1.0)
+    assert metrics.render().count("\n") == 4
+
+
+def test_http_and_textfile(metrics, tmp_path):
+    sudoku_metrics.observe("hint", "Logic", "solved", 0.01)
+    server = start_http_server(0, registry=metrics)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics") as reply:
+            assert reply.read().decode() == metrics.render()
+    finally:
+        server.shutdown()
+        server.server_close()
+    path = tmp_path / "metrics.prom"
+    write_textfile(path, metrics)
+    assert path.read_text() == metrics.render()
+
+
+def test_textfile_path():
+    assert textfile_path("out/metrics.prom", 42) == "out/metrics.42.prom"
+    assert textfile_path("metrics") == f"metrics.{os.getpid()}"
+
+
+def test_install_from_env(monkeypatch, tmp_path):
+    registered = []
+    monkeypatch.setattr(sudoku_metrics.atexit, "register", lambda *args: registered.append(args))
+    monkeypatch.setattr(sudoku_metrics, "enabled", False)
+    for name in ("SUDOKU_METRICS", "SUDOKU_METRICS_PORT", "SUDOKU_METRICS_FILE"):
+        monkeypatch.delenv(name, raising=False)
+    assert install_from_env() is None and not sudoku_metrics.enabled
+
+    taken = socket.socket()
+    taken.bind(("127.0.0.1", 0))
+    taken.listen()
+    try:
+        monkeypatch.setenv("SUDOKU_METRICS_PORT", str(taken.getsockname()[1]))
+        monkeypatch.setenv("SUDOKU_METRICS_FILE", str(tmp_path / "metrics.prom"))
+        assert install_from_env() is None
+    finally:
+        taken.close()
+    assert sudoku_metrics.enabled
+    assert registered == [(write_textfile, str(tmp_path / f"metrics.{os.getpid()}.prom"))]
@@ -0,0 +1,65 @@
+"""
+Multi-core Benchmark Tests
+==========================
+Records merge back into run_benchmarks' averages, noisy and retried
+measurements are counted, and a cancelled run stops early with its records
+still in serial order.
+
+    python -m pytest test_sudoku_multibench.py
+"""
+
+import threading
+
+from sudoku_analysis import DIFFICULTIES, PUZZLES_PER_DIFFICULTY, SOLVERS
+from sudoku_corpus import load_corpus
+from sudoku_multibench import (
+    _measure,
+    available_cores,
+    merge_records,
+    noise_report,
+    run_parallel_benchmarks,
+)
+
+
+def _record(diff, name, ms, noisy=False, attempts=1):
+    return {"difficulty": diff, "algorithm": name, "time_ms": ms,
+            "noisy": noisy, "attempts": attempts}
+
+
+def test_merge_records():
+    records = [_record("Easy", "D&C", 1.0), _record("Easy", "D&C", 3.0),
+               _record("Easy", "Greedy", None), _record("Hard", "Hybrid", 5.0)]
+    avg = merge_records(records)
+    assert set(avg) == set(DIFFICULTIES) and set(avg["Easy"]) == set(SOLVERS)
+    assert avg["Easy"]["D&C"] == 2.0
+    assert avg["Easy"]["Greedy"] is None
+    assert avg["Hard"]["Hybrid"] == 5.0
+    assert avg["Medium"]["D&C"] is None
+
+
+def test_noise_report():
+    records = [_record("Easy", "D&C", 1.0, noisy=True, attempts=3),
+               _record("Easy", "Greedy", 1.0, attempts=2),
+               _record("Hard", "D&C", 1.0)]
+    assert noise_report(records) == {"measurements": 3, "noisy": 1, "retried": 2,
+                                     "noisy_keys": [("Easy", "D&C")]}
+
+
+def test_measure():
+    key = load_corpus()["tiers"]["Easy"][0]["board"]
+    ms, cpu_ms, switches, noisy, attempts, _ = _measure("DP (Bitmask)", key)
+    assert ms > 0 and cpu_ms >= 0 and switches >= 0
+    assert 1 <= attempts <= 3 and isinstance(noisy, bool)
+
+
+def test_cancelled_run():
+    assert available_cores()
+    cancel = threading.Event()
+    cancel.set()
+    avg, records, noise = run_parallel_benchmarks(workers=1, cancel=cancel)
+    order = [(diff, pidx, name) for diff in DIFFICULTIES
+             for pidx in range(1, PUZZLES_PER_DIFFICULTY + 1) for name in SOLVERS]
+    assert len(records) < len(order)
+    assert [(rec["difficulty"], rec["puzzle"], rec["algorithm"]) for rec in records] == order[:len(records)]
+    assert noise["measurements"] == len(records) and noise["workers"] == 1
+    assert set(avg) == set(DIFFICULTIES)
@@ -0,0 +1,49 @@
+"""
+Parallel Search Tests
+=====================
+Splitting one search across processes finds the same solutions and counts
+as the sequential search, and leaves the board untouched.
+
+    python -m pytest test_sudoku_parallel.py
+"""
+
+import math
+import random
+
+from sudoku_board import Board
+from sudoku_cache import is_solution
+from sudoku_engine import get_base_pattern, search, shuffle_board
+from sudoku_parallel import expand, parallel_count_solutions, parallel_search, parallel_solve
+
+
+def _holed(holes, seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    board = shuffle_board(get_base_pattern(3))
+    for i in rng.sample(range(81), holes):
+        board[i // 9][i % 9] = 0
+    return board
+
+
+def test_expand_covers_the_tree():
+    board = _holed(58, 1)
+    subproblems, solutions = expand(Board.from_grid(board).cells, 9, 32)
+    total = len(solutions) + sum(search(Board(cells, 9), math.inf)[0] for cells in subproblems)
+    assert total == search(Board.from_grid(board), math.inf)[0]
+
+
+def test_parallel_count_matches_sequential():
+    board = _holed(56, 2)
+    expected = search(Board.from_grid(board), math.inf)[0]
+    assert expected > 1
+    assert parallel_count_solutions(board, workers=2) == expected
+    assert parallel_count_solutions(board, limit=2, workers=2) == 2
+
+
+def test_parallel_solve():
+    board = _holed(55, 3)
+    original = [row[:] for row in board]
+    assert is_solution(board, parallel_solve(board, workers=2))
+    assert board == original
+    count, solution, _ = parallel_search(board, workers=1)
+    assert count == 1 and is_solution(board, solution)
@@ -0,0 +1,59 @@
+"""
+Rating Tests
+============
+rate() grades by the hardest technique needed, generated puzzles rate
+inside the range of the difficulty they were asked for, and rating is fast
+enough for bulk use.
+
+    python -m pytest test_sudoku_rating.py
+"""
+
+import random
+import time
+
+import pytest
+
+from sudoku_cache import decode_board
+from sudoku_engine import DIFFICULTY_HOLES, generate_puzzle, get_base_pattern, shuffle_board
+from sudoku_rating import DIFFICULTY_LEVELS, SEARCH_LEVEL, rate, rate_many
+
+
+AI_ESCARGOT = decode_board("100007090030020008009600500005300900010080002600004000300000010040000007007000300")
+
+
+def test_single_hole_is_easy():
+    board = shuffle_board(get_base_pattern(3))
+    board[4][4] = 0
+    rating = rate(board)
+    assert rating.level == 1 and rating.difficulty == "Easy"
+
+
+def test_hard_puzzle_needs_search():
+    rating = rate(AI_ESCARGOT)
+    assert rating.level == SEARCH_LEVEL and rating.guesses > 0
+    assert rating.difficulty == "Hard"
+
+
+@pytest.mark.parametrize("difficulty", list(DIFFICULTY_HOLES))
+def test_generated_puzzles_rate_in_range(difficulty):
+    random.seed(3)
+    lo, hi = DIFFICULTY_LEVELS[difficulty]
+    for _ in range(3):
+        puzzle, _ = generate_puzzle(difficulty)
+        assert lo <= rate(puzzle).level <= hi
+
+
+def test_unsolvable_puzzles():
+    board = [[0] * 9 for _ in range(9)]
+    board[0][0] = board[0][1] = 5
+    with pytest.raises(ValueError):
+        rate(board)
+    assert rate_many([board, AI_ESCARGOT])[0] is None
+
+
+def test_rates_hundreds_per_second():
+    random.seed(4)
+    puzzles = [generate_puzzle("Medium")[0] for _ in range(20)] * 10
+    start = time.perf_counter()
+    rate_many(puzzles)
+    assert time.perf_counter() - start < 1.0
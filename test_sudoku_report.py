@@ -0,0 +1,67 @@
+"""
+Benchmark Report Tests
+======================
+The report page escapes what it shows and marks failures, the charts render
+headless through Agg, and build_report() writes the page, charts and
+records it links to.
+
+    python -m pytest test_sudoku_report.py
+"""
+
+import json
+import sys
+
+import sudoku_report
+from sudoku_analysis import DIFFICULTIES, SOLVERS
+from sudoku_engine import BENCHMARK_SOLVERS, DIFFICULTY_HOLES
+from sudoku_report import build_report, render_analysis_chart, render_engine_chart, render_html
+
+
+def _analysis():
+    avg = {diff: {name: 1.5 for name in SOLVERS} for diff in DIFFICULTIES}
+    avg["Hard"]["Greedy"] = None
+    records = [{"difficulty": "Easy", "puzzle": 1, "algorithm": name, "technique": "Naked Single",
+                "board": "0" * 81, "time_ms": None if name == "Greedy" else 1.5}
+               for name in SOLVERS]
+    return avg, records, None
+
+
+def _engine():
+    return {diff: {name: {"avg": 2.0, "min": 1.0, "max": 3.0,
+                          "success_rate": 60.0 if name == "Greedy" else 100.0}
+                   for name in BENCHMARK_SOLVERS}
+            for diff in DIFFICULTY_HOLES}
+
+
+def test_render_html():
+    page = render_html({"Platform": "<script>"}, _analysis(), _engine(), {"analysis": "a.png"})
+    assert "&lt;script&gt;" in page and "<script>" not in page
+    assert '<img src="a.png"' in page and "comparison chart" not in page
+    assert "TIMEOUT" in page
+    assert page.count('class="fail"') == 1 + len(DIFFICULTY_HOLES)
+    assert "Per-Puzzle Results" in page and "Noise" not in page
+
+
+def test_render_html_without_suites():
+    page = render_html({})
+    assert "Time Complexity" in page and "Per-Puzzle Results" not in page
+
+
+def test_charts_render_headless(tmp_path):
+    avg = _analysis()[0]
+    assert render_analysis_chart(avg, tmp_path / "a.png").stat().st_size > 0
+    assert (render_engine_chart(_engine(), tmp_path / "e.svg").read_text().lstrip()
+            .startswith("<?xml"))
+    assert "matplotlib.pyplot" not in sys.modules
+
+
+def test_build_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(sudoku_report, "run_benchmarks", lambda **kwargs: _analysis()[:2])
+    monkeypatch.setattr(sudoku_report, "benchmark_all_solvers", lambda *args, **kwargs: _engine())
+    monkeypatch.setattr(sudoku_report, "_progress", lambda label: None)
+    path = build_report(str(tmp_path), fmt="svg")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["analysis.svg", "engine.svg",
+                                                          "index.html", "records.json"]
+    assert json.loads((tmp_path / "records.json").read_text()) == _analysis()[1]
+    page = open(path, encoding="utf-8").read()
+    assert 'src="analysis.svg"' in page and 'src="engine.svg"' in page
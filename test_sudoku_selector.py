@@ -0,0 +1,80 @@
+"""
+Algorithm Selector Tests
+========================
+Features are cheap and well-formed, the selector learns which solver is
+faster from records (including the analysis window's short names) and keeps
+its models across a save and load.
+
+    python -m pytest test_sudoku_selector.py
+"""
+
+import random
+
+import pytest
+
+from sudoku_cache import encode_board, is_solution
+from sudoku_engine import get_base_pattern, shuffle_board, solve_dp_standalone
+from sudoku_selector import (
+    AlgorithmSelector,
+    extract_features,
+    load_records,
+    save_records,
+)
+
+
+def _holed(holes, seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    board = shuffle_board(get_base_pattern(3))
+    for i in rng.sample(range(81), holes):
+        board[i // 9][i % 9] = 0
+    return board
+
+
+def _records(boards):
+    # "DP" wins on sparse boards, "D&C" (alias of "Divide & Conquer") on dense ones.
+    records = []
+    for board in boards:
+        holes = sum(v == 0 for row in board for v in row)
+        records.append({"algorithm": "DP", "time_ms": 10.0, "board": encode_board(board)})
+        records.append({"algorithm": "D&C", "time_ms": None if holes > 40 else 1.0,
+                        "board": encode_board(board)})
+    return records
+
+
+SOLVERS = {"DP": solve_dp_standalone, "Divide & Conquer": solve_dp_standalone}
+
+
+def test_features():
+    full = extract_features(shuffle_board(get_base_pattern(3)))
+    sparse = extract_features(_holed(50, 1))
+    assert full.shape == sparse.shape
+    assert full[0] == 1.0 and sparse[0] == pytest.approx(31 / 81)
+
+
+def test_selector_learns_the_faster_solver(tmp_path):
+    boards = [_holed(holes, seed) for seed, holes in enumerate([20, 25, 30, 35, 45, 50, 55, 60])]
+    selector = AlgorithmSelector(SOLVERS).fit(_records(boards))
+    assert selector.choose(_holed(22, 100)) == "Divide & Conquer"
+    assert selector.choose(_holed(58, 101)) == "DP"
+    puzzle = _holed(40, 102)
+    assert is_solution(puzzle, selector.solve(puzzle))
+
+    path = tmp_path / "selector.npz"
+    selector.save(path)
+    loaded = AlgorithmSelector.load(path, SOLVERS)
+    assert loaded.predict(puzzle) == pytest.approx(selector.predict(puzzle))
+
+
+def test_fit_needs_every_solver():
+    boards = [_holed(30, 1)]
+    with pytest.raises(ValueError):
+        AlgorithmSelector(dict(SOLVERS, Extra=solve_dp_standalone)).fit(_records(boards))
+    with pytest.raises(RuntimeError):
+        AlgorithmSelector(SOLVERS).predict(boards[0])
+
+
+def test_records_round_trip(tmp_path):
+    records = _records([_holed(30, 1)])
+    save_records(records, tmp_path / "records.json")
+    assert load_records(tmp_path / "records.json") == records
@@ -0,0 +1,97 @@
+"""
+Server Tests
+============
+Request validation and deadlines in handle(), and the JSON-lines protocol:
+bad requests are answered with the request's id, and deadlines hold.
+
+    python -m pytest test_sudoku_server.py
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from sudoku_server import SudokuServer, handle
+
+
+EMPTY_4 = [[0] * 4 for _ in range(4)]
+
+
+@pytest.mark.parametrize("board", [
+    None,
+    [],
+    [[0] * 10 for _ in range(10)],
+    [[0] * 4 for _ in range(3)],
+    [[0, 0, 0, 0], [0, 0, 0], [0] * 4, [0] * 4],
+    [["1", 0, 0, 0]] + [[0] * 4 for _ in range(3)],
+    [[-1, 0, 0, 0]] + [[0] * 4 for _ in range(3)],
+    [[5, 0, 0, 0]] + [[0] * 4 for _ in range(3)],
+    [[True, 0, 0, 0]] + [[0] * 4 for _ in range(3)],
+])
+def test_bad_boards_rejected(board):
+    with pytest.raises(ValueError):
+        handle("solve", {"board": board})
+
+
+@pytest.mark.parametrize("params", [
+    {"difficulty": "Extreme"},
+    {"box": 2},
+    {"box": 6},
+    {"box": "3"},
+    {"box": 5, "difficulty": "Hard"},
+])
+def test_bad_generate_rejected(params):
+    with pytest.raises(ValueError):
+        handle("generate", params)
+
+
+def test_count_and_generate_respect_deadline():
+    with pytest.raises(TimeoutError):
+        handle("count", {"board": [[0] * 9 for _ in range(9)], "limit": None}, time.time() + 0.2)
+    with pytest.raises(TimeoutError):
+        handle("generate", {"difficulty": "Hard"}, time.time() - 1)
+
+
+def test_count_exact():
+    assert handle("count", {"board": EMPTY_4, "limit": None}) == 288
+    assert handle("count", {"board": EMPTY_4}) == 2
+
+
+def _exchange(requests):
+    async def run():
+        server = await SudokuServer(port=0, workers=1).start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            for request in requests:
+                line = request if isinstance(request, str) else json.dumps(request)
+                writer.write(line.encode() + b"\n")
+            await writer.drain()
+            replies = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            return replies
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def test_protocol_errors_carry_the_id():
+    replies = _exchange([
+        "not json",
+        {"id": 1, "op": "explode"},
+        {"id": 2, "op": "count", "board": EMPTY_4, "deadline_ms": "soon"},
+        {"id": 3, "op": "count", "board": [[0] * 10 for _ in range(10)]},
+        {"id": 4, "op": "count", "board": EMPTY_4},
+    ])
+    by_id = {reply["id"]: reply for reply in replies}
+    assert not by_id[None]["ok"]
+    for request_id in (1, 2, 3):
+        assert not by_id[request_id]["ok"]
+    assert by_id[4] == {"id": 4, "ok": True, "result": 2}
+
+
+def test_protocol_deadline():
+    (reply,) = _exchange([{"id": 9, "op": "count", "board": [[0] * 9 for _ in range(9)],
+                           "limit": None, "deadline_ms": 200}])
+    assert reply["id"] == 9 and reply["error"] == "deadline exceeded"
@@ -0,0 +1,81 @@
+"""
+Speculative Reply Tests
+=======================
+Likely user moves are the most constrained cells with their solution value,
+a reply is only handed out for the exact position it was worked out for,
+and cancelling stops the worker.
+
+    python -m pytest test_sudoku_speculation.py
+"""
+
+import random
+
+import pytest
+
+import sudoku_engine
+import sudoku_speculation
+from sudoku_cache import SolutionCache
+from sudoku_engine import get_base_pattern, shuffle_board
+from sudoku_speculation import Speculator, likely_moves
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = SolutionCache(str(tmp_path / "solutions.db"))
+    monkeypatch.setattr(sudoku_engine, "get_default_cache", lambda: cache)
+    monkeypatch.setattr(sudoku_speculation, "get_default_cache", lambda: cache)
+    yield cache
+    cache.close()
+
+
+def _puzzle(holes, seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    solution = shuffle_board(get_base_pattern(3))
+    board = [row[:] for row in solution]
+    for i in rng.sample(range(81), holes):
+        board[i // 9][i % 9] = 0
+    return board, solution
+
+
+def test_likely_moves_follow_the_solution():
+    board, solution = _puzzle(30, 1)
+    moves = likely_moves(board, solution, width=5)
+    assert len(moves) == 5
+    assert all(not board[r][c] and v == solution[r][c] for r, c, v in moves)
+    assert likely_moves(board, solution, width=100) == likely_moves(board, width=100)
+
+
+def test_likely_moves_without_a_solution():
+    board, solution = _puzzle(30, 2)
+    wrong = [row[:] for row in solution]
+    wrong[0] = wrong[0][1:] + wrong[0][:1]
+    assert likely_moves(board, wrong, width=100) == likely_moves(board, width=100)
+    board[0][0] = 0
+    board[0][1] = board[0][2] = 5
+    assert likely_moves(board) == []
+
+
+def test_hit_and_miss():
+    board, solution = _puzzle(30, 3)
+    speculator = Speculator(budget_ms=200, width=3)
+    speculator.start(board, solution)
+    speculator.thread.join()
+    r, c, v = likely_moves(board, solution, width=1)[0]
+    board[r][c] = v
+    reply = speculator.take(board)
+    row, col, value, _ = reply
+    assert not board[row][col] and value == solution[row][col]
+    assert speculator.take(board) is None
+    assert (speculator.hits, speculator.misses) == (1, 1)
+
+
+def test_cancel_stops_the_worker():
+    board, solution = _puzzle(50, 4)
+    speculator = Speculator(width=50)
+    speculator.start(board, solution)
+    speculator.cancel()
+    assert speculator.thread is None and speculator.replies == {}
+    r, c, v = likely_moves(board, solution, width=1)[0]
+    board[r][c] = v
+    assert speculator.take(board) is None
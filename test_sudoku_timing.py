@@ -0,0 +1,51 @@
+"""
+Precise Timing Tests
+====================
+Precise mode repeats short solves, reports medians with the harness cost
+taken off, and leaves the garbage collector as it found it.
+
+    python -m pytest test_sudoku_timing.py
+"""
+
+import gc
+import time
+
+import sudoku_timing
+from sudoku_timing import MAX_REPEATS, MIN_REPEATS, calibrate, precise_time, time_call
+
+
+def test_time_call():
+    wall, cpu, result = time_call(lambda x: x * 2, 21)
+    assert result == 42 and wall >= 0 and cpu >= 0
+
+
+def test_calibrate():
+    wall_ns, cpu_ns = calibrate(runs=20)
+    assert 0 <= wall_ns < 1e6 and cpu_ns >= 0
+    assert sudoku_timing._overhead == (wall_ns, cpu_ns)
+
+
+def test_short_solves_are_repeated():
+    timing = precise_time(lambda board: board, [[0]])
+    assert timing["runs"] == MAX_REPEATS and timing["solved"]
+    assert 0 <= timing["wall_min_ms"] <= timing["wall_ms"]
+
+
+def test_slow_solves_stop_at_the_minimum():
+    calls = []
+    timing = precise_time(lambda board: calls.append(time.sleep(0.01)), None)
+    assert timing["runs"] == len(calls) == MIN_REPEATS
+    assert not timing["solved"]
+    assert timing["wall_ms"] >= 9 and timing["cpu_ms"] < timing["wall_ms"]
+
+
+def test_collector_is_restored():
+    assert gc.isenabled()
+    precise_time(lambda board: board, None)
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        precise_time(lambda board: board, None)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()